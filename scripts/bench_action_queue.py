@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+ActionQueue 基准（默认 100 万个排队动作）：
+
+- legacy:     旧实现（order=True 的 dataclass + heapq），逐个 push / pop
+- push:       ActionQueue.push 逐个入队
+- push_many:  ActionQueue.push_many 一次入队（extend + heapify）
+- cancel:     随机取消 --cancel-frac 比例的动作
+- reprio:     随机修改 --cancel-frac 比例的动作优先级
+- drain:      全部出队（含跳过墓碑）
+- aging:      开启优先级老化后 push_many + drain
+
+用法示例（在项目根目录）：
+
+    (venv) python scripts/bench_action_queue.py
+    (venv) python scripts/bench_action_queue.py --size 200000 --cancel-frac 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.systems.circulation.buffers import ActionQueue  # noqa: E402
+
+
+@dataclass(order=True)
+class _LegacyItem:
+    priority: int
+    index: int
+    action: Any = field(compare=False)
+    metadata: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ActionQueue at large sizes")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--cancel-frac", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    n = args.size
+    priorities = rng.integers(0, 100, size=n).tolist()
+    items = [(i, p) for i, p in enumerate(priorities)]
+    k = int(n * args.cancel_frac)
+    victims = rng.choice(n, size=k, replace=False).tolist()
+    new_prios = rng.integers(0, 100, size=k).tolist()
+
+    rows = []
+
+    # 旧实现
+    heap: List[_LegacyItem] = []
+
+    def legacy_push() -> None:
+        for i, p in items:
+            heapq.heappush(heap, _LegacyItem(p, i, i, {}))
+
+    def legacy_pop() -> None:
+        while heap:
+            heapq.heappop(heap)
+
+    rows.append(("legacy push", n, timed(legacy_push)))
+    rows.append(("legacy pop", n, timed(legacy_pop)))
+
+    q = ActionQueue()
+    rows.append(("push", n, timed(lambda: [q.push(i, priority=p) for i, p in items])))
+    rows.append(("drain", n, timed(q.drain)))
+
+    q = ActionQueue()
+    rows.append(("push_many", n, timed(lambda: q.push_many(items))))
+    rows.append(("reprioritize", k, timed(lambda: [q.reprioritize(h, p) for h, p in zip(victims, new_prios)])))
+    rows.append(("cancel", k, timed(lambda: [q.cancel(h) for h in victims])))
+    remaining = len(q)
+    rows.append(("drain (after)", remaining, timed(q.drain)))
+
+    aged = ActionQueue(aging_rate=0.5)
+    rows.append(("aging push_many", n, timed(lambda: aged.push_many(items))))
+    rows.append(("aging drain", n, timed(aged.drain)))
+
+    header = f"{'operation':<16}  {'count':>10}  {'total (s)':>9}  {'ns/op':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, count, elapsed in rows:
+        print(f"{name:<16}  {count:>10,}  {elapsed:>9.3f}  {elapsed / max(count, 1) * 1e9:>8.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
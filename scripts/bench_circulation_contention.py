@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""
+循环系统缓冲区竞争基准：多个生产者线程写入、多个消费者读取。
+
+- perception: ThreadSafePerceptionBuffer，消费者逐条 get() 或批量 get_batch()
+- action:     ThreadSafeActionQueue（随机优先级），同上
+- bus:        ThreadSafeMessageBus，每个消费者一个订阅者（扇出），BLOCK 背压
+- async:      AsyncPerceptionBuffer，生产者 / 消费者都是协程
+
+输出每种组合的总吞吐（items/s）和消费者拿到的条数（校验无丢失）。
+
+用法示例（在项目根目录）：
+
+    (venv) python scripts/bench_circulation_contention.py
+    (venv) python scripts/bench_circulation_contention.py --producers 8 --consumers 4 --items 50000 --batch 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.systems.circulation.concurrent import (  # noqa: E402
+    AsyncPerceptionBuffer,
+    ThreadSafeActionQueue,
+    ThreadSafeMessageBus,
+    ThreadSafePerceptionBuffer,
+)
+
+
+def run_threads(
+    producers: int,
+    consumers: int,
+    items_per_producer: int,
+    push: Callable[[int, int], None],
+    take: Callable[[], int],
+    remaining: Callable[[], int],
+) -> Tuple[float, int]:
+    """跑一轮：返回 (耗时秒, 消费到的条数)。take() 返回本次取到的条数。"""
+    counts = [0] * consumers
+    producers_done = threading.Event()
+
+    def produce(pid: int) -> None:
+        for i in range(items_per_producer):
+            push(pid, i)
+
+    def consume(cid: int) -> None:
+        while True:
+            got = take()
+            counts[cid] += got
+            if got == 0 and producers_done.is_set() and remaining() == 0:
+                return
+
+    threads = [threading.Thread(target=consume, args=(c,)) for c in range(consumers)]
+    prod_threads = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+    start = time.perf_counter()
+    for t in threads + prod_threads:
+        t.start()
+    for t in prod_threads:
+        t.join()
+    producers_done.set()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, sum(counts)
+
+
+def bench_perception(args: argparse.Namespace, batch: Optional[int]) -> Tuple[float, int]:
+    buf = ThreadSafePerceptionBuffer(maxlen=args.producers * args.items + 1)
+
+    def take() -> int:
+        if batch is None:
+            return 0 if buf.get(timeout=0.005) is None else 1
+        return len(buf.get_batch(max_items=batch, timeout=0.005))
+
+    return run_threads(
+        args.producers, args.consumers, args.items,
+        push=lambda pid, i: buf.push({"pid": pid, "i": i}),
+        take=take,
+        remaining=lambda: len(buf),
+    )
+
+
+def bench_actions(args: argparse.Namespace, batch: Optional[int]) -> Tuple[float, int]:
+    q = ThreadSafeActionQueue()
+    rng = random.Random(0)
+    priorities = [rng.randrange(10) for _ in range(args.items)]
+
+    def take() -> int:
+        if batch is None:
+            return 0 if q.get(timeout=0.005) is None else 1
+        return len(q.get_batch(max_items=batch, timeout=0.005))
+
+    return run_threads(
+        args.producers, args.consumers, args.items,
+        push=lambda pid, i: q.push({"pid": pid, "i": i}, priority=priorities[i]),
+        take=take,
+        remaining=lambda: len(q),
+    )
+
+
+def bench_bus(args: argparse.Namespace, batch: Optional[int]) -> Tuple[float, int]:
+    """每个消费者各自订阅全部消息，因此期望收到 consumers × 总条数。"""
+    bus = ThreadSafeMessageBus(capacity=4096, overflow="block")
+    names = [f"c{c}" for c in range(args.consumers)]
+    for name in names:
+        bus.subscribe(name, "perception.*")
+    local = threading.local()
+    counter = iter(range(args.consumers))
+    counter_lock = threading.Lock()
+
+    def take() -> int:
+        if not hasattr(local, "name"):
+            with counter_lock:
+                local.name = names[next(counter)]
+        got = len(bus.poll(local.name, max_items=batch or 1))
+        if got == 0:
+            time.sleep(0.0005)
+        return got
+
+    return run_threads(
+        args.producers, args.consumers, args.items,
+        push=lambda pid, i: bus.publish(f"perception.p{pid}", i),
+        take=take,
+        remaining=lambda: bus.pending(local.name) if hasattr(local, "name") else 0,
+    )
+
+
+def bench_async(args: argparse.Namespace, batch: Optional[int]) -> Tuple[float, int]:
+    async def run() -> Tuple[float, int]:
+        buf = AsyncPerceptionBuffer(maxlen=args.producers * args.items + 1)
+        total = args.producers * args.items
+        received = 0
+
+        async def produce(pid: int) -> None:
+            for i in range(args.items):
+                buf.push({"pid": pid, "i": i})
+                if i % 64 == 0:
+                    await asyncio.sleep(0)
+
+        async def consume() -> None:
+            nonlocal received
+            while received < total:
+                if batch is None:
+                    await buf.get()
+                    received += 1
+                else:
+                    items = await buf.get_batch(max_items=batch)
+                    received += len(items)
+
+        start = time.perf_counter()
+        consumers = [asyncio.ensure_future(consume()) for _ in range(args.consumers)]
+        await asyncio.gather(*(produce(p) for p in range(args.producers)))
+        while received < total:
+            await asyncio.sleep(0)
+        for c in consumers:
+            c.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        return time.perf_counter() - start, received
+
+    return asyncio.run(run())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Contention benchmark for concurrent circulation buffers")
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--consumers", type=int, default=2)
+    parser.add_argument("--items", type=int, default=20_000, help="每个生产者写入的条数")
+    parser.add_argument("--batch", type=int, default=128, help="批量读取时每次最多取多少条")
+    args = parser.parse_args(argv)
+
+    total = args.producers * args.items
+    print(f"producers={args.producers} consumers={args.consumers} items={total:,}")
+    header = f"{'buffer':<11}  {'read mode':<10}  {'items/s':>12}  {'received':>10}"
+    print(header)
+    print("-" * len(header))
+
+    cases = [
+        ("perception", bench_perception),
+        ("action", bench_actions),
+        ("bus", bench_bus),
+        ("async", bench_async),
+    ]
+    for name, fn in cases:
+        for batch in (None, args.batch):
+            elapsed, received = fn(args, batch)
+            mode = "single" if batch is None else f"batch={batch}"
+            print(f"{name:<11}  {mode:<10}  {total / elapsed:>12,.0f}  {received:>10,}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
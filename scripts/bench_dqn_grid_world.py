@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""
+DQN 学习基准：在 SimpleGridWorld 上用纯 NumPy 的 MLP 训练路径学会「拿钥匙 -> 开门 -> 到终点」。
+
+- ε-贪婪采样（EpsilonGreedyPolicy），ε 从 1.0 线性衰减到 --eps-final
+- 经验写入 ReplayBuffer（--prioritized 时使用 PrioritizedReplayBuffer）
+- 每个环境步做一次 DQNTrainer.train_step（Adam，目标网络定期同步）
+- 每 --report-every 个环境步打印：回合数、平均回报、成功率、loss、吞吐
+- 最后用贪婪策略跑一回合，输出到达终点所需步数
+
+用法示例（在项目根目录）：
+
+    (venv) python scripts/bench_dqn_grid_world.py
+    (venv) python scripts/bench_dqn_grid_world.py --steps 50000 --prioritized
+    (venv) python scripts/bench_dqn_grid_world.py --seed 1 --save-checkpoint data/models/dqn_grid.ckpt
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.environments.grid_oracle import get_grid_oracle  # noqa: E402
+from us_core.environments.grid_world import SimpleGridWorld  # noqa: E402
+from us_core.systems.environment.interface import NUM_ACTIONS, STATE_SIZE  # noqa: E402
+from us_core.systems.neural.checkpoint import save_checkpoint  # noqa: E402
+from us_core.systems.neural.decision import EpsilonGreedyPolicy  # noqa: E402
+from us_core.systems.neural.learning import PrioritizedReplayBuffer, ReplayBuffer  # noqa: E402
+from us_core.systems.neural.networks import PolicyNetwork  # noqa: E402
+from us_core.systems.neural.optim import Adam  # noqa: E402
+from us_core.systems.neural.training import DQNTrainer  # noqa: E402
+
+
+# 状态里的取值是 0~6 的格子编码，缩放到 [0, 1] 训练更稳定
+STATE_SCALE = 1.0 / 6.0
+
+
+def greedy_episode(env: SimpleGridWorld, q_net: PolicyNetwork, max_steps: int) -> Optional[int]:
+    """贪婪策略跑一回合，返回到达终点的步数；没到达返回 None。"""
+    state = env.reset()
+    for t in range(1, max_steps + 1):
+        action = int(np.argmax(q_net.forward(state * STATE_SCALE)[0]))
+        state, _, done, _ = env.step(action)
+        if done:
+            return t
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DQN learning benchmark on SimpleGridWorld")
+    parser.add_argument("--steps", type=int, default=30_000, help="环境总步数")
+    parser.add_argument("--max-episode-steps", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--buffer-size", type=int, default=50_000)
+    parser.add_argument("--warmup", type=int, default=1_000, help="开始训练前先收集多少步")
+    parser.add_argument("--lr", type=float, default=5e-4)
+    parser.add_argument("--gamma", type=float, default=0.99)
+    parser.add_argument("--target-sync", type=int, default=500)
+    parser.add_argument("--eps-final", type=float, default=0.05)
+    parser.add_argument("--eps-decay-steps", type=int, default=15_000)
+    parser.add_argument("--prioritized", action="store_true")
+    parser.add_argument("--report-every", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-checkpoint", type=str, default=None, help="训练结束后把 Q 网络保存到该路径")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    np.random.seed(args.seed)
+
+    env = SimpleGridWorld()
+    q_net = PolicyNetwork(
+        input_size=STATE_SIZE, output_size=NUM_ACTIONS, hidden_sizes=(128, 64, 32), seed=args.seed
+    )
+    policy = EpsilonGreedyPolicy(policy_net=q_net, action_size=NUM_ACTIONS, epsilon=1.0)
+    mlp = q_net.mlp
+    trainer = DQNTrainer(
+        q_net=q_net,
+        optimizer=Adam(mlp.parameters(), mlp.gradients(), lr=args.lr),
+        gamma=args.gamma,
+        target_sync_interval=args.target_sync,
+    )
+    if args.prioritized:
+        buf: ReplayBuffer = PrioritizedReplayBuffer(args.buffer_size, state_dim=STATE_SIZE)
+    else:
+        buf = ReplayBuffer(args.buffer_size, state_dim=STATE_SIZE)
+    batch_out = buf.allocate_batch(args.batch_size)
+
+    print(
+        f"{'steps':>7}  {'episodes':>8}  {'avg return':>10}  {'success':>7}  "
+        f"{'loss':>8}  {'eps':>5}  {'env+train steps/s':>17}"
+    )
+    print("-" * 74)
+
+    state = env.reset() * STATE_SCALE
+    episode_return, episode_len = 0.0, 0
+    block_returns: List[float] = []
+    block_success: List[bool] = []
+    block_losses: List[float] = []
+    block_start = time.perf_counter()
+
+    for step in range(1, args.steps + 1):
+        frac = min(1.0, step / args.eps_decay_steps)
+        policy.epsilon = 1.0 + frac * (args.eps_final - 1.0)
+
+        action, _ = policy.select_action(state, rng=rng)
+        raw_next, reward, done, info = env.step(action)
+        next_state = raw_next * STATE_SCALE
+        episode_return += reward
+        episode_len += 1
+
+        buf.add(state, action, reward, next_state, done)
+        state = next_state
+
+        truncated = not done and episode_len >= args.max_episode_steps
+        if done or truncated:
+            block_returns.append(episode_return)
+            block_success.append(bool(info.get("reached_goal", False)))
+            state = env.reset() * STATE_SCALE
+            episode_return, episode_len = 0.0, 0
+
+        if step > args.warmup:
+            if isinstance(buf, PrioritizedReplayBuffer):
+                batch, idxs, weights = buf.sample_with_weights(args.batch_size, rng=rng, out=batch_out)
+                result = trainer.train_step(batch, weights=weights)
+                buf.update_priorities(idxs, result.td_errors)
+            else:
+                result = trainer.train_step(buf.sample(args.batch_size, rng=rng, out=batch_out))
+            block_losses.append(result.loss)
+
+        if step % args.report_every == 0:
+            elapsed = time.perf_counter() - block_start
+            avg_return = float(np.mean(block_returns)) if block_returns else float("nan")
+            success = float(np.mean(block_success)) if block_success else 0.0
+            loss = float(np.mean(block_losses)) if block_losses else float("nan")
+            print(
+                f"{step:>7}  {len(block_returns):>8}  {avg_return:>10.3f}  {success:>7.0%}  "
+                f"{loss:>8.1e}  {policy.epsilon:>5.2f}  {args.report_every / elapsed:>17,.0f}"
+            )
+            block_returns, block_success, block_losses = [], [], []
+            block_start = time.perf_counter()
+
+    steps_to_goal = greedy_episode(SimpleGridWorld(), q_net, args.max_episode_steps)
+    optimal = get_grid_oracle(env).optimal_episode_length
+    print()
+    if steps_to_goal is None:
+        print(f"greedy policy: did not reach the goal within {args.max_episode_steps} steps (optimal: {optimal})")
+    else:
+        print(f"greedy policy: reached the goal in {steps_to_goal} steps (optimal: {optimal})")
+
+    if args.save_checkpoint:
+        path = save_checkpoint(
+            q_net,
+            Path(args.save_checkpoint),
+            metadata={"env_steps": args.steps, "seed": args.seed, "greedy_steps_to_goal": steps_to_goal},
+        )
+        print(f"saved checkpoint to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+GlobalWorkspace 竞争基准：
+
+- legacy:  旧实现（每个候选构造 WorkspaceItem，再按 score 全量排序）
+- compete: GlobalWorkspaceSystem.compete（dict 输入；少于 SMALL_COMPETE_SIZE 个候选时走纯 Python，
+           否则向量化打分，只物化 top-k）
+- batch:   GlobalWorkspaceSystem.compete_batch（NumPy 特征列输入）
+
+用法示例（在项目根目录）：
+
+    (venv) python scripts/bench_global_workspace.py
+    (venv) python scripts/bench_global_workspace.py --sizes 2 5 16 64 1000 --top-k 5
+
+小规模（每拍 2~5 个来源的常见情形）会按 --min-calls 重复调用，计时取单次调用的平均值。
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.systems.consciousness.global_workspace import (  # noqa: E402
+    FEATURE_NAMES,
+    GlobalWorkspaceSystem,
+    WorkspaceItem,
+)
+
+
+def _clamp01(value: float) -> float:
+    return min(1.0, max(0.0, float(value)))
+
+
+def legacy_compete(inputs: dict) -> List[WorkspaceItem]:
+    items = [
+        WorkspaceItem(
+            source=source,
+            content=str(payload.get("content", "")),
+            newness=_clamp01(payload.get("newness", 0.5)),
+            relevance=_clamp01(payload.get("relevance", 0.5)),
+            affect=_clamp01(payload.get("affect", 0.5)),
+            goal_alignment=_clamp01(payload.get("goal_alignment", 0.5)),
+        )
+        for source, payload in inputs.items()
+    ]
+    items.sort(key=lambda it: it.score, reverse=True)
+    return items
+
+
+def timed(fn: Callable[[], Any], repeat: int, number: int = 1) -> float:
+    """Best-of-repeat mean time of one call, each repeat running fn `number` times."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark global workspace competition")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 5, 32, 100, 1000, 10000, 100000])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-calls", type=int, default=20000, help="小规模时每次计时的候选总数下限")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    gw = GlobalWorkspaceSystem()
+
+    header = (
+        f"{'candidates':>10}  {'legacy (ms)':>11}  {'compete (ms)':>12}  {'batch (ms)':>10}  "
+        f"{'compete/legacy':>14}  {'batch/legacy':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+    for n in args.sizes:
+        features = rng.uniform(0.0, 1.0, size=(n, len(FEATURE_NAMES)))
+        sources = [f"s{i}" for i in range(n)]
+        contents = [f"c{i}" for i in range(n)]
+        inputs = {
+            src: {"content": c, **dict(zip(FEATURE_NAMES, row))}
+            for src, c, row in zip(sources, contents, features.tolist())
+        }
+
+        number = max(1, args.min_calls // n)
+        legacy = timed(lambda: legacy_compete(inputs), args.repeat, number)
+        compete = timed(lambda: gw.compete(inputs, top_k=args.top_k), args.repeat, number)
+        batch = timed(lambda: gw.compete_batch(features, sources, contents, top_k=args.top_k), args.repeat, number)
+
+        assert legacy_compete(inputs)[0].source == gw.compete_batch(features, sources, contents)[0].source
+        print(
+            f"{n:>10,}  {legacy * 1e3:>11.4f}  {compete * 1e3:>12.4f}  {batch * 1e3:>10.4f}  "
+            f"{legacy / compete:>13.1f}x  {legacy / batch:>11.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+MLP 推理基准：对比 MLP.forward 与免分配推理引擎（MLPInference）的各个变体。
+
+- 网络结构默认与 PolicyNetwork 相同：100 -> 256 -> 128 -> 64 -> 6
+- 变体：forward（基线）、float32、float32 + 融合偏置、float16、int8
+- 输出每个 batch size 下的单次延迟、每次调用的峰值分配（tracemalloc）以及与 forward 的最大误差
+
+用法示例（在项目根目录）：
+
+    (venv) python scripts/bench_mlp_inference.py
+    (venv) python scripts/bench_mlp_inference.py --batch-sizes 1 64 4096 --repeats 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Optional
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.systems.neural.networks import MLP, MLPInference  # noqa: E402
+
+
+def time_call(fn: Callable[[], np.ndarray], repeats: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def peak_alloc(fn: Callable[[], np.ndarray]) -> int:
+    fn()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MLP forward vs allocation-free inference")
+    parser.add_argument("--layers", type=int, nargs="+", default=[100, 256, 128, 64, 6])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 4096])
+    parser.add_argument("--repeats", type=int, default=0, help="每个配置重复次数，0 表示按 batch 自动选择")
+    args = parser.parse_args(argv)
+
+    mlp = MLP(layer_sizes=args.layers)
+    variants = {
+        "float32": MLPInference(mlp),
+        "float32+fused": MLPInference(mlp, fuse_bias=True),
+        "float16": MLPInference(mlp, precision="float16"),
+        "int8": MLPInference(mlp, precision="int8"),
+    }
+
+    base_bytes = sum(w.nbytes for w in mlp._weights)
+    print("weights: " + ", ".join(
+        [f"forward={base_bytes / 1024:.0f}KB"]
+        + [f"{name}={engine.weight_nbytes / 1024:.0f}KB" for name, engine in variants.items()]
+    ))
+    print()
+
+    header = f"{'batch':>6}  {'variant':<14}  {'latency (us)':>12}  {'speedup':>8}  {'peak alloc':>10}  {'max |err|':>9}"
+    print(header)
+    print("-" * len(header))
+
+    rng = np.random.default_rng(0)
+    for bs in args.batch_sizes:
+        x = rng.random((bs, args.layers[0]), dtype=np.float32)
+        repeats = args.repeats or max(20, 20_000 // bs)
+        expected = mlp.forward(x)
+
+        base = time_call(lambda: mlp.forward(x), repeats)
+        print(f"{bs:>6}  {'forward':<14}  {base * 1e6:>12.1f}  {1.0:>7.2f}x  "
+              f"{peak_alloc(lambda: mlp.forward(x)):>10,}  {0.0:>9.1e}")
+        for name, engine in variants.items():
+            latency = time_call(lambda: engine(x), repeats)
+            err = float(np.max(np.abs(engine(x) - expected)))
+            print(f"{bs:>6}  {name:<14}  {latency * 1e6:>12.1f}  {base / latency:>7.2f}x  "
+                  f"{peak_alloc(lambda: engine(x)):>10,}  {err:>9.1e}")
+        print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
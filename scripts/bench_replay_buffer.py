@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+ReplayBuffer 基准：
+
+- 用 add_batch 填满一个大容量缓冲区（默认 1M 条、100 维状态）
+- 测量不同 batch size 下 sample 的平均延迟（分配新数组 / 复用 out 数组）
+- --prioritized 时换成 PrioritizedReplayBuffer，并额外测量 update_priorities 的耗时
+
+用法示例（在项目根目录）：
+
+    (venv) python scripts/bench_replay_buffer.py
+    (venv) python scripts/bench_replay_buffer.py --capacity 4000000 --memmap-dir /tmp/replay
+    (venv) python scripts/bench_replay_buffer.py --prioritized
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.systems.neural.learning import PrioritizedReplayBuffer, ReplayBuffer  # noqa: E402
+
+
+def fill(buf: ReplayBuffer, state_dim: int, chunk: int, rng: np.random.Generator) -> float:
+    start = time.perf_counter()
+    remaining = buf.capacity
+    while remaining > 0:
+        n = min(chunk, remaining)
+        states = rng.random((n, state_dim), dtype=np.float32)
+        buf.add_batch(
+            states,
+            rng.integers(0, 6, size=n),
+            rng.random(n, dtype=np.float32),
+            states,
+            rng.random(n) < 0.01,
+        )
+        remaining -= n
+    return time.perf_counter() - start
+
+
+def time_sample(buf: ReplayBuffer, batch_size: int, repeats: int, rng: np.random.Generator, reuse: bool) -> float:
+    out = buf.allocate_batch(batch_size) if reuse else None
+    start = time.perf_counter()
+    for _ in range(repeats):
+        buf.sample(batch_size, rng=rng, out=out)
+    return (time.perf_counter() - start) / repeats
+
+
+def time_update(buf: PrioritizedReplayBuffer, batch_size: int, repeats: int, rng: np.random.Generator) -> float:
+    idxs = buf.sample_indices(batch_size, rng)
+    errors = rng.random(batch_size)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        buf.update_priorities(idxs, errors)
+    return (time.perf_counter() - start) / repeats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ReplayBuffer sampling latency")
+    parser.add_argument("--capacity", type=int, default=1_000_000)
+    parser.add_argument("--state-dim", type=int, default=100)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 256, 4096])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--memmap-dir", type=str, default=None, help="使用 np.memmap 存储到该目录")
+    parser.add_argument("--prioritized", action="store_true", help="测试 PrioritizedReplayBuffer")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    storage_dir = Path(args.memmap_dir) if args.memmap_dir else None
+    buf_cls = PrioritizedReplayBuffer if args.prioritized else ReplayBuffer
+    buf = buf_cls(args.capacity, state_dim=args.state_dim, storage_dir=storage_dir)
+
+    fill_seconds = fill(buf, args.state_dim, chunk=65_536, rng=rng)
+    print(
+        f"filled {len(buf):,} transitions ({args.state_dim}-dim, "
+        f"{'memmap' if storage_dir else 'in-memory'}) in {fill_seconds:.2f}s "
+        f"-> {len(buf) / fill_seconds:,.0f} transitions/s"
+    )
+    print()
+    header = f"{'batch':>6}  {'sample (us)':>12}  {'sample+out (us)':>16}"
+    if args.prioritized:
+        header += f"  {'update (us)':>12}"
+    print(header)
+    print("-" * len(header))
+    for bs in args.batch_sizes:
+        fresh = time_sample(buf, bs, args.repeats, rng, reuse=False)
+        reused = time_sample(buf, bs, args.repeats, rng, reuse=True)
+        line = f"{bs:>6}  {fresh * 1e6:>12.1f}  {reused * 1e6:>16.1f}"
+        if args.prioritized:
+            line += f"  {time_update(buf, bs, args.repeats, rng) * 1e6:>12.1f}"
+        print(line)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+SimplePlanner 延迟基准：
+
+- loop: 旧实现的写法，逐条序列、逐步调用 predict_next_state（batch = 1）
+- random: 向量化随机打靶，每个时间步一个 (num_samples, state_dim) batch
+- cem: 交叉熵方法（默认 3 轮迭代）
+
+用法示例（在项目根目录）：
+
+    (venv) python scripts/bench_simple_planner.py
+    (venv) python scripts/bench_simple_planner.py --samples 16 256 4096 --horizon 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.systems.environment.interface import NUM_ACTIONS, STATE_SIZE  # noqa: E402
+from us_core.systems.neural.decision import SimplePlanner  # noqa: E402
+from us_core.systems.neural.networks import WorldModel  # noqa: E402
+
+
+def plan_loop(wm: WorldModel, state: np.ndarray, horizon: int, num_samples: int, rng: np.random.Generator) -> int:
+    """逐条 rollout 的参考实现（与向量化之前的 SimplePlanner.plan 相同）。"""
+    best_action, best_score = 0, -1e9
+    for _ in range(num_samples):
+        actions = rng.integers(0, NUM_ACTIONS, size=horizon)
+        s = state[None, :].copy()
+        score = 0.0
+        for a in actions:
+            s = wm.predict_next_state(s, int(a))
+            score += float(np.linalg.norm(s))
+        if score > best_score:
+            best_score, best_action = score, int(actions[0])
+    return best_action
+
+
+def time_call(fn: Callable[[], int], repeats: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SimplePlanner latency")
+    parser.add_argument("--samples", type=int, nargs="+", default=[16, 256, 4096])
+    parser.add_argument("--horizon", type=int, default=3)
+    parser.add_argument("--cem-iterations", type=int, default=3)
+    parser.add_argument("--loop-max-samples", type=int, default=4096, help="超过该样本数时跳过 loop 基线")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    wm = WorldModel(state_dim=STATE_SIZE, num_actions=NUM_ACTIONS)
+    state = rng.random(STATE_SIZE, dtype=np.float32)
+
+    header = f"{'samples':>8}  {'loop (ms)':>10}  {'random (ms)':>11}  {'speedup':>8}  {'cem (ms)':>9}"
+    print(header)
+    print("-" * len(header))
+    for n in args.samples:
+        repeats = max(3, 2048 // n)
+        random_planner = SimplePlanner(wm, NUM_ACTIONS, horizon=args.horizon, num_samples=n)
+        cem_planner = SimplePlanner(
+            wm, NUM_ACTIONS, horizon=args.horizon, num_samples=n,
+            method="cem", cem_iterations=args.cem_iterations,
+        )
+
+        vec = time_call(lambda: random_planner.plan(state, rng=rng), repeats)
+        cem = time_call(lambda: cem_planner.plan(state, rng=rng), repeats)
+        if n <= args.loop_max_samples:
+            loop = time_call(lambda: plan_loop(wm, state, args.horizon, n, rng), max(1, repeats // 4))
+            loop_s, speedup_s = f"{loop * 1e3:>10.2f}", f"{loop / vec:>7.1f}x"
+        else:
+            loop_s, speedup_s = f"{'-':>10}", f"{'-':>8}"
+        print(f"{n:>8}  {loop_s}  {vec * 1e3:>11.2f}  {speedup_s}  {cem * 1e3:>9.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+VecGridWorld / SubprocVecEnv 吞吐基准：
+
+- 对比 N 个 SimpleGridWorld 逐个 step、一个 VecGridWorld 批量 step，
+  以及多进程的 SubprocVecEnv（--workers > 0 时）
+- 输出每秒环境步数（env-steps / second）
+- --with-policy 时动作由 EpsilonGreedyPolicy 给出：逐个环境用 select_action，
+  向量化环境用一次前向的 select_actions，用来衡量「选动作 + step」的总成本
+
+用法示例（在项目根目录）：
+
+    (venv) python scripts/bench_vec_grid_world.py --num-envs 1 64 1024 --steps 200
+    (venv) python scripts/bench_vec_grid_world.py --num-envs 256 1024 --workers 4
+    (venv) python scripts/bench_vec_grid_world.py --num-envs 1 64 1024 --with-policy
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List, Optional
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.environments.grid_world import SimpleGridWorld  # noqa: E402
+from us_core.environments.subproc_vec_env import SubprocVecEnv  # noqa: E402
+from us_core.environments.vec_grid_world import VecGridWorld  # noqa: E402
+from us_core.systems.environment.interface import NUM_ACTIONS, STATE_SIZE  # noqa: E402
+from us_core.systems.neural.decision import EpsilonGreedyPolicy  # noqa: E402
+from us_core.systems.neural.networks import PolicyNetwork  # noqa: E402
+from us_core.utils.monitoring import measure_step_throughput  # noqa: E402
+
+
+def bench_sequential(
+    num_envs: int, steps: int, rng: np.random.Generator, policy: Optional[EpsilonGreedyPolicy] = None
+) -> float:
+    envs = [SimpleGridWorld() for _ in range(num_envs)]
+    states = [env.reset() for env in envs]
+
+    def step_all() -> None:
+        if policy is None:
+            actions = rng.integers(0, NUM_ACTIONS, size=num_envs)
+        else:
+            actions = [policy.select_action(s, rng=rng)[0] for s in states]
+        for i, (env, a) in enumerate(zip(envs, actions)):
+            states[i], _, done, _ = env.step(int(a))
+            if done:
+                states[i] = env.reset()
+
+    return measure_step_throughput(step_all, num_steps=steps) * num_envs
+
+
+def _batched_stepper(venv, num_envs: int, rng: np.random.Generator, policy: Optional[EpsilonGreedyPolicy]):
+    current = [venv.reset()]
+
+    def step_all() -> None:
+        if policy is None:
+            actions = rng.integers(0, NUM_ACTIONS, size=num_envs)
+        else:
+            actions, _ = policy.select_actions(current[0], rng=rng)
+        current[0] = venv.step(actions)[0]
+
+    return step_all
+
+
+def bench_vectorized(
+    num_envs: int, steps: int, rng: np.random.Generator, policy: Optional[EpsilonGreedyPolicy] = None
+) -> float:
+    venv = VecGridWorld(num_envs)
+    step_all = _batched_stepper(venv, num_envs, rng, policy)
+    return measure_step_throughput(step_all, num_steps=steps) * num_envs
+
+
+def bench_subproc(
+    num_envs: int,
+    steps: int,
+    workers: int,
+    rng: np.random.Generator,
+    policy: Optional[EpsilonGreedyPolicy] = None,
+) -> float:
+    with SubprocVecEnv(num_envs, num_workers=workers) as venv:
+        step_all = _batched_stepper(venv, num_envs, rng, policy)
+        return measure_step_throughput(step_all, num_steps=steps) * num_envs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark VecGridWorld vs sequential SimpleGridWorld")
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[1, 16, 256, 1024])
+    parser.add_argument("--steps", type=int, default=200, help="每个配置执行多少次批量 step")
+    parser.add_argument("--workers", type=int, default=0, help="SubprocVecEnv 的 worker 数，0 表示不测")
+    parser.add_argument("--with-policy", action="store_true", help="用 EpsilonGreedyPolicy 选动作（ε=0.1）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    policy: Optional[EpsilonGreedyPolicy] = None
+    if args.with_policy:
+        net = PolicyNetwork(input_size=STATE_SIZE, output_size=NUM_ACTIONS)
+        policy = EpsilonGreedyPolicy(policy_net=net, action_size=NUM_ACTIONS, epsilon=0.1)
+
+    header = f"{'N':>6}  {'sequential':>14}  {'vectorized':>14}  {'speedup':>8}"
+    if args.workers > 0:
+        header += f"  {'subproc':>14}  {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for n in args.num_envs:
+        seq = bench_sequential(n, args.steps, rng, policy)
+        vec = bench_vectorized(n, args.steps, rng, policy)
+        line = f"{n:>6}  {seq:>14,.0f}  {vec:>14,.0f}  {vec / seq:>7.1f}x"
+        if args.workers > 0:
+            sub = bench_subproc(n, args.steps, args.workers, rng, policy)
+            line += f"  {sub:>14,.0f}  {sub / seq:>7.1f}x"
+        print(line)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
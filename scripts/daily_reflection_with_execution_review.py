@@ -3,7 +3,8 @@
 增强版日终反思脚本：
 
 - 保留已有 daily reflection 的内容（从 data/journal 里读取最新的 daily_reflection*.md）
-- 叠加：今天计划执行情况（基于 data/plans/day_focus_plan_from_mood_* / focus_block_*）
+- 叠加：今天计划执行情况（查询 data/plans/plan_index.jsonl，再补上扫描到的、
+  索引里没有的计划 Markdown，例如升级前生成或手写的计划；按计划文件名去重）
 - 同时：把这些执行情况写入 planner_history.jsonl，用于长期偏好学习。
 """
 
@@ -22,7 +23,9 @@ SRC_DIR = PROJECT_ROOT / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-from us_core.planner.execution_review import analyze_plan_file  # type: ignore
+from us_core.planner.execution_review import analyze_plan_file, load_execution_for_plan  # type: ignore
+from us_core.planner.loader import load_tasks_from_jsonl  # type: ignore
+from us_core.planner.plan_index import query_plan_artifacts  # type: ignore
 from us_core.planner.daily_review import (  # type: ignore
     NamedExecutionSummary,
     aggregate_execution_summaries,
@@ -67,7 +70,7 @@ def _find_latest_reflection_file(today_only: bool = True) -> Optional[Path]:
     return candidates[0]
 
 
-def _find_today_plan_files() -> List[Path]:
+def _find_today_plan_files(fallback_to_all: bool = True) -> List[Path]:
     plans_dir = PROJECT_ROOT / "data" / "plans"
     if not plans_dir.exists():
         return []
@@ -79,7 +82,9 @@ def _find_today_plan_files() -> List[Path]:
     if candidates_today:
         return sorted(candidates_today, key=lambda p: p.stat().st_mtime)
 
-    # 没有今天的，就退回到全部 md 文件（可能是之前的）
+    # 没有今天的，就退回到全部 md 文件（可能是之前的）；索引里已有今天的计划时不退回
+    if not fallback_to_all:
+        return []
     all_md = list(plans_dir.glob("*.md"))
     return sorted(all_md, key=lambda p: p.stat().st_mtime)
 
@@ -95,22 +100,29 @@ def main(argv: Optional[List[str]] = None) -> int:
     else:
         reflection_text = "# Daily Reflection\n\n> 今天还没有生成正式的 daily_reflection 内容。\n"
 
-    # 3) 找到今天的 plan 文件
-    plan_files = _find_today_plan_files()
-
+    # 3) 找到今天的 plan：先用 plan_index.jsonl（tasks.jsonl 只加载一次），
+    #    再补上索引里没有的计划 Markdown（升级前生成的、手写的），按文件名去重
     named_summaries: List[NamedExecutionSummary] = []
-    for plan_path in plan_files:
+    artifacts = query_plan_artifacts(datetime.now().date())
+    seen = set()
+    if artifacts:
+        tasks = load_tasks_from_jsonl()
+        for artifact in artifacts:
+            if artifact.plan_name in seen:
+                continue
+            seen.add(artifact.plan_name)
+            summary = load_execution_for_plan(artifact.task_ids, tasks=tasks)
+            named_summaries.append(NamedExecutionSummary(plan_name=artifact.plan_name, summary=summary))
+    for plan_path in _find_today_plan_files(fallback_to_all=not artifacts):
+        if plan_path.name in seen:
+            continue
+        seen.add(plan_path.name)
         summary = analyze_plan_file(plan_path)
+        named_summaries.append(NamedExecutionSummary(plan_name=plan_path.name, summary=summary))
 
-        # 把每个 plan 的执行结果写入历史记忆
-        append_execution_summary(plan_name=plan_path.name, summary=summary)
-
-        named_summaries.append(
-            NamedExecutionSummary(
-                plan_name=plan_path.name,
-                summary=summary,
-            )
-        )
+    # 把每个 plan 的执行结果写入历史记忆
+    for named in named_summaries:
+        append_execution_summary(plan_name=named.plan_name, summary=named.summary)
 
     # 4) 聚合执行情况
     daily_agg = aggregate_execution_summaries(named_summaries)
@@ -25,6 +25,7 @@ from us_core.planner.dayplan import (  # type: ignore
     day_plan_to_markdown,
 )
 from us_core.planner.mode_resolver import resolve_mode_from_mood_files  # type: ignore
+from us_core.planner.plan_index import record_plan_artifact, task_ids_from_day_plan  # type: ignore
 from us_core.planner.models import FilterSpec  # type: ignore
 
 
@@ -174,6 +175,12 @@ def main(argv: Optional[List[str]] = None) -> int:
         filename = f"day_focus_plan_from_mood_{info.mode}_{timestamp}.md"
         out_path = plans_dir / filename
         out_path.write_text(full_md, encoding="utf-8")
+        record_plan_artifact(
+            out_path,
+            mode=info.mode,
+            task_ids=task_ids_from_day_plan(day_plan),
+            kind="day_focus_plan_from_mood",
+        )
         print()
         print(f"[saved] {out_path}")
 
@@ -20,6 +20,7 @@ if str(SRC_DIR) not in sys.path:
 
 from us_core.planner.engine import make_focus_block_plan_with_history, plan_to_markdown  # type: ignore
 from us_core.planner.mode_resolver import resolve_mode_from_mood_files  # type: ignore
+from us_core.planner.plan_index import record_plan_artifact, task_ids_from_plan  # type: ignore
 from us_core.planner.models import FilterSpec  # type: ignore
 
 
@@ -120,6 +121,12 @@ def main(argv: Optional[List[str]] = None) -> int:
         filename = f"focus_block_from_mood_{info.mode}_{timestamp}.md"
         out_path = plans_dir / filename
         out_path.write_text(full_md, encoding="utf-8")
+        record_plan_artifact(
+            out_path,
+            mode=info.mode,
+            task_ids=task_ids_from_plan(plan),
+            kind="focus_block_from_mood",
+        )
         print()
         print(f"[saved] {out_path}")
 
@@ -4,11 +4,13 @@
 
 - 基于 planner_history.jsonl + tasks.jsonl
 - 统计总体完成率、按标签的完成率
+- 可用 --window-days 只看最近 N 天的行为
 - 输出到 data/self_model/self_model_snapshot_YYYY-MM-DD_HHMM.md
 """
 
 from __future__ import annotations
 
+import argparse
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
@@ -27,7 +29,16 @@ from us_core.self_model.insights import (  # type: ignore
 
 
 def main(argv: Optional[List[str]] = None) -> int:
-    insights = load_planner_insights()
+    parser = argparse.ArgumentParser(description="Generate self model snapshot")
+    parser.add_argument(
+        "--window-days",
+        type=int,
+        default=None,
+        help="只统计最近 N 天的规划历史，默认统计全部历史",
+    )
+    args = parser.parse_args(argv)
+
+    insights = load_planner_insights(window_days=args.window_days)
 
     md = insights_to_markdown(insights, top_n=3, min_planned_per_tag=3)
 
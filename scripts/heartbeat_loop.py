@@ -4,21 +4,33 @@ from __future__ import annotations
 在项目根目录运行：
 
 (.venv) PS D:/UniverseSingularity> python scripts/heartbeat_loop.py
+
+按固定频率运行胚胎心跳（实时预算模式），输出每拍耗时 p50 / p95 / p99 与超时统计：
+
+(.venv) PS D:/UniverseSingularity> python scripts/heartbeat_loop.py --hz 20 --duration 5
+(.venv) PS D:/UniverseSingularity> python scripts/heartbeat_loop.py --hz 50 --beats 500 --policy catch_up
+(.venv) PS D:/UniverseSingularity> python scripts/heartbeat_loop.py --hz 50 --duration 5 --load-ms 25
+  （--load-ms 注册一个每拍忙算指定毫秒的模拟系统，用来观察超出预算时的表现）
 """
 
+import argparse
 import sys
+import time
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 # 确保可以 import 到 config / src 包
 ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+SRC = ROOT / "src"
+for path in (ROOT, SRC):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
 
-from config.settings import get_settings
-from src.us_core.core.heartbeat import run_heartbeat_cycle
 
+def run_llm_cycle() -> None:
+    from config.settings import get_settings
+    from src.us_core.core.heartbeat import run_heartbeat_cycle
 
-def main() -> None:
     settings = get_settings()
 
     print("=== Universe Singularity - Heartbeat Cycle ===")
@@ -33,5 +45,47 @@ def main() -> None:
     print(reply or "(未向模型请求总结)")
 
 
+def run_realtime(
+    hz: float, beats: Optional[int], duration: Optional[float], policy: str, load_ms: float = 0.0
+) -> None:
+    from us_core.core.embryo import ConsciousDigitalEmbryo
+
+    embryo = ConsciousDigitalEmbryo.simple_demo()
+    if load_ms > 0:
+
+        def synthetic_load(ctx: Dict[str, Any]) -> Dict[str, Any]:
+            end = time.perf_counter() + load_ms / 1000.0
+            while time.perf_counter() < end:
+                pass
+            return {"load_ms": load_ms}
+
+        embryo.orchestrator.register_system("synthetic_load", synthetic_load)
+    print(f"=== Universe Singularity - Real-time Heartbeat ({hz:g} Hz, policy={policy}) ===")
+    report = embryo.run_realtime(hz=hz, beats=beats, duration=duration, policy=policy)
+
+    pct = report.percentiles_ms
+    print(f"beats      : {report.beats} in {report.duration:.2f}s ({report.achieved_hz:.1f} Hz achieved)")
+    print(f"overruns   : {report.overruns}  skipped slots: {report.skipped}")
+    print(f"max late   : {report.max_lateness * 1e3:.2f} ms")
+    if pct:
+        print(f"latency ms : p50={pct['p50']:.3f}  p95={pct['p95']:.3f}  p99={pct['p99']:.3f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Heartbeat loop")
+    parser.add_argument("--hz", type=float, default=None, help="按固定频率运行胚胎心跳；不指定时跑 LLM 心跳循环")
+    parser.add_argument("--beats", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=None, help="运行秒数（与 --beats 至少给一个，默认 5 秒）")
+    parser.add_argument("--policy", choices=("skip", "catch_up"), default="skip", help="落后时丢弃还是补跑")
+    parser.add_argument("--load-ms", type=float, default=0.0, help="注册一个每拍耗时约 N 毫秒的模拟系统")
+    args = parser.parse_args(argv)
+
+    if args.hz is None:
+        run_llm_cycle()
+        return
+    duration = args.duration if (args.duration is not None or args.beats is not None) else 5.0
+    run_realtime(args.hz, args.beats, duration, args.policy, args.load_ms)
+
+
 if __name__ == "__main__":
     main()
@@ -24,6 +24,7 @@ if str(SRC_DIR) not in sys.path:
 
 from us_core.planner.models import FilterSpec  # type: ignore
 from us_core.planner.mode_resolver import resolve_mode_from_mood_files  # type: ignore
+from us_core.planner.plan_index import record_plan_artifact, task_ids_from_day_plan  # type: ignore
 from us_core.self_model.insights import load_planner_insights  # type: ignore
 from us_core.self_model.day_mode_planner import (  # type: ignore
     plan_day_with_mood_and_self_model,
@@ -141,6 +142,12 @@ def main(argv: Optional[List[str]] = None) -> int:
         filename = f"day_plan_mood_selfmodel_{final_mode}_{timestamp}.md"
         out_path = plans_dir / filename
         out_path.write_text(md, encoding="utf-8")
+        record_plan_artifact(
+            out_path,
+            mode=final_mode,
+            task_ids=task_ids_from_day_plan(result.day_plan),
+            kind="day_plan_mood_selfmodel",
+        )
         print()
         print(f"[saved] {out_path}")
 
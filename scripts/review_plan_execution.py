@@ -9,12 +9,18 @@
 
     # 2）只在控制台展示，不导出新报告
     (venv) python scripts\review_plan_execution.py --plan-file ... --no-export
+
+    # 3）按日期范围复盘（读取 data/plans/plan_index.jsonl，不解析 Markdown）
+    (venv) python scripts\review_plan_execution.py --from-date 2025-11-01 --to-date 2025-11-30
+
+    # 4）把旧的、还没登记到 plan_index.jsonl 的计划 Markdown 补录进索引
+    (venv) python scripts\review_plan_execution.py --backfill-index
 """
 
 from __future__ import annotations
 
 import argparse
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from typing import List, Optional
 import sys
@@ -26,10 +32,16 @@ SRC_DIR = PROJECT_ROOT / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
+from us_core.planner.daily_review import (  # type: ignore
+    daily_review_to_markdown,
+    review_plans_in_range,
+)
 from us_core.planner.execution_review import (  # type: ignore
     analyze_plan_file,
     execution_summary_to_markdown,
+    load_execution_for_plan,
 )
+from us_core.planner.plan_index import backfill_plan_index, find_plan_artifact  # type: ignore
 from us_core.planner.preference_memory import append_execution_summary  # type: ignore
 
 
@@ -39,9 +51,26 @@ def main(argv: Optional[List[str]] = None) -> int:
     parser.add_argument(
         "--plan-file",
         type=str,
-        required=True,
+        default=None,
         help="Planner 生成的 Markdown 计划文件路径（相对或绝对）",
     )
+    parser.add_argument(
+        "--from-date",
+        type=str,
+        default=None,
+        help="按日期范围复盘的起始日期（YYYY-MM-DD），基于 plan_index.jsonl",
+    )
+    parser.add_argument(
+        "--to-date",
+        type=str,
+        default=None,
+        help="按日期范围复盘的结束日期（YYYY-MM-DD），默认与 --from-date 相同",
+    )
+    parser.add_argument(
+        "--backfill-index",
+        action="store_true",
+        help="把 data/plans 下尚未登记的计划 Markdown 补录进 plan_index.jsonl",
+    )
     parser.add_argument(
         "--no-export",
         action="store_true",
@@ -50,13 +79,40 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     args = parser.parse_args(argv)
 
+    plans_dir = PROJECT_ROOT / "data" / "plans"
+
+    if args.backfill_index:
+        added = backfill_plan_index(plans_dir)
+        print(f"[info] backfilled {len(added)} plan(s) into plan_index.jsonl")
+        if args.plan_file is None and args.from_date is None:
+            return 0
+
+    if args.from_date is not None:
+        try:
+            start = date.fromisoformat(args.from_date)
+            end = date.fromisoformat(args.to_date) if args.to_date else start
+        except ValueError:
+            print("[error] --from-date / --to-date must be YYYY-MM-DD")
+            return 1
+
+        agg = review_plans_in_range(start, end)
+        print(daily_review_to_markdown(agg))
+        return 0
+
+    if args.plan_file is None:
+        parser.error("one of --plan-file / --from-date / --backfill-index is required")
+
     plan_path = Path(args.plan_file).expanduser().resolve()
     if not plan_path.exists():
         print(f"[error] plan file not found: {plan_path}")
         return 1
 
-    # 1) 分析执行情况
-    summary = analyze_plan_file(plan_path)
+    # 1) 分析执行情况：优先使用 plan_index.jsonl 中的结构化记录，没有再解析 Markdown
+    artifact = find_plan_artifact(plan_path.name)
+    if artifact is not None:
+        summary = load_execution_for_plan(artifact.task_ids)
+    else:
+        summary = analyze_plan_file(plan_path)
 
     # 1.5) 把结果写入 planner_history.jsonl，作为长期偏好记忆
     append_execution_summary(plan_name=plan_path.name, summary=summary)
@@ -69,7 +125,6 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     # 3) 导出复盘报告
     if not args.no_export:
-        plans_dir = PROJECT_ROOT / "data" / "plans"
         plans_dir.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y-%m-%d_%H%M")
         filename = f"execution_review_{plan_path.stem}_{timestamp}.md"
@@ -5,11 +5,13 @@ For now it provides:
 - CoreOrchestrator: register subsystems and run a single heartbeat
 - LifecycleManager: simple CREATED → INITIALIZED → RUNNING → STOPPED lifecycle
 - PerformanceMetrics: lightweight metrics over a given embryo object
+- FixedRateRunner: fixed-cadence heartbeat loop with overrun accounting
 """
 
 from .orchestration import CoreOrchestrator, RegisteredSystem
 from .lifecycle import LifecycleManager, LifecycleState
 from .monitoring import PerformanceMetrics
+from .realtime import FixedRateRunner, RunReport
 
 __all__ = [
     "CoreOrchestrator",
@@ -17,4 +19,6 @@ __all__ = [
     "LifecycleManager",
     "LifecycleState",
     "PerformanceMetrics",
+    "FixedRateRunner",
+    "RunReport",
 ]
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from us_core.systems.consciousness.global_workspace import GlobalWorkspaceSystem
 from .orchestration import CoreOrchestrator
-from .lifecycle import LifecycleManager
+from .lifecycle import LifecycleManager, LifecycleState
 from .monitoring import PerformanceMetrics
+from .realtime import OVERRUN_SKIP, FixedRateRunner, RunReport
 
 
 @dataclass
@@ -21,6 +22,7 @@ class ConsciousDigitalEmbryo:
     - metrics: 性能 / 心跳监控
     - context: 当前“全局上下文”
     - heartbeat_count: 记录调用 heartbeat 的次数
+    - last_results: 最近一拍各系统 step 的结果
     """
     workspace: GlobalWorkspaceSystem
     orchestrator: CoreOrchestrator
@@ -28,6 +30,7 @@ class ConsciousDigitalEmbryo:
     metrics: PerformanceMetrics
     context: Dict[str, Any] = field(default_factory=dict)
     heartbeat_count: int = 0
+    last_results: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
     @classmethod
     def simple_demo(cls) -> "ConsciousDigitalEmbryo":
@@ -66,8 +69,8 @@ class ConsciousDigitalEmbryo:
         - 在其中维护 `heartbeat_steps` 计数器
         - 同时递增自身的 `heartbeat_count`
 
-        在此基础上，再尽量调用 lifecycle / orchestrator / metrics
-        上可能存在的心跳相关方法（如果存在的话）。
+        在此基础上，通过 lifecycle.step 驱动 orchestrator 运行所有已注册系统
+        （各系统的结果保存在 last_results），并把这一拍记到 metrics。
         """
         # 1) 复制一份上下文，避免直接修改传入的 dict
         base_ctx: Dict[str, Any] = dict(context or {})
@@ -78,42 +81,40 @@ class ConsciousDigitalEmbryo:
         self.heartbeat_count += 1
         self.context = base_ctx
 
-        # 3) 尝试驱动生命周期管理器
-        if hasattr(self.lifecycle, "heartbeat"):
-            try:
-                # 优先尝试接受 context 的版本
-                result = self.lifecycle.heartbeat(base_ctx)  # type: ignore[arg-type]
-                # 如果 lifecycle.heartbeat 返回了新的上下文，则更新之
-                if isinstance(result, dict):
-                    base_ctx = result
-                    self.context = base_ctx
-            except TypeError:
-                # 不接受参数的版本
-                self.lifecycle.heartbeat()  # type: ignore[call-arg]
-        elif hasattr(self.lifecycle, "tick"):
-            try:
-                self.lifecycle.tick(base_ctx)  # type: ignore[arg-type]
-            except TypeError:
-                self.lifecycle.tick()  # type: ignore[call-arg]
-
-        # 4) 尝试让 orchestrator 跑一次循环（如果它提供了类似方法）
-        if hasattr(self.orchestrator, "run_cycle"):
-            try:
-                self.orchestrator.run_cycle(base_ctx)  # type: ignore[arg-type]
-            except TypeError:
-                self.orchestrator.run_cycle()  # type: ignore[call-arg]
-        elif hasattr(self.orchestrator, "run_once"):
-            try:
-                self.orchestrator.run_once(base_ctx)  # type: ignore[arg-type]
-            except TypeError:
-                self.orchestrator.run_once()  # type: ignore[call-arg]
+        # 3) 通过生命周期管理器跑一拍：按调度执行所有已注册的系统
+        if self.lifecycle.state == LifecycleState.CREATED:
+            self.lifecycle.initialize()
+        self.last_results = self.lifecycle.step(base_ctx)
 
-        # 5) 记录一次心跳到 metrics
+        # 4) 记录一次心跳到 metrics
         if hasattr(self.metrics, "record_heartbeat"):
             try:
                 self.metrics.record_heartbeat()
             except TypeError:
                 self.metrics.record_heartbeat(base_ctx)  # type: ignore[call-arg]
 
-        # 6) 返回最新上下文（测试会用这个）
+        # 5) 返回最新上下文（测试会用这个）
         return base_ctx
+
+    def run_realtime(
+        self,
+        hz: float,
+        beats: Optional[int] = None,
+        duration: Optional[float] = None,
+        policy: str = OVERRUN_SKIP,
+        max_catch_up: int = 5,
+    ) -> RunReport:
+        """
+        以固定频率连续心跳（每拍使用上一拍返回的 context，运行所有已注册系统）。
+
+        每拍耗时写入 self.metrics，可用 self.metrics.latency_percentiles()
+        或 PerformanceMetrics.calculate_all_metrics(self) 查看 p50 / p95 / p99。
+        """
+        runner = FixedRateRunner(
+            beat_fn=lambda: self.heartbeat(self.context),
+            hz=hz,
+            policy=policy,
+            max_catch_up=max_catch_up,
+            metrics=self.metrics,
+        )
+        return runner.run(beats=beats, duration=duration)
@@ -3,7 +3,9 @@ from __future__ import annotations
 from enum import Enum
 from typing import Any, Dict, Optional
 
-from .orchestration import CoreOrchestrator
+from us_core.utils.profiling import SystemProfiler
+
+from .orchestration import BeatSchedule, CoreOrchestrator
 
 
 class LifecycleState(str, Enum):
@@ -20,6 +22,7 @@ class LifecycleManager:
         self.orchestrator = orchestrator
         self.state: LifecycleState = LifecycleState.CREATED
         self.heartbeat_count: int = 0
+        self.last_schedule: Optional[BeatSchedule] = None
 
     def initialize(self) -> None:
         """Move from CREATED → INITIALIZED. Idempotent."""
@@ -27,13 +30,34 @@ class LifecycleManager:
             self.state = LifecycleState.INITIALIZED
 
     def step(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
-        """Run one heartbeat and update state."""
+        """Run one heartbeat and update state.
+
+        Which systems ran / were skipped this beat is kept in `last_schedule`;
+        `schedule()` shows when each system is due next.
+        """
         if self.state not in (LifecycleState.INITIALIZED, LifecycleState.RUNNING):
             raise RuntimeError("LifecycleManager must be initialized before stepping")
 
         self.state = LifecycleState.RUNNING
         self.heartbeat_count += 1
-        return self.orchestrator.heartbeat(context or {})
+        results = self.orchestrator.heartbeat(context or {})
+        self.last_schedule = self.orchestrator.last_schedule
+        return results
+
+    def enable_profiling(self, capacity: int = 4096, track_allocations: bool = True) -> SystemProfiler:
+        """Turn on per-system profiling of heartbeat steps (no restart needed)."""
+        return self.orchestrator.enable_profiling(capacity=capacity, track_allocations=track_allocations)
+
+    def disable_profiling(self) -> None:
+        self.orchestrator.disable_profiling()
+
+    @property
+    def profiler(self) -> Optional[SystemProfiler]:
+        return self.orchestrator.profiler
+
+    def schedule(self) -> Dict[str, Dict[str, Any]]:
+        """Per-system tick schedule of the underlying orchestrator."""
+        return self.orchestrator.schedule()
 
     def shutdown(self) -> None:
         """Move to STOPPED state."""
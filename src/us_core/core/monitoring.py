@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import math
-from typing import Any, Dict, Iterable, Sequence
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Sequence
+
+from us_core.utils.monitoring import latency_percentiles_ms
 
 
 class PerformanceMetrics:
@@ -21,6 +24,58 @@ class PerformanceMetrics:
     # Consciousness related
     CONSCIOUSNESS_LEVEL = "consciousness_level"
 
+    # Real-time heartbeat (milliseconds / ratio)
+    HEARTBEAT_P50_MS = "heartbeat_latency_p50_ms"
+    HEARTBEAT_P95_MS = "heartbeat_latency_p95_ms"
+    HEARTBEAT_P99_MS = "heartbeat_latency_p99_ms"
+    HEARTBEAT_OVERRUN_RATE = "heartbeat_overrun_rate"
+
+    def __init__(self, latency_window: int = 2048) -> None:
+        """Per-instance heartbeat accounting.
+
+        Latencies are kept in a bounded window so percentiles reflect recent
+        behaviour and memory stays constant for long-running loops.
+        """
+        if latency_window <= 0:
+            raise ValueError("latency_window must be > 0")
+        self.heartbeats: int = 0
+        self.timed_beats: int = 0
+        self.overruns: int = 0
+        self.skipped_beats: int = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+
+    # -------- heartbeat accounting --------
+    def record_heartbeat(self) -> None:
+        """Called by ConsciousDigitalEmbryo.heartbeat once per beat."""
+        self.heartbeats += 1
+
+    def record_beat_latency(self, seconds: float, overrun: bool = False, skipped: int = 0) -> None:
+        """Record the wall-clock latency of one paced beat.
+
+        `skipped` is the number of schedule slots dropped after this beat.
+        """
+        self.timed_beats += 1
+        self._latencies.append(float(seconds))
+        if overrun:
+            self.overruns += 1
+        self.skipped_beats += int(skipped)
+
+    def latency_percentiles(self, percentiles: Sequence[float] = (50, 95, 99)) -> Dict[str, float]:
+        """Nearest-rank percentiles of recent beat latency, in milliseconds."""
+        return latency_percentiles_ms(self._latencies, percentiles)
+
+    def heartbeat_metrics(self) -> Dict[str, float]:
+        """Percentiles + overrun rate under the metric names above."""
+        pct = self.latency_percentiles()
+        if not pct:
+            return {}
+        return {
+            self.HEARTBEAT_P50_MS: pct["p50"],
+            self.HEARTBEAT_P95_MS: pct["p95"],
+            self.HEARTBEAT_P99_MS: pct["p99"],
+            self.HEARTBEAT_OVERRUN_RATE: self.overruns / self.timed_beats,
+        }
+
     @classmethod
     def calculate_all_metrics(cls, embryo: Any) -> Dict[str, float]:
         """Calculate a small set of metrics from a given embryo-like object.
@@ -30,6 +85,7 @@ class PerformanceMetrics:
         - experience_usage: Iterable[float]
         - decision_accuracy: Iterable[float]
         - global_workspace: object with .last_winner.score in [0, 1]
+        - metrics: a PerformanceMetrics instance with recorded beat latencies
         """
         metrics: Dict[str, float] = {}
 
@@ -56,6 +112,11 @@ class PerformanceMetrics:
             level = 1.0
         metrics[cls.CONSCIOUSNESS_LEVEL] = level
 
+        # Real-time heartbeat stats, when the embryo carries a metrics instance
+        tracker: Optional[PerformanceMetrics] = getattr(embryo, "metrics", None)
+        if isinstance(tracker, PerformanceMetrics):
+            metrics.update(tracker.heartbeat_metrics())
+
         return metrics
 
     # -------- helpers --------
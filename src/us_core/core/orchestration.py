@@ -1,31 +1,215 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from us_core.utils.profiling import SystemProfiler
 
 StepFn = Callable[[Dict[str, Any]], Dict[str, Any]]
 
+# Scheduler modes
+SEQUENTIAL = "sequential"
+CONCURRENT = "concurrent"
+SCHEDULER_MODES = (SEQUENTIAL, CONCURRENT)
+
+# Context key under which a system with dependencies sees its upstream results
+UPSTREAM_KEY = "upstream"
+# Key set on the marker returned for a system that missed its timeout
+STALE_KEY = "stale"
+
+
+def stale_result(last_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Marker returned for a system that did not finish within its timeout."""
+    return {STALE_KEY: True, "last_result": last_result}
+
+
+def is_stale(result: Dict[str, Any]) -> bool:
+    return bool(result.get(STALE_KEY, False))
+
+
+# Adaptive rate control: EMA weight of the newest latency sample
+LATENCY_EMA_ALPHA = 0.3
+
 
 @dataclass
 class RegisteredSystem:
     name: str
     step_fn: StepFn
     enabled: bool = True
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None  # seconds; only enforced in concurrent mode
+    # -------- tick rate --------
+    every_beats: int = 1  # run every N heartbeats ...
+    every_seconds: Optional[float] = None  # ... or at most once every T seconds
+    latency_budget: Optional[float] = None  # seconds; enables adaptive slowdown
+    max_slowdown: int = 16
+    # -------- schedule state --------
+    slowdown: int = field(default=1, repr=False)
+    next_beat: int = field(default=0, repr=False)
+    next_time: Optional[float] = field(default=None, repr=False)
+    ema_latency: Optional[float] = field(default=None, repr=False)
+    # -------- runtime stats --------
+    runs: int = field(default=0, repr=False)
+    stale_count: int = field(default=0, repr=False)
+    last_latency: Optional[float] = field(default=None, repr=False)
+    max_latency: float = field(default=0.0, repr=False)
+    total_latency: float = field(default=0.0, repr=False)
+    last_result: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    last_error: Optional[BaseException] = field(default=None, repr=False)
+
+    def record(self, latency: float) -> None:
+        self.runs += 1
+        self.last_latency = latency
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+        if self.ema_latency is None:
+            self.ema_latency = latency
+        else:
+            self.ema_latency += LATENCY_EMA_ALPHA * (latency - self.ema_latency)
+        self._adapt()
+
+    def _adapt(self) -> None:
+        """Halve the rate while over budget; recover once well under it."""
+        budget = self.latency_budget
+        if budget is None or self.ema_latency is None:
+            return
+        if self.ema_latency > budget and self.slowdown < self.max_slowdown:
+            self.slowdown = min(self.max_slowdown, self.slowdown * 2)
+        elif self.ema_latency < 0.5 * budget and self.slowdown > 1:
+            self.slowdown //= 2
+
+    @property
+    def interval_beats(self) -> int:
+        return self.every_beats * self.slowdown
+
+    @property
+    def interval_seconds(self) -> Optional[float]:
+        return None if self.every_seconds is None else self.every_seconds * self.slowdown
+
+    def is_due(self, beat: int, now: float) -> bool:
+        if self.every_seconds is not None:
+            return self.next_time is None or now >= self.next_time
+        return beat >= self.next_beat
+
+    def advance(self, beat: int, now: float) -> None:
+        """Schedule the next run after running at (beat, now)."""
+        self.next_beat = beat + self.interval_beats
+        interval = self.interval_seconds
+        if interval is not None:
+            # 按固定节拍推进，避免误差累积；落后超过一个周期时重新对齐
+            base = now if self.next_time is None else self.next_time
+            self.next_time = base + interval
+            if self.next_time <= now:
+                self.next_time = now + interval
+
+
+@dataclass
+class BeatSchedule:
+    """What one heartbeat ran and skipped (exposed via LifecycleManager.step)."""
+
+    beat: int
+    ran: List[str]
+    skipped: List[str]
+    slowdowns: Dict[str, int]
 
 
 class CoreOrchestrator:
     """Very small orchestrator: runs one heartbeat across all subsystems.
 
     - You can register named systems with a step function.
-    - `heartbeat(context)` will call each enabled system in registration order.
+    - `heartbeat(context)` calls each enabled system once, in registration order
+      (dependencies first).
+    - In `mode="concurrent"` independent systems run on a thread pool; a system
+      that exceeds its timeout yields a stale marker (see `stale_result`) instead
+      of stalling the beat, and its late result is kept as `last_result`.
+    - Systems that declare `depends_on` receive their upstream results in
+      `context["upstream"]`.
+    - Systems can tick at their own rate (`every_beats` / `every_seconds`), with
+      an optional jittered phase and adaptive slowdown under a latency budget;
+      skipped systems are absent from the heartbeat result.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        mode: str = SEQUENTIAL,
+        max_workers: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if mode not in SCHEDULER_MODES:
+            raise ValueError(f"mode must be one of {SCHEDULER_MODES}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.clock = clock
+        self.beat_count: int = 0
+        self.last_heartbeat_latency: Optional[float] = None
+        self.last_schedule: Optional[BeatSchedule] = None
+        self._rng = random.Random(seed)
+        self.profiler: Optional[SystemProfiler] = None
         self._systems: Dict[str, RegisteredSystem] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # systems whose step from an earlier beat is still running
+        self._inflight: Dict[str, Future] = {}
+        self._abandoned: Set[Future] = set()
+        self._lock = threading.Lock()
 
     # -------- registration & configuration --------
-    def register_system(self, name: str, step_fn: StepFn, enabled: bool = True) -> None:
-        self._systems[name] = RegisteredSystem(name=name, step_fn=step_fn, enabled=enabled)
+    def register_system(
+        self,
+        name: str,
+        step_fn: StepFn,
+        enabled: bool = True,
+        depends_on: Sequence[str] = (),
+        timeout: Optional[float] = None,
+        every_beats: int = 1,
+        every_seconds: Optional[float] = None,
+        jitter: bool = False,
+        latency_budget: Optional[float] = None,
+        max_slowdown: int = 16,
+    ) -> None:
+        """Register a system.
+
+        - every_beats / every_seconds: tick rate (every N beats, or at most once
+          per T seconds).
+        - jitter: start at a random phase within the first interval so systems
+          with the same rate don't all land on the same beat.
+        - latency_budget: adaptive mode; while the smoothed step latency exceeds
+          the budget the interval doubles (up to max_slowdown), and it shrinks
+          back once latency drops below half the budget.
+        """
+        if name in depends_on:
+            raise ValueError(f"System {name!r} cannot depend on itself")
+        if every_beats < 1:
+            raise ValueError("every_beats must be >= 1")
+        if every_seconds is not None and every_seconds <= 0:
+            raise ValueError("every_seconds must be > 0")
+        if max_slowdown < 1:
+            raise ValueError("max_slowdown must be >= 1")
+        system = RegisteredSystem(
+            name=name,
+            step_fn=step_fn,
+            enabled=enabled,
+            depends_on=tuple(depends_on),
+            timeout=timeout,
+            every_beats=every_beats,
+            every_seconds=every_seconds,
+            latency_budget=latency_budget,
+            max_slowdown=max_slowdown,
+        )
+        system.next_beat = self.beat_count
+        if jitter:
+            if every_seconds is not None:
+                system.next_time = self.clock() + self._rng.random() * every_seconds
+            else:
+                system.next_beat += self._rng.randrange(every_beats)
+        self._systems[name] = system
 
     def enable_system(self, name: str) -> None:
         system = self._systems.get(name)
@@ -40,6 +224,129 @@ class CoreOrchestrator:
     def list_systems(self) -> List[str]:
         return list(self._systems.keys())
 
+    def get_system(self, name: str) -> Optional[RegisteredSystem]:
+        return self._systems.get(name)
+
+    def system_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-system latency (seconds) and stale counters."""
+        stats: Dict[str, Dict[str, Any]] = {}
+        for name, system in self._systems.items():
+            stats[name] = {
+                "runs": system.runs,
+                "stale": system.stale_count,
+                "last_latency": system.last_latency,
+                "mean_latency": system.total_latency / system.runs if system.runs else None,
+                "max_latency": system.max_latency,
+            }
+        return stats
+
+    def schedule(self) -> Dict[str, Dict[str, Any]]:
+        """Current tick schedule of every system."""
+        now = self.clock()
+        out: Dict[str, Dict[str, Any]] = {}
+        for name, system in self._systems.items():
+            out[name] = {
+                "enabled": system.enabled,
+                "every_beats": system.every_beats,
+                "every_seconds": system.every_seconds,
+                "slowdown": system.slowdown,
+                "next_beat": None if system.every_seconds is not None else max(system.next_beat, self.beat_count),
+                "next_in_seconds": (
+                    None
+                    if system.every_seconds is None
+                    else max(0.0, (system.next_time or now) - now)
+                ),
+                "ema_latency": system.ema_latency,
+            }
+        return out
+
+    # -------- profiling --------
+    def enable_profiling(self, capacity: int = 4096, track_allocations: bool = True) -> SystemProfiler:
+        """Start recording per-system wall/CPU/allocation samples (can be toggled at runtime).
+
+        Re-enabling keeps the existing profiler and its samples.
+        """
+        if self.profiler is None:
+            self.profiler = SystemProfiler(capacity=capacity, track_allocations=track_allocations)
+        self.profiler.enable(track_allocations)
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def _call_step(self, system: RegisteredSystem, ctx: Dict[str, Any], beat: int) -> Any:
+        profiler = self.profiler
+        if profiler is None or not profiler.enabled:
+            return system.step_fn(ctx)
+        with profiler.measure(system.name, beat):
+            return system.step_fn(ctx)
+
+    def close(self) -> None:
+        """Shut down the worker pool (concurrent mode). Safe to call repeatedly."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # -------- scheduling helpers --------
+    def _execution_order(self, active: Dict[str, RegisteredSystem]) -> List[str]:
+        """Stable topological order: registration order, dependencies first.
+
+        Dependencies on disabled systems are ignored; unknown names and cycles
+        raise ValueError.
+        """
+        for system in active.values():
+            for dep in system.depends_on:
+                if dep not in self._systems:
+                    raise ValueError(f"System {system.name!r} depends on unknown system {dep!r}")
+
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            mark = state.get(name)
+            if mark == 2:
+                return
+            if mark == 1:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + (name,))}")
+            state[name] = 1
+            for dep in active[name].depends_on:
+                if dep in active:
+                    visit(dep, path + (name,))
+            state[name] = 2
+            order.append(name)
+
+        for name in active:
+            visit(name, ())
+        return order
+
+    def _context_for(
+        self,
+        system: RegisteredSystem,
+        base_context: Dict[str, Any],
+        results: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        # 使用浅拷贝，保证各系统看到相同的输入
+        ctx = dict(base_context)
+        if system.depends_on:
+            upstream: Dict[str, Any] = {}
+            for dep in system.depends_on:
+                if dep in results:
+                    upstream[dep] = results[dep]
+                else:
+                    # 本拍没轮到的上游系统：给出它最近一次的结果
+                    last = self._systems[dep].last_result
+                    if last is not None:
+                        upstream[dep] = last
+            ctx[UPSTREAM_KEY] = upstream
+        return ctx
+
+    @staticmethod
+    def _check_result(name: str, result: Any) -> Dict[str, Any]:
+        if not isinstance(result, dict):
+            raise TypeError(f"System {name!r} returned non-dict result: {type(result)!r}")
+        return result
+
     # -------- execution --------
     def heartbeat(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
         """Run one heartbeat across all enabled systems.
@@ -48,15 +355,179 @@ class CoreOrchestrator:
         """
         if context is None:
             context = {}
-        # 使用浅拷贝，保证各系统看到相同的输入
         base_context = dict(context)
+        enabled = {name: s for name, s in self._systems.items() if s.enabled}
+        order = self._execution_order(enabled)
+
+        beat = self.beat_count
+        now = self.clock()
+        due_order = [name for name in order if enabled[name].is_due(beat, now)]
+        due = {name: enabled[name] for name in due_order}
+        for system in due.values():
+            system.advance(beat, now)
+
+        start = time.perf_counter()
+        try:
+            if self.mode == CONCURRENT:
+                results = self._run_concurrent(due_order, due, base_context)
+            else:
+                results = self._run_sequential(due_order, due, base_context)
+        finally:
+            # 即使某个 step 抛异常，这一拍也算用掉了（系统的 next_beat 已经前移）
+            self.last_heartbeat_latency = time.perf_counter() - start
+            self.beat_count += 1
+            self.last_schedule = BeatSchedule(
+                beat=beat,
+                ran=due_order,
+                skipped=[name for name in order if name not in due],
+                slowdowns={name: s.slowdown for name, s in enabled.items() if s.slowdown != 1},
+            )
+        return results
 
+    def _run_sequential(
+        self,
+        order: List[str],
+        active: Dict[str, RegisteredSystem],
+        base_context: Dict[str, Any],
+    ) -> Dict[str, Dict[str, Any]]:
         results: Dict[str, Dict[str, Any]] = {}
-        for name, system in self._systems.items():
-            if not system.enabled:
-                continue
-            result = system.step_fn(dict(base_context))
-            if not isinstance(result, dict):
-                raise TypeError(f"System {name!r} returned non-dict result: {type(result)!r}")
+        for name in order:
+            system = active[name]
+            t0 = time.perf_counter()
+            ctx = self._context_for(system, base_context, results)
+            result = self._check_result(name, self._call_step(system, ctx, self.beat_count))
+            system.record(time.perf_counter() - t0)
+            system.last_result = result
             results[name] = result
         return results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="orchestrator")
+        return self._executor
+
+    def _submit(self, system: RegisteredSystem, ctx: Dict[str, Any]) -> Future:
+        beat = self.beat_count
+
+        def run() -> Tuple[Dict[str, Any], float]:
+            t0 = time.perf_counter()
+            result = self._call_step(system, ctx, beat)
+            return self._check_result(system.name, result), time.perf_counter() - t0
+
+        def on_done(fut: Future) -> None:
+            # 只处理已经被判为超时的 step：晚到的结果留作下次 stale 标记里的 last_result
+            with self._lock:
+                if fut not in self._abandoned:
+                    return
+                self._abandoned.discard(fut)
+                self._release(system.name, fut)
+            if fut.cancelled():
+                return
+            err = fut.exception()
+            if err is not None:
+                system.last_error = err
+                return
+            result, latency = fut.result()
+            system.record(latency)
+            system.last_result = result
+
+        fut = self._get_executor().submit(run)
+        with self._lock:
+            self._inflight[system.name] = fut
+        fut.add_done_callback(on_done)
+        return fut
+
+    def _release(self, name: str, fut: Future) -> None:
+        if self._inflight.get(name) is fut:
+            del self._inflight[name]
+
+    def _collect(self, system: RegisteredSystem, fut: Future) -> Dict[str, Any]:
+        with self._lock:
+            self._release(system.name, fut)
+        result, latency = fut.result()  # 异常直接抛给调用方
+        system.record(latency)
+        system.last_result = result
+        return result
+
+    def _abandon(self, fut: Future) -> bool:
+        """Mark a running step as timed out. Returns False if it already finished."""
+        with self._lock:
+            if fut.done():
+                return False
+            self._abandoned.add(fut)
+            return True
+
+    def _run_concurrent(
+        self,
+        order: List[str],
+        active: Dict[str, RegisteredSystem],
+        base_context: Dict[str, Any],
+    ) -> Dict[str, Dict[str, Any]]:
+        results: Dict[str, Dict[str, Any]] = {}
+        waiting_on: Dict[str, Set[str]] = {
+            name: {dep for dep in active[name].depends_on if dep in active} for name in order
+        }
+        dependents: Dict[str, List[str]] = {name: [] for name in order}
+        for name in order:
+            for dep in waiting_on[name]:
+                dependents[dep].append(name)
+
+        running: Dict[Future, Tuple[str, Optional[float]]] = {}
+        ready = [name for name in order if not waiting_on[name]]
+
+        def finish(name: str, result: Dict[str, Any]) -> None:
+            results[name] = result
+            for child in dependents[name]:
+                waiting_on[child].discard(name)
+                if not waiting_on[child]:
+                    ready.append(child)
+
+        def mark_stale(name: str) -> None:
+            system = active[name]
+            system.stale_count += 1
+            finish(name, stale_result(system.last_result))
+
+        try:
+            while ready or running:
+                while ready:
+                    name = ready.pop(0)
+                    system = active[name]
+                    with self._lock:
+                        still_running = name in self._inflight
+                    if still_running:
+                        # 上一拍的 step 还没跑完：不重复提交，直接给出 stale 标记
+                        mark_stale(name)
+                        continue
+                    timeout = system.timeout if system.timeout is not None else self.default_timeout
+                    deadline = None if timeout is None else time.perf_counter() + timeout
+                    fut = self._submit(system, self._context_for(system, base_context, results))
+                    running[fut] = (name, deadline)
+
+                if not running:
+                    break
+                deadlines = [d for _, d in running.values() if d is not None]
+                wait_for = None if not deadlines else max(0.0, min(deadlines) - time.perf_counter())
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for fut in done:
+                    name, _ = running.pop(fut)
+                    finish(name, self._collect(active[name], fut))
+
+                now = time.perf_counter()
+                for fut, (name, deadline) in list(running.items()):
+                    if deadline is None or now < deadline:
+                        continue
+                    del running[fut]
+                    if self._abandon(fut):
+                        mark_stale(name)
+                    else:
+                        finish(name, self._collect(active[name], fut))
+        finally:
+            # 某个 step 抛异常时循环提前退出：剩下还在跑的交给 on_done 收尾，
+            # 已经跑完但没被收集的直接释放，否则它们会一直留在 _inflight 里被当成 stale
+            for fut, (name, _) in running.items():
+                if not self._abandon(fut):
+                    with self._lock:
+                        self._release(name, fut)
+
+        return {name: results[name] for name in order if name in results}
@@ -0,0 +1,156 @@
+"""
+固定节拍（目标 Hz）的心跳运行器。
+
+- 绝对时间表：第 k 拍的计划时间 = start + k * period，睡眠时间按计划时间计算，
+  不会因为每拍的小误差而漂移
+- 超时（overrun）：一拍的耗时超过 period
+- 落后时的策略：
+  - skip:     丢弃已经错过的节拍，直接对齐到下一个未来的节拍
+  - catch_up: 不睡眠、连续补跑错过的节拍，最多落后 max_catch_up 拍，更多的丢弃
+- 每拍耗时写入 PerformanceMetrics，可直接取 p50 / p95 / p99
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from us_core.utils.monitoring import latency_percentiles_ms
+
+from .monitoring import PerformanceMetrics
+
+OVERRUN_SKIP = "skip"
+OVERRUN_CATCH_UP = "catch_up"
+OVERRUN_POLICIES = (OVERRUN_SKIP, OVERRUN_CATCH_UP)
+
+
+@dataclass
+class RunReport:
+    """一次 run() 的汇总。"""
+
+    beats: int
+    overruns: int
+    skipped: int
+    duration: float
+    target_hz: float
+    percentiles_ms: Dict[str, float]
+    max_lateness: float  # 秒：实际开始时间相对计划时间的最大延迟
+
+    @property
+    def achieved_hz(self) -> float:
+        return self.beats / self.duration if self.duration > 0 else 0.0
+
+
+@dataclass
+class FixedRateRunner:
+    """按固定频率调用 beat_fn。
+
+    spin_threshold：距离计划时间小于该值（秒）时改为忙等，换取更准的起跳时间；
+    设为 0 则完全依赖 sleep。
+    sleep 默认在内部的停止事件上等待，stop() 会立即打断；注入自定义 sleep（例如测试时钟）
+    时，只在每次 sleep 前后检查停止请求。
+    """
+
+    beat_fn: Callable[[], Any]
+    hz: float
+    policy: str = OVERRUN_SKIP
+    max_catch_up: int = 5
+    metrics: Optional[PerformanceMetrics] = None
+    spin_threshold: float = 0.0005
+    clock: Callable[[], float] = field(default=time.perf_counter, repr=False)
+    sleep: Optional[Callable[[float], None]] = field(default=None, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.hz <= 0:
+            raise ValueError("hz must be > 0")
+        if self.policy not in OVERRUN_POLICIES:
+            raise ValueError(f"policy 必须是 {OVERRUN_POLICIES} 之一")
+        if self.max_catch_up < 0:
+            raise ValueError("max_catch_up must be >= 0")
+        if self.metrics is None:
+            self.metrics = PerformanceMetrics()
+
+    @property
+    def period(self) -> float:
+        return 1.0 / self.hz
+
+    def stop(self) -> None:
+        """请求停止（可从其他线程调用），当前这一拍跑完后退出。"""
+        self._stop.set()
+
+    def _wait_until(self, target: float) -> None:
+        while not self._stop.is_set():
+            remaining = target - self.clock()
+            if remaining <= 0:
+                return
+            if remaining > self.spin_threshold:
+                if self.sleep is None:
+                    self._stop.wait(remaining - self.spin_threshold)
+                else:
+                    self.sleep(remaining - self.spin_threshold)
+            # 否则忙等到计划时间
+
+    def run(self, beats: Optional[int] = None, duration: Optional[float] = None) -> RunReport:
+        """运行直到跑满 beats 拍、超过 duration 秒或 stop() 被调用。"""
+        if beats is None and duration is None:
+            raise ValueError("run() needs beats or duration (or call stop() from another thread)")
+        self._stop.clear()
+        metrics = self.metrics
+        assert metrics is not None
+        period = self.period
+        latencies: List[float] = []
+        overruns = skipped = 0
+        max_lateness = 0.0
+
+        start = self.clock()
+        end = None if duration is None else start + duration
+        slot = 0  # 下一拍对应的计划槽位
+        done = 0
+        while not self._stop.is_set():
+            if beats is not None and done >= beats:
+                break
+            scheduled = start + slot * period
+            if end is not None and scheduled >= end:
+                break
+            self._wait_until(scheduled)
+            if self._stop.is_set():
+                break
+
+            t0 = self.clock()
+            self.beat_fn()
+            t1 = self.clock()
+            latency = t1 - t0
+            overrun = latency > period
+            max_lateness = max(max_lateness, t0 - scheduled)
+            done += 1
+            slot += 1
+
+            # 这一拍结束时，后面已经有多少个计划槽位过期
+            next_at = start + slot * period
+            behind = int((t1 - next_at) // period) + 1 if t1 > next_at else 0
+            dropped = 0
+            if behind > 0:
+                if self.policy == OVERRUN_SKIP:
+                    dropped = behind
+                else:
+                    dropped = max(0, behind - self.max_catch_up)
+                slot += dropped
+
+            overruns += int(overrun)
+            skipped += dropped
+            latencies.append(latency)
+            metrics.record_beat_latency(latency, overrun=overrun, skipped=dropped)
+
+        elapsed = self.clock() - start
+        return RunReport(
+            beats=done,
+            overruns=overruns,
+            skipped=skipped,
+            duration=elapsed,
+            target_hz=self.hz,
+            percentiles_ms=latency_percentiles_ms(latencies),
+            max_lateness=max_lateness,
+        )
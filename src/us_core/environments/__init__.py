@@ -1,3 +1,4 @@
 from __future__ import annotations
 
-# 环境实现集合，目前包含 SimpleGridWorld。
+# 环境实现集合，目前包含 SimpleGridWorld 及其向量化版本 VecGridWorld，
+# 以及网格世界的最短路 oracle（grid_oracle）。
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from us_core.environments.grid_world import DOOR, WALL
+from us_core.systems.environment.interface import GridAction
+
+
+CellPos = Tuple[int, int]
+
+#: 到不了终点的状态的距离
+UNREACHABLE = -1
+
+_MOVES: Tuple[Tuple[GridAction, int, int], ...] = (
+    (GridAction.UP, -1, 0),
+    (GridAction.DOWN, 1, 0),
+    (GridAction.LEFT, 0, -1),
+    (GridAction.RIGHT, 0, 1),
+)
+
+
+@dataclass(frozen=True)
+class GridLayout:
+    """一张地图的不变部分（墙壁 + 起点 / 钥匙 / 门 / 终点），可哈希，用作 oracle 缓存键。"""
+
+    height: int
+    width: int
+    walls: bytes  # (height, width) 的 bool 数组打包
+    start: CellPos
+    key: CellPos
+    door: CellPos
+    goal: CellPos
+
+    @classmethod
+    def from_env(cls, env: Any) -> "GridLayout":
+        """从 SimpleGridWorld（需已 reset）或 VecGridWorld 提取布局。"""
+        grid = getattr(env, "_template", None)
+        if grid is None:
+            grid = env.grid
+        walls = np.asarray(grid) == WALL
+        return cls(
+            height=int(walls.shape[0]),
+            width=int(walls.shape[1]),
+            walls=np.packbits(walls).tobytes(),
+            start=tuple(env._start_pos),
+            key=tuple(env._key_pos),
+            door=tuple(env._door_pos),
+            goal=tuple(env._goal_pos),
+        )
+
+    def wall_mask(self) -> np.ndarray:
+        bits = np.unpackbits(np.frombuffer(self.walls, dtype=np.uint8), count=self.height * self.width)
+        return bits.reshape(self.height, self.width).astype(bool)
+
+
+class GridOracle:
+    """(位置, 是否有钥匙, 门是否已开) 状态空间上的最短路 oracle。
+
+    从所有终点状态出发做一次反向 BFS（每步代价相同），得到每个抽象状态到终点的
+    最少步数，以及一个最优动作表。转移规则与 SimpleGridWorld.step 一致：
+    撞墙 / 没钥匙撞门原地不动，走到钥匙格自动拾取，带钥匙走进门格时开门。
+    """
+
+    def __init__(self, layout: GridLayout) -> None:
+        self.layout = layout
+        shape = (layout.height, layout.width, 2, 2)
+        self.distances = np.full(shape, UNREACHABLE, dtype=np.int32)
+        self.best_actions = np.full(shape, -1, dtype=np.int8)
+        self._build()
+
+    def _successor(
+        self, walls: np.ndarray, y: int, x: int, k: int, d: int, dy: int, dx: int
+    ) -> Optional[Tuple[int, int, int, int]]:
+        layout = self.layout
+        ny, nx = y + dy, x + dx
+        if walls[ny, nx]:
+            return None
+        if (ny, nx) == layout.door and not d:
+            if not k:
+                return None
+            d = 1
+        if (ny, nx) == layout.key:
+            k = 1
+        return ny, nx, k, d
+
+    def _build(self) -> None:
+        layout = self.layout
+        walls = layout.wall_mask()
+
+        # 正向转移表 + 反向邻接
+        forward: Dict[Tuple[int, int, int, int], List[Tuple[int, Tuple[int, int, int, int]]]] = {}
+        reverse: Dict[Tuple[int, int, int, int], List[Tuple[int, int, int, int]]] = {}
+        goal_states: List[Tuple[int, int, int, int]] = []
+        for y in range(layout.height):
+            for x in range(layout.width):
+                if walls[y, x]:
+                    continue
+                for k in (0, 1):
+                    for d in (0, 1):
+                        if d and not k:
+                            continue  # 门只能用钥匙打开
+                        state = (y, x, k, d)
+                        if (y, x) == layout.goal:
+                            goal_states.append(state)
+                            continue  # 终点是吸收态
+                        edges = []
+                        for action, dy, dx in _MOVES:
+                            nxt = self._successor(walls, y, x, k, d, dy, dx)
+                            if nxt is not None and nxt != state:
+                                edges.append((int(action), nxt))
+                                reverse.setdefault(nxt, []).append(state)
+                        forward[state] = edges
+
+        dist = self.distances
+        queue = deque(goal_states)
+        for state in goal_states:
+            dist[state] = 0
+        while queue:
+            state = queue.popleft()
+            for prev in reverse.get(state, ()):
+                if dist[prev] == UNREACHABLE:
+                    dist[prev] = dist[state] + 1
+                    queue.append(prev)
+
+        for state, edges in forward.items():
+            here = dist[state]
+            if here <= 0:
+                continue
+            for action, nxt in edges:
+                if dist[nxt] == here - 1:
+                    self.best_actions[state] = action
+                    break
+
+    # ---------- 查询 ----------
+
+    def distance(self, pos: CellPos, has_key: bool, door_open: bool) -> int:
+        """到终点的最少步数；到不了返回 UNREACHABLE。"""
+        return int(self.distances[pos[0], pos[1], int(has_key), int(door_open)])
+
+    def distances_for(self, ys: np.ndarray, xs: np.ndarray, has_key: np.ndarray, door_open: np.ndarray) -> np.ndarray:
+        """向量化查询（例如 VecGridWorld 的 agent_y / agent_x / has_key）。"""
+        return self.distances[ys, xs, np.asarray(has_key, dtype=np.int64), np.asarray(door_open, dtype=np.int64)]
+
+    def optimal_action(self, pos: CellPos, has_key: bool, door_open: bool) -> Optional[int]:
+        action = int(self.best_actions[pos[0], pos[1], int(has_key), int(door_open)])
+        return None if action < 0 else action
+
+    @property
+    def optimal_episode_length(self) -> int:
+        """从起点出发的最优回合长度。"""
+        return self.distance(self.layout.start, False, False)
+
+    def env_state(self, env: Any) -> Tuple[CellPos, bool, bool]:
+        """从 SimpleGridWorld 当前状态取出 (位置, 是否有钥匙, 门是否已开)。"""
+        door = self.layout.door
+        return tuple(env.agent_pos), bool(env._has_key), bool(env.grid[door] != DOOR)
+
+    def env_distance(self, env: Any) -> int:
+        return self.distance(*self.env_state(env))
+
+    def vec_env_distances(self, venv: Any) -> np.ndarray:
+        """VecGridWorld 所有环境当前状态的最优剩余步数 (N,)。"""
+        dy, dx = self.layout.door
+        door_open = venv.grids[:, dy, dx] != DOOR
+        return self.distances_for(venv.agent_y, venv.agent_x, venv.has_key, door_open)
+
+
+def shaping_reward(prev_distance: int, next_distance: int, gamma: float = 0.99) -> float:
+    """基于势函数 phi(s) = -distance 的奖励塑形项 F = gamma * phi(s') - phi(s)。
+
+    不改变最优策略（Ng et al. 1999）；到不了终点的状态不做塑形。
+    """
+    if prev_distance == UNREACHABLE or next_distance == UNREACHABLE:
+        return 0.0
+    return float(prev_distance - gamma * next_distance)
+
+
+_ORACLE_CACHE: Dict[GridLayout, GridOracle] = {}
+
+
+def get_grid_oracle(env_or_layout: Any) -> GridOracle:
+    """按布局取 oracle：每种布局只计算一次。"""
+    layout = env_or_layout if isinstance(env_or_layout, GridLayout) else GridLayout.from_env(env_or_layout)
+    oracle = _ORACLE_CACHE.get(layout)
+    if oracle is None:
+        oracle = GridOracle(layout)
+        _ORACLE_CACHE[layout] = oracle
+    return oracle
@@ -35,6 +35,12 @@ KEY = 2
 DOOR = 3
 GOAL = 4
 
+# 奖励设定（VecGridWorld 共用同一组常量）
+STEP_PENALTY = -0.01  # 每步轻微惩罚，鼓励尽快到达目标
+BLOCKED_PENALTY = -0.1  # 撞墙 / 没钥匙撞门
+KEY_REWARD = 0.2
+GOAL_REWARD = 1.0
+
 
 @dataclass
 class SimpleGridWorld(Environment):
@@ -52,6 +58,11 @@ class SimpleGridWorld(Environment):
     _door_pos: CellPos = field(init=False)
     _has_key: bool = field(default=False, init=False)
 
+    # 增量状态编码：缓存上一次的 100 维向量，只修补变化过的格子
+    _state_cache: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _encoded_agent_pos: Optional[CellPos] = field(default=None, init=False, repr=False)
+    _dirty_cells: list = field(default_factory=list, init=False, repr=False)
+
     # pygame 相关
     _screen: Any = field(default=None, init=False)
     _clock: Any = field(default=None, init=False)
@@ -85,6 +96,7 @@ class SimpleGridWorld(Environment):
         self.grid[self._goal_pos] = GOAL
 
         self._has_key = False
+        self._state_cache = None
         return self._encode_state()
 
     def _init_grid(self) -> None:
@@ -107,7 +119,7 @@ class SimpleGridWorld(Environment):
         if isinstance(action, int):
             action = GridAction(action)
 
-        reward = -0.01  # 每步轻微惩罚，鼓励尽快到达目标
+        reward = STEP_PENALTY
         done = False
         info: Dict[str, Any] = {}
 
@@ -117,7 +129,7 @@ class SimpleGridWorld(Environment):
 
         # 撞墙
         if self.grid[new_y, new_x] == WALL:
-            reward -= 0.1
+            reward += BLOCKED_PENALTY
             info["collision"] = True
             # 不移动
             return self._encode_state(), reward, done, info
@@ -126,7 +138,7 @@ class SimpleGridWorld(Environment):
         if (new_y, new_x) == self._door_pos:
             if not self._has_key:
                 # 没有钥匙，门挡住
-                reward -= 0.1
+                reward += BLOCKED_PENALTY
                 info["door_blocked"] = True
                 return self._encode_state(), reward, done, info
             else:
@@ -134,6 +146,7 @@ class SimpleGridWorld(Environment):
                 info["door_opened"] = True
                 # 门变成空地
                 self.grid[self._door_pos] = EMPTY
+                self._dirty_cells.append(self._door_pos)
 
         # 移动成功
         self.agent_pos = (new_y, new_x)
@@ -142,12 +155,13 @@ class SimpleGridWorld(Environment):
         if (new_y, new_x) == self._key_pos and not self._has_key:
             self._has_key = True
             self.grid[self._key_pos] = EMPTY
-            reward += 0.2
+            self._dirty_cells.append(self._key_pos)
+            reward += KEY_REWARD
             info["picked_key"] = True
 
         # 到达终点
         if (new_y, new_x) == self._goal_pos:
-            reward += 1.0
+            reward += GOAL_REWARD
             done = True
             info["reached_goal"] = True
 
@@ -167,19 +181,29 @@ class SimpleGridWorld(Environment):
         return y, x
 
     def _encode_state(self) -> np.ndarray:
-        """将当前网格 + 角色状态编码为 100 维向量。"""
-        g = self.grid.copy()
+        """将当前网格 + 角色状态编码为 100 维向量（取值 0~6）。
 
-        ay, ax = self.agent_pos
-        if self._has_key:
-            g[ay, ax] = 6  # 角色 + 钥匙
+        第一次（以及每次 reset 后）完整编码；之后只修补标记为脏的格子和角色前后两格，
+        返回缓存的副本。外部直接修改 agent_pos 也能被正确处理。
+        """
+        cache = self._state_cache
+        width = self.width
+        if cache is None:
+            cache = self.grid.astype(np.float32).reshape(-1)
+            assert cache.shape == (STATE_SIZE,)
+            self._state_cache = cache
         else:
-            g[ay, ax] = 5  # 角色
+            for y, x in self._dirty_cells:
+                cache[y * width + x] = self.grid[y, x]
+            old = self._encoded_agent_pos
+            if old is not None and old != self.agent_pos:
+                cache[old[0] * width + old[1]] = self.grid[old]
+        self._dirty_cells.clear()
 
-        flat = g.astype(np.float32).reshape(-1)
-        assert flat.shape == (STATE_SIZE,)
-        # 测试中只要求 0~6 之间
-        return flat
+        ay, ax = self.agent_pos
+        cache[ay * width + ax] = 6 if self._has_key else 5  # 角色（+ 钥匙）
+        self._encoded_agent_pos = self.agent_pos
+        return cache.copy()
 
     # =====================
     # 渲染接口
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from us_core.environments.grid_world import SimpleGridWorld
+from us_core.systems.environment.interface import NUM_ACTIONS, STATE_SIZE, Environment
+
+
+# 与 VecGridWorld 的 info 掩码保持一致
+INFO_KEYS: Tuple[str, ...] = (
+    "collision",
+    "door_blocked",
+    "door_opened",
+    "picked_key",
+    "reached_goal",
+    "truncated",
+)
+
+_TRUNCATED = INFO_KEYS.index("truncated")
+
+
+def _attach_arrays(names: Dict[str, str], num_envs: int) -> Tuple[List[shared_memory.SharedMemory], Dict[str, np.ndarray]]:
+    """按名字挂载共享内存，并包装成 numpy 视图。"""
+    specs = _buffer_specs(num_envs)
+    handles: List[shared_memory.SharedMemory] = []
+    arrays: Dict[str, np.ndarray] = {}
+    for key, (shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=names[key])
+        handles.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return handles, arrays
+
+
+def _buffer_specs(num_envs: int) -> Dict[str, Tuple[Tuple[int, ...], Any]]:
+    return {
+        "states": ((num_envs, STATE_SIZE), np.float32),
+        "terminal_states": ((num_envs, STATE_SIZE), np.float32),
+        "rewards": ((num_envs,), np.float32),
+        "dones": ((num_envs,), np.bool_),
+        "flags": ((num_envs, len(INFO_KEYS)), np.bool_),
+    }
+
+
+def _worker(
+    conn: Any,
+    names: Dict[str, str],
+    num_envs: int,
+    start: int,
+    end: int,
+    env_fn: Callable[[], Environment],
+    max_episode_steps: Optional[int],
+) -> None:
+    """子进程主循环：持有 [start, end) 这几个环境，结果直接写进共享内存。"""
+    handles, arrays = _attach_arrays(names, num_envs)
+    states = arrays["states"]
+    terminal_states = arrays["terminal_states"]
+    rewards = arrays["rewards"]
+    dones = arrays["dones"]
+    flags = arrays["flags"]
+
+    envs = [env_fn() for _ in range(end - start)]
+    episode_steps = [0] * len(envs)
+
+    try:
+        while True:
+            cmd, data = conn.recv()
+
+            if cmd == "step":
+                for offset, (env, action) in enumerate(zip(envs, data)):
+                    i = start + offset
+                    state, reward, done, info = env.step(int(action))
+                    episode_steps[offset] += 1
+
+                    row = flags[i]
+                    for k, key in enumerate(INFO_KEYS):
+                        row[k] = bool(info.get(key, False))
+                    if not done and max_episode_steps is not None and episode_steps[offset] >= max_episode_steps:
+                        row[_TRUNCATED] = True
+                        done = True
+
+                    rewards[i] = reward
+                    dones[i] = done
+                    if done:
+                        terminal_states[i] = state
+                        state = env.reset()
+                        episode_steps[offset] = 0
+                    states[i] = state
+                conn.send(None)
+
+            elif cmd == "reset":
+                for offset, env in enumerate(envs):
+                    states[start + offset] = env.reset()
+                    episode_steps[offset] = 0
+                rewards[start:end] = 0.0
+                dones[start:end] = False
+                flags[start:end] = False
+                conn.send(None)
+
+            elif cmd == "close":
+                break
+    except (EOFError, KeyboardInterrupt):  # pragma: no cover - 父进程异常退出
+        pass
+    finally:
+        for env in envs:
+            close = getattr(env, "close", None)
+            if close is not None:
+                close()
+        del states, terminal_states, rewards, dones, flags, arrays
+        for shm in handles:
+            shm.close()
+        conn.close()
+
+
+class SubprocVecEnv:
+    """多进程向量化环境：每个 worker 进程持有若干个环境实例。
+
+    - 观测 / 奖励 / done / 事件掩码写在共享内存里，不经过 pickle；
+    - 动作通过 Pipe 分发给各 worker；
+    - reset / step 的返回格式与 VecGridWorld 一致，可以直接替换。
+
+    用完需要调用 close()（或使用 with 语句），以回收子进程和共享内存。
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        *,
+        num_workers: Optional[int] = None,
+        env_fn: Callable[[], Environment] = SimpleGridWorld,
+        max_episode_steps: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ) -> None:
+        if num_envs <= 0:
+            raise ValueError("num_envs must be positive")
+        if num_workers is None:
+            num_workers = min(num_envs, mp.cpu_count() or 1)
+        if num_workers <= 0:
+            raise ValueError("num_workers must be positive")
+        num_workers = min(num_workers, num_envs)
+
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self._closed = False
+        self._waiting = False
+
+        self._shms: List[shared_memory.SharedMemory] = []
+        self._arrays: Dict[str, np.ndarray] = {}
+        names: Dict[str, str] = {}
+        for key, (shape, dtype) in _buffer_specs(num_envs).items():
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+            self._shms.append(shm)
+            self._arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            self._arrays[key].fill(0)
+            names[key] = shm.name
+
+        # 尽量均匀地把环境切分给各 worker
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self._slices: List[Tuple[int, int]] = [
+            (int(bounds[w]), int(bounds[w + 1])) for w in range(num_workers)
+        ]
+
+        ctx = mp.get_context(start_method)
+        self._conns = []
+        self._procs = []
+        for start, end in self._slices:
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(
+                target=_worker,
+                args=(child_conn, names, num_envs, start, end, env_fn, max_episode_steps),
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+
+    @property
+    def state_size(self) -> int:
+        return STATE_SIZE
+
+    @property
+    def action_size(self) -> int:
+        return NUM_ACTIONS
+
+    def reset(self) -> np.ndarray:
+        """重置全部环境，返回 (N, 100) 状态。"""
+        self._check_open()
+        for conn in self._conns:
+            conn.send(("reset", None))
+        for conn in self._conns:
+            conn.recv()
+        return self._arrays["states"].copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """把动作发给各 worker 后立即返回；配合 step_wait 可以和策略计算重叠。"""
+        self._check_open()
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"actions must have shape ({self.num_envs},)")
+        for conn, (start, end) in zip(self._conns, self._slices):
+            conn.send(("step", actions[start:end]))
+        self._waiting = True
+
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """等待所有 worker 完成本次 step，返回 (states, rewards, dones, info)。"""
+        if not self._waiting:
+            raise RuntimeError("step_wait called without step_async")
+        for conn in self._conns:
+            conn.recv()
+        self._waiting = False
+
+        arrays = self._arrays
+        dones = arrays["dones"].copy()
+        flags = arrays["flags"]
+        info: Dict[str, Any] = {key: flags[:, k].copy() for k, key in enumerate(INFO_KEYS)}
+        if dones.any():
+            info["terminal_states"] = arrays["terminal_states"][dones]
+
+        return arrays["states"].copy(), arrays["rewards"].copy(), dones, info
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """所有环境同时执行一步，返回格式同 VecGridWorld.step。"""
+        self.step_async(actions)
+        return self.step_wait()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("SubprocVecEnv is closed")
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._waiting:
+            for conn in self._conns:
+                try:
+                    conn.recv()
+                except (EOFError, OSError):
+                    pass
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():  # pragma: no cover - worker 卡死时兜底
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+
+        self._arrays.clear()
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms.clear()
+
+    def __enter__(self) -> "SubprocVecEnv":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:  # pragma: no cover - 兜底回收
+        try:
+            self.close()
+        except Exception:
+            pass
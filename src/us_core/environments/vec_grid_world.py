@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from us_core.environments.grid_world import (
+    BLOCKED_PENALTY,
+    EMPTY,
+    GOAL_REWARD,
+    KEY_REWARD,
+    STEP_PENALTY,
+    WALL,
+    SimpleGridWorld,
+)
+from us_core.systems.environment.interface import NUM_ACTIONS, STATE_SIZE, GridAction
+
+
+# 动作 -> (dy, dx)；PICK_KEY / OPEN_DOOR 不移动
+_ACTION_DY = np.zeros(NUM_ACTIONS, dtype=np.int64)
+_ACTION_DX = np.zeros(NUM_ACTIONS, dtype=np.int64)
+_ACTION_DY[GridAction.UP] = -1
+_ACTION_DY[GridAction.DOWN] = 1
+_ACTION_DX[GridAction.LEFT] = -1
+_ACTION_DX[GridAction.RIGHT] = 1
+
+# 角色在状态编码里的取值：5 = 没有钥匙，6 = 拿着钥匙
+AGENT = 5
+AGENT_WITH_KEY = 6
+
+
+class VecGridWorld:
+    """N 个 SimpleGridWorld 的向量化版本。
+
+    所有环境的网格叠成一个 (N, H, W) 的 int8 数组，一次 step 用 NumPy 掩码
+    同时处理撞墙 / 门 / 钥匙 / 终点逻辑；done 的环境会自动重置。
+    奖励和规则与 SimpleGridWorld 保持一致。
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        width: int = 10,
+        height: int = 10,
+        max_episode_steps: Optional[int] = None,
+    ) -> None:
+        if num_envs <= 0:
+            raise ValueError("num_envs must be positive")
+        if width * height != STATE_SIZE:
+            raise ValueError(f"width * height must equal STATE_SIZE={STATE_SIZE}")
+
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.max_episode_steps = max_episode_steps
+
+        # 用单环境 reset 后的网格作为布局模板，保证两者布局完全一致
+        template = SimpleGridWorld(width=width, height=height)
+        template.reset()
+        self._template = template.grid.copy()
+        self._start_pos = template._start_pos
+        self._key_pos = template._key_pos
+        self._door_pos = template._door_pos
+        self._goal_pos = template._goal_pos
+
+        self.grids = np.empty((num_envs, height, width), dtype=np.int8)
+        self.agent_y = np.empty(num_envs, dtype=np.int64)
+        self.agent_x = np.empty(num_envs, dtype=np.int64)
+        self.has_key = np.zeros(num_envs, dtype=bool)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self._rows = np.arange(num_envs)
+
+    @property
+    def state_size(self) -> int:
+        return STATE_SIZE
+
+    @property
+    def action_size(self) -> int:
+        return NUM_ACTIONS
+
+    def reset(self) -> np.ndarray:
+        """重置全部环境，返回 (N, 100) 状态。"""
+        self._reset_mask(np.ones(self.num_envs, dtype=bool))
+        return self._encode_states()
+
+    def _reset_mask(self, mask: np.ndarray) -> None:
+        self.grids[mask] = self._template
+        self.agent_y[mask] = self._start_pos[0]
+        self.agent_x[mask] = self._start_pos[1]
+        self.has_key[mask] = False
+        self.episode_steps[mask] = 0
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """所有环境同时执行一步。
+
+        Args:
+            actions: 形状 (N,) 的整数动作。
+
+        Returns:
+            (states, rewards, dones, info)：
+            - states: (N, 100) float32，done 的环境已经是重置后的初始状态；
+            - rewards: (N,) float32；
+            - dones: (N,) bool；
+            - info: 各事件的 (N,) bool 掩码（collision / door_blocked / door_opened /
+              picked_key / reached_goal / truncated），以及 done 环境在重置前的
+              terminal_states（形状 (num_done, 100)）。
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"actions must have shape ({self.num_envs},)")
+
+        rows = self._rows
+        ny = self.agent_y + _ACTION_DY[actions]
+        nx = self.agent_x + _ACTION_DX[actions]
+        cells = self.grids[rows, ny, nx]
+
+        rewards = np.full(self.num_envs, STEP_PENALTY, dtype=np.float32)
+
+        collision = cells == WALL
+        at_door = (ny == self._door_pos[0]) & (nx == self._door_pos[1]) & ~collision
+        door_blocked = at_door & ~self.has_key
+        blocked = collision | door_blocked
+        rewards[blocked] += BLOCKED_PENALTY
+
+        moved = ~blocked
+        door_opened = at_door & moved
+        if door_opened.any():
+            self.grids[door_opened, self._door_pos[0], self._door_pos[1]] = EMPTY
+
+        self.agent_y = np.where(moved, ny, self.agent_y)
+        self.agent_x = np.where(moved, nx, self.agent_x)
+
+        picked_key = (
+            moved
+            & ~self.has_key
+            & (self.agent_y == self._key_pos[0])
+            & (self.agent_x == self._key_pos[1])
+        )
+        if picked_key.any():
+            self.has_key |= picked_key
+            self.grids[picked_key, self._key_pos[0], self._key_pos[1]] = EMPTY
+            rewards[picked_key] += KEY_REWARD
+
+        reached_goal = moved & (self.agent_y == self._goal_pos[0]) & (self.agent_x == self._goal_pos[1])
+        rewards[reached_goal] += GOAL_REWARD
+
+        self.episode_steps += 1
+        if self.max_episode_steps is not None:
+            truncated = (self.episode_steps >= self.max_episode_steps) & ~reached_goal
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+        dones = reached_goal | truncated
+
+        info: Dict[str, Any] = {
+            "collision": collision,
+            "door_blocked": door_blocked,
+            "door_opened": door_opened,
+            "picked_key": picked_key,
+            "reached_goal": reached_goal,
+            "truncated": truncated,
+        }
+
+        if dones.any():
+            info["terminal_states"] = self._encode_states()[dones]
+            self._reset_mask(dones)
+
+        return self._encode_states(), rewards, dones, info
+
+    def _encode_states(self) -> np.ndarray:
+        """把所有网格 + 角色状态编码为 (N, 100) 向量，一次类型转换完成。"""
+        states = self.grids.reshape(self.num_envs, -1).astype(np.float32)
+        flat_pos = self.agent_y * self.width + self.agent_x
+        states[self._rows, flat_pos] = np.where(self.has_key, AGENT_WITH_KEY, AGENT)
+        return states
+
+    def get_env_state(self, index: int) -> np.ndarray:
+        """取出第 index 个环境的当前状态（便于调试 / 与单环境对比）。"""
+        state = self.grids[index].reshape(-1).astype(np.float32)
+        state[self.agent_y[index] * self.width + self.agent_x[index]] = (
+            AGENT_WITH_KEY if self.has_key[index] else AGENT
+        )
+        return state
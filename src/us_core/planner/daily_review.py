@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
 
-from .execution_review import ExecutionSummary
+from .execution_review import ExecutionSummary, load_execution_for_plan
+from .loader import load_tasks_from_jsonl
+from .plan_index import query_plan_artifacts
 
 
 @dataclass
@@ -62,6 +66,32 @@ def aggregate_execution_summaries(plans: List[NamedExecutionSummary]) -> DailyRe
     )
 
 
+def review_plans_in_range(
+    start: date,
+    end: Optional[date] = None,
+    *,
+    index_path: Optional[Path] = None,
+    tasks_path: Optional[Path] = None,
+) -> DailyReviewAggregate:
+    """基于 plan_index.jsonl 按日期范围复盘计划执行情况。
+
+    只读取一次索引和一次 tasks.jsonl，不需要解析任何计划 Markdown。
+    """
+    artifacts = query_plan_artifacts(start, end, index_path=index_path)
+    if not artifacts:
+        return aggregate_execution_summaries([])
+
+    tasks = load_tasks_from_jsonl(tasks_path)
+    plans = [
+        NamedExecutionSummary(
+            plan_name=artifact.plan_name,
+            summary=load_execution_for_plan(artifact.task_ids, tasks=tasks),
+        )
+        for artifact in artifacts
+    ]
+    return aggregate_execution_summaries(plans)
+
+
 def daily_review_to_markdown(agg: DailyReviewAggregate) -> str:
     """把 DailyReviewAggregate 渲染为 Markdown。"""
     lines: List[str] = []
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .filters import filter_tasks
-from .loader import iter_open_tasks, load_tasks_from_jsonl
+from .loader import iter_open_tasks, load_task_index
 from .models import FilterSpec, PlanResult, PlannedTask, Task
-from .scoring import score_task, score_task_with_history
+from .scoring import deadline_component, score_task, score_task_with_history
 from .preference_memory import aggregate_task_stats, TaskHistoryStats
 
 
@@ -31,6 +32,7 @@ class DayBlockPlan:
 class DayPlanResult:
     base_mode: str
     blocks: List[DayBlockPlan]
+    day: Optional[date] = None  # 多日规划时标明是哪一天
 
     @property
     def total_estimated_minutes(self) -> int:
@@ -145,16 +147,14 @@ def build_day_plan(
     if base_mode not in {"rest", "balance", "focus"}:
         base_mode = "balance"
 
-    raw_tasks = load_tasks_from_jsonl()
-    if not raw_tasks:
+    index = load_task_index()
+    if not index.tasks:
         return DayPlanResult(base_mode=base_mode, blocks=[])
 
-    open_tasks = list(iter_open_tasks(raw_tasks))
-
     if filter_spec is None:
         filter_spec = FilterSpec()
 
-    remaining_tasks = filter_tasks(open_tasks, filter_spec)
+    remaining_tasks = list(iter_open_tasks(filter_tasks(index, filter_spec)))
 
     if not remaining_tasks:
         return DayPlanResult(base_mode=base_mode, blocks=[])
@@ -189,16 +189,14 @@ def build_day_plan_with_history(
     if base_mode not in {"rest", "balance", "focus"}:
         base_mode = "balance"
 
-    raw_tasks = load_tasks_from_jsonl()
-    if not raw_tasks:
+    index = load_task_index()
+    if not index.tasks:
         return DayPlanResult(base_mode=base_mode, blocks=[])
 
-    open_tasks = list(iter_open_tasks(raw_tasks))
-
     if filter_spec is None:
         filter_spec = FilterSpec()
 
-    remaining_tasks = filter_tasks(open_tasks, filter_spec)
+    remaining_tasks = list(iter_open_tasks(filter_tasks(index, filter_spec)))
 
     if not remaining_tasks:
         return DayPlanResult(base_mode=base_mode, blocks=[])
@@ -222,6 +220,173 @@ def build_day_plan_with_history(
     return DayPlanResult(base_mode=base_mode, blocks=blocks)
 
 
+@dataclass
+class HorizonDaySpec:
+    """多日规划中某一天的配置：日期 + 当天的模式预测 + block 列表。"""
+
+    day: date
+    base_mode: str
+    block_specs: List[DayBlockSpec]
+
+
+@dataclass
+class _HorizonSlot:
+    """多日规划内部使用：某一天的某个 block 及其剩余容量。"""
+
+    day_idx: int
+    spec: DayBlockSpec
+    selected: List[PlannedTask]
+    used_minutes: int = 0
+
+    def fits(self, est: int) -> bool:
+        if len(self.selected) >= self.spec.max_tasks:
+            return False
+        return not self.selected or self.used_minutes + est <= self.spec.duration_minutes
+
+
+def _normalize_base_mode(base_mode: str) -> str:
+    base_mode = (base_mode or "balance").strip().lower()
+    if base_mode not in {"rest", "balance", "focus"}:
+        base_mode = "balance"
+    return base_mode
+
+
+def build_horizon_plan(
+    day_specs: List[HorizonDaySpec],
+    *,
+    filter_spec: Optional[FilterSpec] = None,
+    with_history: bool = True,
+    now: Optional[datetime] = None,
+) -> List[DayPlanResult]:
+    """一次性规划多天（例如一周），返回每天一个 DayPlanResult。
+
+    与逐天调用 build_day_plan 相比：
+    - 任务和历史偏好只加载一次，每种 mode 只打一次分，
+      之后按天只重算 deadline 组件；
+    - 先按截止日期（最早截止优先）把 horizon 内到期的任务放进截止日当天或之前、
+      mode 最匹配且还有容量的 block；
+    - 剩余任务再按时间顺序逐个 block 贪心填充，每个任务在整个 horizon 内至多出现一次。
+    """
+    if not day_specs:
+        return []
+
+    if now is None:
+        now = datetime.now()
+
+    day_specs = sorted(day_specs, key=lambda d: d.day)
+    base_modes = [_normalize_base_mode(d.base_mode) for d in day_specs]
+
+    index = load_task_index()
+    if filter_spec is None:
+        filter_spec = FilterSpec()
+    tasks: List[Task] = list(iter_open_tasks(filter_tasks(index, filter_spec))) if index.tasks else []
+
+    if not tasks:
+        return [DayPlanResult(base_mode=m, blocks=[], day=d.day) for d, m in zip(day_specs, base_modes)]
+
+    history_stats = aggregate_task_stats() if with_history else None
+
+    # 1) 每种 mode 只打一次分
+    modes = {spec.mode for d in day_specs for spec in d.block_specs}
+    base_scores: Dict[str, List[Tuple[float, Dict[str, float]]]] = {}
+    for mode in modes:
+        if with_history:
+            base_scores[mode] = [
+                score_task_with_history(t, mode=mode, history_stats=history_stats or None, now=now) for t in tasks
+            ]
+        else:
+            base_scores[mode] = [score_task(t, mode=mode, now=now) for t in tasks]
+
+    # 2) 按天只重算 deadline 组件（其余组件与日期无关或变化很小）
+    day_nows = [now if d.day <= now.date() else datetime.combine(d.day, now.time()) for d in day_specs]
+    deadline_by_day = [[deadline_component(t, day_now) for t in tasks] for day_now in day_nows]
+
+    def planned_for(pos: int, mode: str, day_idx: int) -> PlannedTask:
+        score, components = base_scores[mode][pos]
+        reasons = dict(components)
+        new_deadline = deadline_by_day[day_idx][pos]
+        score = score - reasons.get("deadline", 0.0) + new_deadline
+        reasons["deadline"] = new_deadline
+        return PlannedTask(task=tasks[pos], score=score, reasons=reasons)
+
+    def estimate(pos: int, spec: DayBlockSpec) -> int:
+        return tasks[pos].estimated_minutes or spec.default_task_minutes
+
+    slots: List[_HorizonSlot] = [
+        _HorizonSlot(day_idx=i, spec=spec, selected=[])
+        for i, d in enumerate(day_specs)
+        for spec in d.block_specs
+    ]
+    assigned: List[bool] = [False] * len(tasks)
+
+    def place(slot: _HorizonSlot, pos: int) -> None:
+        slot.selected.append(planned_for(pos, slot.spec.mode, slot.day_idx))
+        slot.used_minutes += estimate(pos, slot.spec)
+        assigned[pos] = True
+
+    # 3) 截止日期在 horizon 内的任务：最早截止优先
+    last_day = day_specs[-1].day
+    due_positions = [
+        pos for pos, t in enumerate(tasks) if t.due_date is not None and t.due_date.date() <= last_day
+    ]
+    due_positions.sort(key=lambda pos: (tasks[pos].due_date, -(tasks[pos].priority or 0)))
+
+    for pos in due_positions:
+        due_day = tasks[pos].due_date.date()
+        best: Optional[_HorizonSlot] = None
+        best_score = 0.0
+        for slot in slots:
+            # 已过期的任务只能尽早安排；其余任务必须排在截止日当天或之前
+            if day_specs[slot.day_idx].day > max(due_day, day_specs[0].day):
+                break
+            if not slot.fits(estimate(pos, slot.spec)):
+                continue
+            score = base_scores[slot.spec.mode][pos][0]
+            if best is None or score > best_score:
+                best, best_score = slot, score
+        if best is not None:
+            place(best, pos)
+
+    # 4) 剩余任务按时间顺序逐个 block 贪心填充
+    for slot in slots:
+        candidates = [
+            (planned_for(pos, slot.spec.mode, slot.day_idx), pos)
+            for pos in range(len(tasks))
+            if not assigned[pos]
+        ]
+        candidates.sort(
+            key=lambda item: (
+                item[0].score,
+                (item[0].task.priority or 0),
+                item[0].task.created_at or datetime.min,
+            ),
+            reverse=True,
+        )
+        for _planned, pos in candidates:
+            if len(slot.selected) >= slot.spec.max_tasks:
+                break
+            if slot.fits(estimate(pos, slot.spec)):
+                place(slot, pos)
+
+    # 5) 组装结果：block 内按分数从高到低展示
+    results: List[DayPlanResult] = []
+    for i, d in enumerate(day_specs):
+        blocks: List[DayBlockPlan] = []
+        for slot in slots:
+            if slot.day_idx != i:
+                continue
+            selected = sorted(slot.selected, key=lambda pt: pt.score, reverse=True)
+            blocks.append(
+                DayBlockPlan(
+                    spec=slot.spec,
+                    plan=PlanResult(mode=slot.spec.mode, total_estimated_minutes=slot.used_minutes, tasks=selected),
+                )
+            )
+        results.append(DayPlanResult(base_mode=base_modes[i], blocks=blocks, day=d.day))
+
+    return results
+
+
 def day_plan_to_markdown(day_plan: DayPlanResult) -> str:
     """把 DayPlanResult 渲染为 Markdown。"""
     lines: List[str] = []
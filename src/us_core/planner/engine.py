@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Iterable, List, Optional
 
 from .filters import filter_tasks
-from .loader import iter_open_tasks, load_tasks_from_jsonl
+from .loader import iter_open_tasks, load_task_index
 from .models import FilterSpec, PlanConfig, PlanResult, PlannedTask, Task
 from .scoring import score_task, score_task_with_history
 from .preference_memory import aggregate_task_stats, TaskHistoryStats
@@ -60,13 +60,13 @@ def make_focus_block_plan(
     filter_spec: Optional[FilterSpec] = None,
 ) -> PlanResult:
     """基础版：不考虑历史偏好的 focus block 计划。"""
-    tasks = load_tasks_from_jsonl()
-    open_tasks = list(iter_open_tasks(tasks))
+    index = load_task_index()
 
     if filter_spec is None:
         filter_spec = FilterSpec()
 
-    filtered = filter_tasks(open_tasks, filter_spec)
+    # 先走索引过滤（结果按 spec + 任务文件版本缓存），再剔除已完成任务
+    filtered = list(iter_open_tasks(filter_tasks(index, filter_spec)))
     if not filtered:
         return PlanResult(mode=mode, total_estimated_minutes=0, tasks=[])
 
@@ -101,13 +101,13 @@ def make_focus_block_plan_with_history(
     - 当 planner_history.jsonl 不存在或没有相关记录时，行为会退化为基础版；
     - 当某些任务历史完成率很低 / 很高时，会对其得分做适度调整。
     """
-    tasks = load_tasks_from_jsonl()
-    open_tasks = list(iter_open_tasks(tasks))
+    index = load_task_index()
 
     if filter_spec is None:
         filter_spec = FilterSpec()
 
-    filtered = filter_tasks(open_tasks, filter_spec)
+    # 先走索引过滤（结果按 spec + 任务文件版本缓存），再剔除已完成任务
+    filtered = list(iter_open_tasks(filter_tasks(index, filter_spec)))
     if not filtered:
         return PlanResult(mode=mode, total_estimated_minutes=0, tasks=[])
 
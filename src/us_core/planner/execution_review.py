@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
 from .loader import load_tasks_from_jsonl
 from .models import Task
@@ -70,10 +70,15 @@ def load_execution_for_plan(
     task_ids: List[str],
     *,
     tasks_path: Optional[Path] = None,
+    tasks: Optional[Sequence[Task]] = None,
 ) -> ExecutionSummary:
-    """给定一份计划中涉及的 task_id 列表，对照 tasks.jsonl 计算执行情况。"""
+    """给定一份计划中涉及的 task_id 列表，对照 tasks.jsonl 计算执行情况。
+
+    批量复盘多份计划时可以直接传入已加载的 tasks，避免反复读取 tasks.jsonl。
+    """
     # 加载任务列表
-    tasks = load_tasks_from_jsonl(tasks_path)
+    if tasks is None:
+        tasks = load_tasks_from_jsonl(tasks_path)
     id_to_task: Dict[str, Task] = {t.id: t for t in tasks}
 
     items: List[TaskExecution] = []
@@ -1,44 +1,169 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Optional, Tuple, Union
 
 from .models import FilterSpec, Task
+from .task_index import TaskIndex
 
 
-def filter_tasks(tasks: Iterable[Task], spec: FilterSpec) -> List[Task]:
-    """按 FilterSpec 对任务进行过滤。"""
-    result: List[Task] = []
-    search_lower = spec.search.lower() if spec.search else None
+def _lower_set(values) -> Optional[FrozenSet[str]]:
+    if values is None:
+        return None
+    return frozenset(str(v).lower() for v in values)
 
-    for task in tasks:
-        if spec.statuses is not None:
-            if task.status.lower() not in {s.lower() for s in spec.statuses}:
-                continue
 
-        if spec.min_priority is not None and task.priority is not None:
-            if task.priority < spec.min_priority:
-                continue
+@dataclass(frozen=True)
+class CompiledFilter:
+    """编译后的 FilterSpec：集合 / 搜索词都预先小写好，可重复使用。
 
-        if spec.max_priority is not None and task.priority is not None:
-            if task.priority > spec.max_priority:
-                continue
+    key 可哈希，用来在 TaskIndex 上缓存过滤结果。
+    """
 
-        if spec.include_tags is not None:
-            # 只要有一个 tag 命中就算包含
-            task_tags_lower = {t.lower() for t in task.tags}
-            if not any(tag.lower() in task_tags_lower for tag in spec.include_tags):
-                continue
+    statuses: Optional[FrozenSet[str]] = None
+    min_priority: Optional[int] = None
+    max_priority: Optional[int] = None
+    include_tags: Optional[FrozenSet[str]] = None
+    exclude_tags: Optional[FrozenSet[str]] = None
+    search: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple:
+        return (
+            self.statuses,
+            self.min_priority,
+            self.max_priority,
+            self.include_tags,
+            self.exclude_tags,
+            self.search,
+        )
+
+    @property
+    def is_trivial(self) -> bool:
+        """所有条件都不生效时为 True。"""
+        return self.key == (None, None, None, None, None, None)
 
-        if spec.exclude_tags is not None:
+    def _priority_ok(self, priority: Optional[int]) -> bool:
+        if priority is None:
+            return True
+        if self.min_priority is not None and priority < self.min_priority:
+            return False
+        if self.max_priority is not None and priority > self.max_priority:
+            return False
+        return True
+
+    def __call__(self, task: Task) -> bool:
+        """对单个任务求值（不依赖索引的通用路径）。"""
+        if self.statuses is not None and task.status.lower() not in self.statuses:
+            return False
+
+        if not self._priority_ok(task.priority):
+            return False
+
+        if self.include_tags is not None or self.exclude_tags is not None:
             task_tags_lower = {t.lower() for t in task.tags}
-            if any(tag.lower() in task_tags_lower for tag in spec.exclude_tags):
-                continue
+            # 只要有一个 tag 命中就算包含
+            if self.include_tags is not None and self.include_tags.isdisjoint(task_tags_lower):
+                return False
+            if self.exclude_tags is not None and not self.exclude_tags.isdisjoint(task_tags_lower):
+                return False
 
-        if search_lower:
+        if self.search:
             text = (task.title + " " + " ".join(task.tags)).lower()
-            if search_lower not in text:
+            if self.search not in text:
+                return False
+
+        return True
+
+    def apply_to_index(self, index: TaskIndex) -> List[Task]:
+        """借助 TaskIndex 的二级索引求值：status / include_tags 直接取下标集合，不扫描全部任务。"""
+        cached = index.get_cached(self.key)
+        if cached is not None:
+            return list(cached)
+
+        candidates: Optional[set] = None
+        if self.statuses is not None:
+            candidates = set()
+            for s in self.statuses:
+                candidates |= index.by_status.get(s, set())
+
+        if self.include_tags is not None:
+            tagged: set = set()
+            for t in self.include_tags:
+                tagged |= index.by_tag.get(t, set())
+            candidates = tagged if candidates is None else candidates & tagged
+
+        positions = range(len(index.tasks)) if candidates is None else sorted(candidates)
+        exclude_mask = index.tags_mask(self.exclude_tags) if self.exclude_tags else 0
+
+        result: List[Task] = []
+        for pos in positions:
+            task = index.tasks[pos]
+            if not self._priority_ok(task.priority):
+                continue
+            if exclude_mask and index.tag_masks[pos] & exclude_mask:
                 continue
+            if self.search and self.search not in index.search_texts[pos]:
+                continue
+            result.append(task)
+
+        index.store_cached(self.key, result)
+        return list(result)
+
+
+@lru_cache(maxsize=128)
+def _compile_from_key(
+    statuses: Optional[FrozenSet[str]],
+    min_priority: Optional[int],
+    max_priority: Optional[int],
+    include_tags: Optional[FrozenSet[str]],
+    exclude_tags: Optional[FrozenSet[str]],
+    search: Optional[str],
+) -> CompiledFilter:
+    return CompiledFilter(
+        statuses=_lower_set(statuses),
+        min_priority=min_priority,
+        max_priority=max_priority,
+        include_tags=_lower_set(include_tags),
+        exclude_tags=_lower_set(exclude_tags),
+        search=search.lower() if search else None,
+    )
+
+
+def compile_filter_spec(spec: Union[FilterSpec, CompiledFilter]) -> CompiledFilter:
+    """把 FilterSpec 编译为 CompiledFilter；相同条件的 spec 会复用同一个编译结果。"""
+    if isinstance(spec, CompiledFilter):
+        return spec
+
+    def _freeze(values) -> Optional[FrozenSet[str]]:
+        return frozenset(values) if values is not None else None
+
+    return _compile_from_key(
+        _freeze(spec.statuses),
+        spec.min_priority,
+        spec.max_priority,
+        _freeze(spec.include_tags),
+        _freeze(spec.exclude_tags),
+        spec.search,
+    )
+
+
+def filter_tasks(
+    tasks: Union[Iterable[Task], TaskIndex],
+    spec: Union[FilterSpec, CompiledFilter],
+) -> List[Task]:
+    """按 FilterSpec 对任务进行过滤。
+
+    传入 TaskIndex 时走索引路径，结果按 (spec, 索引版本) 缓存。
+    """
+    compiled = compile_filter_spec(spec)
 
-        result.append(task)
+    if isinstance(tasks, TaskIndex):
+        if compiled.is_trivial:
+            return list(tasks.tasks)
+        return compiled.apply_to_index(tasks)
 
-    return result
+    if compiled.is_trivial:
+        return list(tasks)
+    return [task for task in tasks if compiled(task)]
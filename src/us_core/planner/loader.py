@@ -2,9 +2,14 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
 from .models import Task
+from .task_index import TaskIndex
+
+
+# path -> (文件版本, 索引)；文件 mtime / size 不变时直接复用
+_TASK_INDEX_CACHE: Dict[Path, Tuple[Tuple[int, int], TaskIndex]] = {}
 
 
 def get_default_tasks_path() -> Path:
@@ -58,6 +63,37 @@ def load_tasks_from_jsonl(path: Path | None = None) -> List[Task]:
     return tasks
 
 
+def load_task_index(path: Path | None = None) -> TaskIndex:
+    """
+    加载任务并构建 TaskIndex。
+
+    以 (mtime_ns, size) 作为任务存储的版本号：文件没变时直接返回缓存的索引
+    （连同其上缓存的过滤结果），文件变化后自动重建。
+    """
+    if path is None:
+        path = get_default_tasks_path()
+
+    if not path.exists():
+        return TaskIndex([], version=None)
+
+    st = path.stat()
+    version = (st.st_mtime_ns, st.st_size)
+    key = path.resolve()
+
+    cached = _TASK_INDEX_CACHE.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    index = TaskIndex(load_tasks_from_jsonl(path), version=version)
+    _TASK_INDEX_CACHE[key] = (version, index)
+    return index
+
+
+def clear_task_index_cache() -> None:
+    """清空 load_task_index 的进程内缓存。"""
+    _TASK_INDEX_CACHE.clear()
+
+
 def iter_open_tasks(tasks: Iterable[Task]) -> Iterable[Task]:
     """只保留尚未完成的任务。status 简单按字符串匹配。"""
     done_statuses = {"done", "completed", "cancelled", "canceled", "archived"}
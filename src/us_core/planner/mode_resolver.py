@@ -1,9 +1,18 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# (path, mtime_ns, size)；文件不存在时 mtime / size 为 None
+FileSignature = Tuple[str, Optional[int], Optional[int]]
+
+# 缓存条目上限，超过就整体清空（key 里带着文件签名，旧条目不会再被命中）
+MAX_CACHE_ENTRIES = 128
+
+_MODE_CACHE: Dict[Tuple, "ModeResolutionInfo"] = {}
 
 
 @dataclass
@@ -95,10 +104,46 @@ def _infer_mode_from_payload(payload: Any) -> Optional[str]:
     return None
 
 
+def file_signature(path: Path) -> FileSignature:
+    """用 (path, mtime_ns, size) 描述一个输入文件的版本，用作缓存 key。"""
+    try:
+        st = path.stat()
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def _mood_candidates(project_root: Path) -> List[Path]:
+    mood_dir = project_root / "data" / "mood"
+    return [
+        mood_dir / "today_mood.json",
+        mood_dir / "today_summary.json",
+        mood_dir / "daily_mood.json",
+        mood_dir / "mood_today.json",
+    ]
+
+
+def _project_root_for(base_dir: Optional[Path]) -> Path:
+    if base_dir is None:
+        return _project_root_from_this_file()
+    return Path(base_dir)
+
+
+def mood_files_signature(base_dir: Optional[Path] = None) -> Tuple[FileSignature, ...]:
+    """data/mood 下所有候选文件的签名；任何一个文件变化，签名就会变化。"""
+    return tuple(file_signature(p) for p in _mood_candidates(_project_root_for(base_dir)))
+
+
+def invalidate_mode_cache() -> None:
+    """显式清空 mode 推断缓存（例如在进程内直接改写了 mood 文件之后）。"""
+    _MODE_CACHE.clear()
+
+
 def resolve_mode_from_mood_files(
     *,
     preferred_mode: Optional[str] = None,
     base_dir: Optional[Path] = None,
+    use_cache: bool = True,
 ) -> ModeResolutionInfo:
     """尝试从 data/mood 下的若干 JSON 文件推断今日 mode。
 
@@ -112,25 +157,38 @@ def resolve_mode_from_mood_files(
     如果所有文件都不可用 / 推断失败：
     - 如果 preferred_mode 是合法的，就用 preferred_mode；
     - 否则回退到 "balance"。
+
+    结果按各候选文件的 (path, mtime, size) 缓存：文件没变时只做 stat，不再读取 / 解析 JSON。
     """
-    if base_dir is None:
-        project_root = _project_root_from_this_file()
-    else:
-        project_root = Path(base_dir)
+    project_root = _project_root_for(base_dir)
+    candidates = _mood_candidates(project_root)
+
+    signatures = tuple(file_signature(p) for p in candidates)
+    key = (str(project_root), preferred_mode, signatures)
+    if use_cache:
+        cached = _MODE_CACHE.get(key)
+        if cached is not None:
+            return replace(cached)
+
+    info = _resolve_from_candidates(
+        project_root,
+        [p for p, sig in zip(candidates, signatures) if sig[1] is not None],
+        preferred_mode,
+    )
 
-    mood_dir = project_root / "data" / "mood"
+    if use_cache:
+        if len(_MODE_CACHE) >= MAX_CACHE_ENTRIES:
+            _MODE_CACHE.clear()
+        _MODE_CACHE[key] = replace(info)
+    return info
 
-    candidates = [
-        mood_dir / "today_mood.json",
-        mood_dir / "today_summary.json",
-        mood_dir / "daily_mood.json",
-        mood_dir / "mood_today.json",
-    ]
 
+def _resolve_from_candidates(
+    project_root: Path,
+    candidates: List[Path],
+    preferred_mode: Optional[str],
+) -> ModeResolutionInfo:
     for path in candidates:
-        if not path.exists():
-            continue
-
         payload = _safe_load_json(path)
         if payload is None:
             continue
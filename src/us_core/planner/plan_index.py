@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .dayplan import DayPlanResult
+from .execution_review import parse_task_ids_from_plan_markdown
+from .models import PlanResult
+
+
+# 计划文件名里的时间戳，例如 focus_block_from_mood_balance_2025-11-23_2157.md
+_FILENAME_TS_RE = re.compile(r"(\d{4}-\d{2}-\d{2})_(\d{4})")
+
+
+@dataclass
+class PlanArtifact:
+    """一份计划 Markdown 的结构化描述（写在 plan_index.jsonl 里）。"""
+
+    plan_name: str  # Markdown 文件名，例如 day_focus_plan_from_mood_balance_2025-11-23_2207.md
+    date: str  # YYYY-MM-DD
+    mode: str
+    task_ids: List[str] = field(default_factory=list)
+    kind: Optional[str] = None  # 生成脚本的类别，例如 "focus_block_from_mood"
+    created_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "plan_name": self.plan_name,
+            "date": self.date,
+            "mode": self.mode,
+            "task_ids": list(self.task_ids),
+            "kind": self.kind,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PlanArtifact":
+        created_raw = data.get("created_at")
+        created_at: Optional[datetime] = None
+        if isinstance(created_raw, str) and created_raw:
+            try:
+                created_at = datetime.fromisoformat(created_raw)
+            except ValueError:
+                created_at = None
+
+        return cls(
+            plan_name=str(data.get("plan_name", "")),
+            date=str(data.get("date", "")),
+            mode=str(data.get("mode", "balance")),
+            task_ids=[str(t) for t in (data.get("task_ids") or [])],
+            kind=data.get("kind"),
+            created_at=created_at,
+        )
+
+
+def _project_root_from_this_file() -> Path:
+    # src/us_core/planner/plan_index.py
+    return Path(__file__).resolve().parents[3]
+
+
+def get_plan_index_path() -> Path:
+    project_root = _project_root_from_this_file()
+    return project_root / "data" / "plans" / "plan_index.jsonl"
+
+
+def task_ids_from_plan(plan: PlanResult) -> List[str]:
+    return [pt.task.id for pt in plan.tasks]
+
+
+def task_ids_from_day_plan(day_plan: DayPlanResult) -> List[str]:
+    ids: List[str] = []
+    for block in day_plan.blocks:
+        ids.extend(task_ids_from_plan(block.plan))
+    return ids
+
+
+def record_plan_artifact(
+    plan_path: Path,
+    *,
+    mode: str,
+    task_ids: Iterable[str],
+    kind: Optional[str] = None,
+    created_at: Optional[datetime] = None,
+    index_path: Optional[Path] = None,
+) -> PlanArtifact:
+    """在 plan_index.jsonl 中追加一条计划记录，与写出的 Markdown 一一对应。"""
+    if index_path is None:
+        index_path = get_plan_index_path()
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if created_at is None:
+        created_at = datetime.now()
+
+    artifact = PlanArtifact(
+        plan_name=Path(plan_path).name,
+        date=created_at.date().isoformat(),
+        mode=mode,
+        task_ids=[str(t) for t in task_ids],
+        kind=kind,
+        created_at=created_at,
+    )
+
+    with index_path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(artifact.to_dict(), ensure_ascii=False) + "\n")
+
+    return artifact
+
+
+def load_plan_artifacts(index_path: Optional[Path] = None) -> List[PlanArtifact]:
+    """加载 plan_index.jsonl 中所有记录。坏行跳过。"""
+    if index_path is None:
+        index_path = get_plan_index_path()
+
+    if not index_path.exists():
+        return []
+
+    artifacts: List[PlanArtifact] = []
+    with index_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(rec, dict) or not rec.get("plan_name"):
+                continue
+            artifacts.append(PlanArtifact.from_dict(rec))
+    return artifacts
+
+
+def query_plan_artifacts(
+    start: date,
+    end: Optional[date] = None,
+    *,
+    index_path: Optional[Path] = None,
+) -> List[PlanArtifact]:
+    """按日期范围（闭区间）查询计划记录，按创建时间排序。"""
+    if end is None:
+        end = start
+    start_s, end_s = start.isoformat(), end.isoformat()
+
+    result = [a for a in load_plan_artifacts(index_path) if start_s <= a.date <= end_s]
+    result.sort(key=lambda a: (a.date, a.created_at or datetime.min))
+    return result
+
+
+def find_plan_artifact(plan_name: str, *, index_path: Optional[Path] = None) -> Optional[PlanArtifact]:
+    """按文件名查找计划记录；同名多条时取最后写入的一条。"""
+    found: Optional[PlanArtifact] = None
+    for artifact in load_plan_artifacts(index_path):
+        if artifact.plan_name == plan_name:
+            found = artifact
+    return found
+
+
+def artifact_from_markdown_file(plan_path: Path) -> PlanArtifact:
+    """从旧的 Markdown 计划文件中恢复一条记录（日期 / 模式从文件名推断）。"""
+    text = plan_path.read_text(encoding="utf-8")
+    task_ids = parse_task_ids_from_plan_markdown(text)
+
+    created_at: Optional[datetime] = None
+    match = _FILENAME_TS_RE.search(plan_path.stem)
+    if match:
+        try:
+            created_at = datetime.strptime(f"{match.group(1)}_{match.group(2)}", "%Y-%m-%d_%H%M")
+        except ValueError:
+            created_at = None
+    if created_at is None:
+        created_at = datetime.fromtimestamp(plan_path.stat().st_mtime)
+
+    mode = "balance"
+    for candidate in ("rest", "balance", "focus"):
+        if f"_{candidate}_" in plan_path.stem:
+            mode = candidate
+            break
+
+    kind = plan_path.stem[: match.start()].rstrip("_") if match else None
+    if kind:
+        kind = re.sub(r"_(rest|balance|focus)$", "", kind)
+
+    return PlanArtifact(
+        plan_name=plan_path.name,
+        date=created_at.date().isoformat(),
+        mode=mode,
+        task_ids=task_ids,
+        kind=kind or None,
+        created_at=created_at,
+    )
+
+
+def backfill_plan_index(
+    plans_dir: Path,
+    *,
+    index_path: Optional[Path] = None,
+) -> List[PlanArtifact]:
+    """把 plans_dir 下还没有登记的计划 Markdown 补录进索引（只需运行一次）。
+
+    execution_review_*.md 是复盘报告而不是计划，会被跳过。
+    """
+    if index_path is None:
+        index_path = get_plan_index_path()
+
+    known = {a.plan_name for a in load_plan_artifacts(index_path)}
+    added: List[PlanArtifact] = []
+
+    for plan_path in sorted(plans_dir.glob("*.md")):
+        if plan_path.name in known or plan_path.name.startswith("execution_review_"):
+            continue
+        artifact = artifact_from_markdown_file(plan_path)
+        added.append(artifact)
+
+    if added:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with index_path.open("a", encoding="utf-8") as f:
+            for artifact in added:
+                f.write(json.dumps(artifact.to_dict(), ensure_ascii=False) + "\n")
+
+    return added
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
@@ -11,13 +11,42 @@ from .loader import load_tasks_from_jsonl
 from .models import Task
 
 
+# 时间衰减的默认半衰期：两周前的一次规划，权重只剩一半
+DEFAULT_HALF_LIFE_DAYS = 14.0
+
+HISTORY_INDEX_VERSION = 1
+
+
+def _decay_factor(delta: timedelta, half_life_days: float) -> float:
+    if half_life_days <= 0:
+        return 1.0
+    days = delta.total_seconds() / 86400.0
+    return 0.5 ** (days / half_life_days)
+
+
+def _parse_timestamp(value: object) -> Optional[datetime]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 @dataclass
 class TaskHistoryStats:
-    """某个任务在历史上的规划 / 完成统计。"""
+    """某个任务在历史上的规划 / 完成统计。
+
+    除了累计次数外，还维护一份按时间指数衰减的计数（decayed_*），
+    以 last_seen 为参考时间点，随 observe 增量更新，不需要回扫历史。
+    """
 
     task_id: str
     times_planned: int = 0
     times_completed: int = 0
+    decayed_planned: float = 0.0
+    decayed_completed: float = 0.0
+    last_seen: Optional[datetime] = None
 
     @property
     def completion_rate(self) -> float:
@@ -25,6 +54,167 @@ class TaskHistoryStats:
             return 0.0
         return self.times_completed / self.times_planned
 
+    @property
+    def decayed_completion_rate(self) -> float:
+        """衰减后的完成率；两个计数同比例衰减，所以与查询时间无关。"""
+        if self.decayed_planned <= 0:
+            return self.completion_rate
+        return self.decayed_completed / self.decayed_planned
+
+    def observe(
+        self,
+        is_completed: bool,
+        timestamp: Optional[datetime] = None,
+        *,
+        half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+    ) -> None:
+        """增量记录一次规划结果。
+
+        - 时间戳比 last_seen 新：先把已有衰减计数衰减到新时间点，再加 1；
+        - 时间戳更旧（乱序写入）：按它距 last_seen 的时间折算权重后再加；
+        - 没有时间戳：视为与 last_seen 同时发生。
+        """
+        self.times_planned += 1
+        if is_completed:
+            self.times_completed += 1
+
+        weight = 1.0
+        if timestamp is not None:
+            if self.last_seen is None or timestamp >= self.last_seen:
+                if self.last_seen is not None:
+                    factor = _decay_factor(timestamp - self.last_seen, half_life_days)
+                    self.decayed_planned *= factor
+                    self.decayed_completed *= factor
+                self.last_seen = timestamp
+            else:
+                weight = _decay_factor(self.last_seen - timestamp, half_life_days)
+
+        self.decayed_planned += weight
+        if is_completed:
+            self.decayed_completed += weight
+
+    def to_dict(self) -> dict:
+        return {
+            "times_planned": self.times_planned,
+            "times_completed": self.times_completed,
+            "decayed_planned": self.decayed_planned,
+            "decayed_completed": self.decayed_completed,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+        }
+
+    @classmethod
+    def from_dict(cls, task_id: str, data: dict) -> "TaskHistoryStats":
+        return cls(
+            task_id=task_id,
+            times_planned=int(data.get("times_planned", 0) or 0),
+            times_completed=int(data.get("times_completed", 0) or 0),
+            decayed_planned=float(data.get("decayed_planned", 0.0) or 0.0),
+            decayed_completed=float(data.get("decayed_completed", 0.0) or 0.0),
+            last_seen=_parse_timestamp(data.get("last_seen")),
+        )
+
+
+@dataclass
+class TaskHistoryIndex:
+    """planner_history 的增量索引：每个任务的衰减统计 + 按天分桶的计数。
+
+    days 的结构为 {"YYYY-MM-DD": {task_id: [planned, completed]}}，
+    任意时间窗口的统计只需要遍历窗口内的天数，而不需要重新扫描原始历史。
+    """
+
+    half_life_days: float = DEFAULT_HALF_LIFE_DAYS
+    tasks: Dict[str, TaskHistoryStats] = field(default_factory=dict)
+    days: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+    source_size: int = 0
+    source_mtime_ns: int = 0
+
+    def observe(self, task_id: str, is_completed: bool, timestamp: Optional[datetime] = None) -> None:
+        entry = self.tasks.get(task_id)
+        if entry is None:
+            entry = TaskHistoryStats(task_id=task_id)
+            self.tasks[task_id] = entry
+        entry.observe(is_completed, timestamp, half_life_days=self.half_life_days)
+
+        # 没有时间戳的记录只计入累计统计，无法落到具体某一天
+        if timestamp is None:
+            return
+        bucket = self.days.setdefault(timestamp.date().isoformat(), {})
+        counter = bucket.setdefault(task_id, [0, 0])
+        counter[0] += 1
+        if is_completed:
+            counter[1] += 1
+
+    def observe_record(self, rec: dict) -> None:
+        if rec.get("type") != "task_execution":
+            return
+        task_id_raw = rec.get("task_id")
+        if task_id_raw is None:
+            return
+        self.observe(
+            str(task_id_raw),
+            rec.get("is_completed") is True,
+            _parse_timestamp(rec.get("timestamp")),
+        )
+
+    def window_stats(self, start: date, end: date) -> Dict[str, TaskHistoryStats]:
+        """统计 [start, end]（按天，闭区间）窗口内每个任务的规划 / 完成情况。
+
+        窗口内的衰减计数以 end 当天为参考时间点。
+        """
+        stats: Dict[str, TaskHistoryStats] = {}
+        day = start
+        while day <= end:
+            bucket = self.days.get(day.isoformat())
+            if bucket:
+                factor = _decay_factor(end - day, self.half_life_days)
+                for task_id, (planned, completed) in bucket.items():
+                    entry = stats.get(task_id)
+                    if entry is None:
+                        entry = TaskHistoryStats(task_id=task_id)
+                        stats[task_id] = entry
+                    entry.times_planned += planned
+                    entry.times_completed += completed
+                    entry.decayed_planned += planned * factor
+                    entry.decayed_completed += completed * factor
+                    seen = datetime.combine(day, datetime.min.time())
+                    if entry.last_seen is None or seen > entry.last_seen:
+                        entry.last_seen = seen
+            day += timedelta(days=1)
+        return stats
+
+    def last_days_stats(self, days: int, *, today: Optional[date] = None) -> Dict[str, TaskHistoryStats]:
+        """最近 days 天（含 today）的窗口统计。"""
+        if today is None:
+            today = date.today()
+        if days <= 0:
+            return {}
+        return self.window_stats(today - timedelta(days=days - 1), today)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": HISTORY_INDEX_VERSION,
+            "half_life_days": self.half_life_days,
+            "source_size": self.source_size,
+            "source_mtime_ns": self.source_mtime_ns,
+            "tasks": {tid: st.to_dict() for tid, st in self.tasks.items()},
+            "days": self.days,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TaskHistoryIndex":
+        tasks_raw = data.get("tasks") or {}
+        days_raw = data.get("days") or {}
+        return cls(
+            half_life_days=float(data.get("half_life_days", DEFAULT_HALF_LIFE_DAYS)),
+            tasks={str(tid): TaskHistoryStats.from_dict(str(tid), st) for tid, st in tasks_raw.items()},
+            days={
+                str(day): {str(tid): [int(c[0]), int(c[1])] for tid, c in bucket.items()}
+                for day, bucket in days_raw.items()
+            },
+            source_size=int(data.get("source_size", 0) or 0),
+            source_mtime_ns=int(data.get("source_mtime_ns", 0) or 0),
+        )
+
 
 def _project_root_from_this_file() -> Path:
     # src/us_core/planner/preference_memory.py
@@ -36,6 +226,13 @@ def get_history_path() -> Path:
     return project_root / "data" / "plans" / "planner_history.jsonl"
 
 
+def get_history_index_path(history_path: Optional[Path] = None) -> Path:
+    """索引文件与 history 放在一起：planner_history.jsonl -> planner_history_index.json"""
+    if history_path is None:
+        history_path = get_history_path()
+    return history_path.with_name(history_path.stem + "_index.json")
+
+
 def append_execution_summary(
     plan_name: str,
     summary: ExecutionSummary,
@@ -58,6 +255,17 @@ def append_execution_summary(
 
     ts = timestamp.isoformat()
 
+    # 记录追加前的文件状态，用于判断索引是否可以增量更新
+    index_path = get_history_index_path(history_path)
+    index: Optional[TaskHistoryIndex] = None
+    if index_path.exists() and history_path.exists():
+        index = _read_history_index(index_path)
+        st = history_path.stat()
+        if index is not None and (
+            index.source_size != st.st_size or index.source_mtime_ns != st.st_mtime_ns
+        ):
+            index = None
+
     with history_path.open("a", encoding="utf-8") as f:
         # 任务级别事件
         for item in summary.items:
@@ -86,6 +294,12 @@ def append_execution_summary(
         }
         f.write(json.dumps(rec_summary, ensure_ascii=False) + "\n")
 
+    # 已有且新鲜的索引顺手增量更新，避免下次读取时全量重建
+    if index is not None:
+        for item in summary.items:
+            index.observe(item.task_id, item.is_completed is True, timestamp)
+        _write_history_index(index, index_path, history_path)
+
 
 def load_history(history_path: Optional[Path] = None) -> List[dict]:
     """加载 planner_history.jsonl 中所有记录。"""
@@ -111,35 +325,102 @@ def load_history(history_path: Optional[Path] = None) -> List[dict]:
     return records
 
 
-def aggregate_task_stats_from_records(records: Iterable[dict]) -> Dict[str, TaskHistoryStats]:
-    """从 history 记录中聚合出每个 task_id 的统计。"""
-    stats: Dict[str, TaskHistoryStats] = {}
-
+def build_history_index(
+    records: Iterable[dict],
+    *,
+    half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+) -> TaskHistoryIndex:
+    """从 history 记录构建 TaskHistoryIndex。"""
+    index = TaskHistoryIndex(half_life_days=half_life_days)
     for rec in records:
-        if rec.get("type") != "task_execution":
-            continue
+        index.observe_record(rec)
+    return index
 
-        task_id_raw = rec.get("task_id")
-        if task_id_raw is None:
-            continue
-        task_id = str(task_id_raw)
 
-        entry = stats.get(task_id)
-        if entry is None:
-            entry = TaskHistoryStats(task_id=task_id)
-            stats[task_id] = entry
+def _read_history_index(index_path: Path) -> Optional[TaskHistoryIndex]:
+    try:
+        data = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != HISTORY_INDEX_VERSION:
+        return None
+    try:
+        return TaskHistoryIndex.from_dict(data)
+    except (TypeError, ValueError, IndexError, AttributeError):
+        return None
 
-        entry.times_planned += 1
-        if rec.get("is_completed") is True:
-            entry.times_completed += 1
 
-    return stats
+def _write_history_index(index: TaskHistoryIndex, index_path: Path, history_path: Path) -> None:
+    st = history_path.stat()
+    index.source_size = st.st_size
+    index.source_mtime_ns = st.st_mtime_ns
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(index.to_dict(), ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(index_path)
 
 
-def aggregate_task_stats(history_path: Optional[Path] = None) -> Dict[str, TaskHistoryStats]:
-    """便捷方法：直接从 history 文件聚合任务统计。"""
-    records = load_history(history_path)
-    return aggregate_task_stats_from_records(records)
+def load_history_index(
+    history_path: Optional[Path] = None,
+    *,
+    half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+    persist: bool = True,
+) -> TaskHistoryIndex:
+    """加载 planner_history 的索引。
+
+    - 索引文件存在且与 history 文件（大小 + mtime）一致：直接读取索引；
+    - 否则从原始 history 全量重建，并在 persist=True 时写回索引文件。
+    """
+    if history_path is None:
+        history_path = get_history_path()
+
+    if not history_path.exists():
+        return TaskHistoryIndex(half_life_days=half_life_days)
+
+    index_path = get_history_index_path(history_path)
+    if index_path.exists():
+        index = _read_history_index(index_path)
+        st = history_path.stat()
+        if (
+            index is not None
+            and index.half_life_days == half_life_days
+            and index.source_size == st.st_size
+            and index.source_mtime_ns == st.st_mtime_ns
+        ):
+            return index
+
+    index = build_history_index(load_history(history_path), half_life_days=half_life_days)
+    if persist:
+        try:
+            _write_history_index(index, index_path, history_path)
+        except OSError:
+            pass
+    return index
+
+
+def aggregate_task_stats_from_records(
+    records: Iterable[dict],
+    *,
+    half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+) -> Dict[str, TaskHistoryStats]:
+    """从 history 记录中聚合出每个 task_id 的统计（含时间衰减计数）。"""
+    return build_history_index(records, half_life_days=half_life_days).tasks
+
+
+def aggregate_task_stats(
+    history_path: Optional[Path] = None,
+    *,
+    window_days: Optional[int] = None,
+    today: Optional[date] = None,
+) -> Dict[str, TaskHistoryStats]:
+    """便捷方法：从 history 索引获取任务统计。
+
+    - window_days 为 None：全量历史（含衰减计数）；
+    - 否则只统计最近 window_days 天（按天分桶查询，不回扫原始记录）。
+    """
+    index = load_history_index(history_path)
+    if window_days is None:
+        return index.tasks
+    return index.last_days_stats(window_days, today=today)
 
 
 def attach_task_metadata(
@@ -51,8 +51,8 @@ def _recency_component(task: Task, now: datetime) -> float:
     return max(0.0, 1.0 - delta_days / 30.0)
 
 
-def _deadline_component(task: Task, now: datetime) -> float:
-    """基于任务的截止时间（due_date）打分。"""
+def deadline_component(task: Task, now: datetime) -> float:
+    """基于任务的截止时间（due_date）打分（dayplan 的多日规划也按天复用）。"""
     if task.due_date is None:
         return 0.0
 
@@ -78,7 +78,7 @@ def score_task(task: Task, mode: str, now: Optional[datetime] = None) -> Tuple[f
     components["priority"] = _priority_component(task)
     components["tags"] = _tag_component(task, mode)
     components["recency"] = _recency_component(task, now)
-    components["deadline"] = _deadline_component(task, now)
+    components["deadline"] = deadline_component(task, now)
 
     total = sum(components.values())
     return total, components
@@ -89,12 +89,15 @@ def score_task_with_history(
     mode: str,
     history_stats: Optional[Mapping[str, TaskHistoryStats]] = None,
     now: Optional[datetime] = None,
+    *,
+    prefer_recent: bool = True,
 ) -> Tuple[float, Dict[str, float]]:
     """在基础打分上，叠加「历史完成率」作为 preference 组件。
 
     - 若该任务从未出现在历史记录中，则 preference=0，对结果无影响；
     - 若 times_planned 较多且 completion_rate 高，则适度加分；
-    - 若 times_planned 较多且 completion_rate 很低，则适度减分。
+    - 若 times_planned 较多且 completion_rate 很低，则适度减分；
+    - prefer_recent=True 时使用时间衰减后的完成率，近期表现权重更高。
     """
     base_total, components = score_task(task, mode=mode, now=now)
 
@@ -103,7 +106,8 @@ def score_task_with_history(
         stat = history_stats.get(task.id)
         if stat and stat.times_planned >= 2:
             # completion_rate ∈ [0,1]，中心 0.5
-            centered = stat.completion_rate - 0.5  # ∈ [-0.5, 0.5]
+            rate = stat.decayed_completion_rate if prefer_recent else stat.completion_rate
+            centered = rate - 0.5  # ∈ [-0.5, 0.5]
             # 使用 log 放大在 2~5 次规划之间的影响，并对更多次数做饱和
             factor = math.log1p(stat.times_planned) / math.log1p(5.0)
             # 整体权重，保证 preference 大致在 [-2, 2] 区间
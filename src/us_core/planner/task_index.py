@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Sequence, Set
+
+from .models import Task
+
+
+# 每个索引最多缓存多少份过滤结果，超过就整体清空
+MAX_CACHED_RESULTS = 64
+
+
+class TaskIndex:
+    """任务列表的只读二级索引，供 planner 过滤使用。
+
+    - by_status / by_tag：小写 status / tag -> 任务下标集合；
+    - tag_bits / tag_masks：每个 tag 分配一个 bit，每个任务一个 tag 位掩码；
+    - search_texts：预先小写好的「title + tags」文本；
+    - version：任务存储的版本标识（例如文件的 mtime + size），
+      过滤结果按 (FilterSpec, version) 缓存在索引上。
+    """
+
+    def __init__(self, tasks: Sequence[Task], version: Hashable = None) -> None:
+        self.tasks: List[Task] = list(tasks)
+        self.version = version
+
+        self.statuses: List[str] = []
+        self.search_texts: List[str] = []
+        self.tag_masks: List[int] = []
+        self.tag_bits: Dict[str, int] = {}
+        self.by_status: Dict[str, Set[int]] = {}
+        self.by_tag: Dict[str, Set[int]] = {}
+        self._results: Dict[Hashable, List[Task]] = {}
+
+        for pos, task in enumerate(self.tasks):
+            status = task.status.lower()
+            self.statuses.append(status)
+            self.by_status.setdefault(status, set()).add(pos)
+
+            mask = 0
+            for tag in task.tags:
+                t = tag.lower()
+                bit = self.tag_bits.get(t)
+                if bit is None:
+                    bit = 1 << len(self.tag_bits)
+                    self.tag_bits[t] = bit
+                mask |= bit
+                self.by_tag.setdefault(t, set()).add(pos)
+            self.tag_masks.append(mask)
+
+            self.search_texts.append((task.title + " " + " ".join(task.tags)).lower())
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def tags_mask(self, tags: Set[str]) -> int:
+        """把一组（已小写的）tag 转成位掩码；索引里没出现过的 tag 不贡献任何 bit。"""
+        mask = 0
+        for t in tags:
+            mask |= self.tag_bits.get(t, 0)
+        return mask
+
+    def get_cached(self, key: Hashable):
+        return self._results.get(key)
+
+    def store_cached(self, key: Hashable, result: List[Task]) -> None:
+        if len(self._results) >= MAX_CACHED_RESULTS:
+            self._results.clear()
+        self._results[key] = result
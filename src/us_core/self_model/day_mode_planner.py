@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List, Optional
 
 from .insights import PlannerInsights
-from .mode_orchestration import ModeDecision, decide_day_mode
+from .mode_orchestration import ModeDecision, decide_day_mode, resolve_day_mode_decision
 from ..planner.dayplan import (
     DayBlockSpec,
     DayPlanResult,
@@ -81,6 +82,52 @@ def plan_day_with_mood_and_self_model(
     """
     decision = decide_day_mode(mood_mode=mood_mode, insights=insights)
 
+    return _plan_for_decision(
+        decision,
+        morning_duration=morning_duration,
+        afternoon_duration=afternoon_duration,
+        evening_duration=evening_duration,
+        max_tasks_per_block=max_tasks_per_block,
+        filter_spec=filter_spec,
+    )
+
+
+def plan_day_from_mood_files(
+    *,
+    preferred_mode: Optional[str] = None,
+    base_dir: Optional[Path] = None,
+    morning_duration: int = 90,
+    afternoon_duration: int = 90,
+    evening_duration: int = 60,
+    max_tasks_per_block: int = 5,
+    filter_spec: Optional[FilterSpec] = None,
+) -> DayModePlanningResult:
+    """直接从 mood 文件 + planner 历史生成日计划。
+
+    模式决策走 resolve_day_mode_decision 的缓存：输入文件没变时，
+    不会重新解析 mood JSON，也不会重新加载 insights。
+    """
+    decision = resolve_day_mode_decision(preferred_mode=preferred_mode, base_dir=base_dir)
+
+    return _plan_for_decision(
+        decision,
+        morning_duration=morning_duration,
+        afternoon_duration=afternoon_duration,
+        evening_duration=evening_duration,
+        max_tasks_per_block=max_tasks_per_block,
+        filter_spec=filter_spec,
+    )
+
+
+def _plan_for_decision(
+    decision: ModeDecision,
+    *,
+    morning_duration: int,
+    afternoon_duration: int,
+    evening_duration: int,
+    max_tasks_per_block: int,
+    filter_spec: Optional[FilterSpec],
+) -> DayModePlanningResult:
     block_specs = _build_block_specs_for_mode(
         base_mode=decision.final_mode,
         morning_duration=morning_duration,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import date
 from typing import Dict, Iterable, List, Optional
 
 from ..planner.preference_memory import aggregate_task_stats, attach_task_metadata
@@ -77,12 +78,15 @@ def load_planner_insights(
     *,
     history_path=None,
     tasks_path=None,
+    window_days: Optional[int] = None,
+    today: Optional[date] = None,
 ) -> PlannerInsights:
     """从 planner_history.jsonl + tasks.jsonl 加载并计算画像。
 
-    - 没有历史记录时，返回全 0 / 空列表。
+    - 没有历史记录时，返回全 0 / 空列表；
+    - 传入 window_days 时只统计最近 N 天（例如 14 天）的行为。
     """
-    stats = aggregate_task_stats(history_path)
+    stats = aggregate_task_stats(history_path, window_days=window_days, today=today)
     if not stats:
         return PlannerInsights(
             total_tasks=0,
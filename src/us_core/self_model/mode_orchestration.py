@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
-from .insights import PlannerInsights
+from .insights import PlannerInsights, load_planner_insights
 from .recommendations import suggest_base_mode_from_insights
+from ..planner.loader import get_default_tasks_path
+from ..planner.mode_resolver import (
+    MAX_CACHE_ENTRIES,
+    file_signature,
+    invalidate_mode_cache,
+    mood_files_signature,
+    resolve_mode_from_mood_files,
+)
+from ..planner.preference_memory import get_history_path
 
 
 @dataclass
@@ -17,6 +27,9 @@ class ModeDecision:
     reason: str                 # 人类可读解释
 
 
+_DECISION_CACHE: Dict[Tuple, ModeDecision] = {}
+
+
 def _normalize_mode(mode: str) -> str:
     m = (mode or "balance").strip().lower()
     if m not in {"rest", "balance", "focus"}:
@@ -84,3 +97,55 @@ def decide_day_mode(mood_mode: str, insights: PlannerInsights) -> ModeDecision:
             "可以在安排具体任务时稍微参考自我模型给出的标签完成率，避免把自己压得太满。"
         ),
     )
+
+
+def invalidate_mode_decision_cache() -> None:
+    """显式清空模式决策缓存（连同 mode_resolver 的情绪推断缓存）。"""
+    _DECISION_CACHE.clear()
+    invalidate_mode_cache()
+
+
+def resolve_day_mode_decision(
+    *,
+    preferred_mode: Optional[str] = None,
+    base_dir: Optional[Path] = None,
+    history_path: Optional[Path] = None,
+    tasks_path: Optional[Path] = None,
+    use_cache: bool = True,
+) -> ModeDecision:
+    """从 mood 文件 + planner 历史一步得到当天的 ModeDecision，并做缓存。
+
+    缓存 key 由所有输入文件的 (path, mtime, size) 组成：
+    data/mood 下的候选文件、planner_history.jsonl 和 tasks.jsonl。
+    输入没变时，重复调用不会再读取任何文件内容，也不会重新计算 insights。
+    """
+    if history_path is None:
+        history_path = get_history_path()
+    if tasks_path is None:
+        tasks_path = get_default_tasks_path()
+
+    key = (
+        str(base_dir),
+        preferred_mode,
+        mood_files_signature(base_dir),
+        file_signature(history_path),
+        file_signature(tasks_path),
+    )
+    if use_cache:
+        cached = _DECISION_CACHE.get(key)
+        if cached is not None:
+            return replace(cached)
+
+    mood_info = resolve_mode_from_mood_files(
+        preferred_mode=preferred_mode,
+        base_dir=base_dir,
+        use_cache=use_cache,
+    )
+    insights = load_planner_insights(history_path=history_path, tasks_path=tasks_path)
+    decision = decide_day_mode(mood_mode=mood_info.mode, insights=insights)
+
+    if use_cache:
+        if len(_DECISION_CACHE) >= MAX_CACHE_ENTRIES:
+            _DECISION_CACHE.clear()
+        _DECISION_CACHE[key] = replace(decision)
+    return decision
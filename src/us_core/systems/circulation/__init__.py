@@ -2,6 +2,7 @@
 
 包含：
 - buffers: 各类缓冲区和消息队列
+- concurrent: 缓冲区的线程安全 / asyncio 版本
 - core:    循环系统协调入口
 - api_client: 外部大模型 API 客户端封装
 """
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Deque, DefaultDict, Dict, List, Optional, Tuple
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 import heapq
+import time
 
 
 @dataclass
@@ -29,70 +31,461 @@ class PerceptionBuffer:
         self._buffer.clear()
         return items
 
+    def drain(self, max_items: Optional[int] = None) -> List[Any]:
+        """按 FIFO 取出最多 max_items 条（None 表示全部）。"""
+        if max_items is None or max_items >= len(self._buffer):
+            return self.pop_all()
+        popleft = self._buffer.popleft
+        return [popleft() for _ in range(max_items)]
+
     def __len__(self) -> int:  # pragma: no cover - 小函数
         return len(self._buffer)
 
 
-@dataclass(order=True)
-class _QueuedAction:
-    """内部使用的动作元素（基于 heapq）。"""
+# ActionQueue 的排序方式
+ORDER_PRIORITY = "priority"  # 先看（老化后的）优先级，同优先级截止时间早的先出
+ORDER_DEADLINE = "deadline"  # 最早截止时间优先（EDF），没有截止时间的排在最后
+ACTION_ORDERINGS = (ORDER_PRIORITY, ORDER_DEADLINE)
+
+_INF = float("inf")
+_REMOVED = object()  # 已取消 / 已改优先级的堆元素标记
+_UNCHANGED = object()  # reprioritize 的 deadline 默认值：保持原截止时间
 
-    priority: int
-    index: int
-    action: Any = field(compare=False)
-    metadata: Dict[str, Any] = field(default_factory=dict, compare=False)
+# 堆元素是一个 list：[主键, 次键, handle, action, metadata, deadline, 老化偏移]
+# handle 全局唯一，保证比较永远不会落到 action 上；同键时按入队顺序 FIFO。
+_ACTION, _METADATA, _DEADLINE, _AGE = 3, 4, 5, 6
 
 
 @dataclass
 class ActionQueue:
-    """运动输出缓冲区（优先级队列）。
+    """运动输出缓冲区（带索引的优先级队列）。
 
-    - priority 越小，优先级越高
-    - index 保证 FIFO 语义（同优先级按入队顺序）
+    - priority 越小，优先级越高；同优先级按入队顺序（FIFO）
+    - push 返回 handle，可用于 cancel / reprioritize（惰性删除，均摊 O(log N)）
+    - push_many 在批量较大时用 heapify 一次建堆
+    - aging_rate > 0 时启用优先级老化：有效优先级 = priority - aging_rate * 等待秒数。
+      所有元素按同一速率老化，等价于静态键 priority + aging_rate * 入队时间，
+      因此不需要重新建堆
+    - deadline（与 clock 同一时间基准）参与排序；drop_expired=True 时，
+      出队时跳过已过期的动作，最近 expired_capacity 个可通过 drain_expired() 取回
+      （更早的直接丢弃，避免没人取时无限增长），expired_count 记录累计过期数
     """
 
-    _heap: List[_QueuedAction] = field(default_factory=list, init=False)
+    aging_rate: float = 0.0
+    ordering: str = ORDER_PRIORITY
+    drop_expired: bool = True
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    expired_capacity: int = 256
+    expired_count: int = field(default=0, init=False)
+    _heap: List[list] = field(default_factory=list, init=False, repr=False)
+    _entries: Dict[int, list] = field(default_factory=dict, init=False, repr=False)
     _counter: int = field(default=0, init=False)
+    _dead: int = field(default=0, init=False)
+    _expired: Deque[Tuple[Any, Dict[str, Any]]] = field(init=False, repr=False)
+    _t0: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.ordering not in ACTION_ORDERINGS:
+            raise ValueError(f"ordering 必须是 {ACTION_ORDERINGS} 之一")
+        if self.aging_rate < 0:
+            raise ValueError("aging_rate must be >= 0")
+        if self.expired_capacity < 0:
+            raise ValueError("expired_capacity must be >= 0")
+        self._expired = deque(maxlen=self.expired_capacity)
+        self._t0 = self.clock()
 
-    def push(self, action: Any, priority: int = 0, metadata: Optional[Dict[str, Any]] = None) -> None:
+    def _age_offset(self) -> float:
+        return self.aging_rate * (self.clock() - self._t0) if self.aging_rate else 0.0
+
+    def _make_entry(
+        self,
+        handle: int,
+        action: Any,
+        priority: float,
+        metadata: Dict[str, Any],
+        deadline: Optional[float],
+        age: float,
+    ) -> list:
+        pkey = priority + age if age else priority
+        dkey = _INF if deadline is None else deadline
+        if self.ordering == ORDER_PRIORITY:
+            return [pkey, dkey, handle, action, metadata, deadline, age]
+        return [dkey, pkey, handle, action, metadata, deadline, age]
+
+    # ---------- 入队 ----------
+
+    def push(
+        self,
+        action: Any,
+        priority: int = 0,
+        metadata: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+    ) -> int:
         if metadata is None:
             metadata = {}
-        item = _QueuedAction(priority=priority, index=self._counter, action=action, metadata=metadata)
+        handle = self._counter
         self._counter += 1
-        heapq.heappush(self._heap, item)
+        entry = self._make_entry(handle, action, priority, metadata, deadline, self._age_offset())
+        self._entries[handle] = entry
+        heapq.heappush(self._heap, entry)
+        return handle
+
+    def push_many(self, items: Iterable[Sequence[Any]]) -> List[int]:
+        """批量入队。items 的每个元素是 (action, priority[, metadata[, deadline]])。
+
+        新元素相对现有堆足够多时直接 extend + heapify（O(N + M)），否则逐个 heappush。
+        """
+        age = self._age_offset()
+        first = self._counter
+        by_priority = self.ordering == ORDER_PRIORITY
+        new: List[list] = []
+        append = new.append
+        handle = first
+        for item in items:
+            n = len(item)
+            metadata = item[2] if n > 2 and item[2] is not None else {}
+            deadline = item[3] if n > 3 else None
+            pkey = item[1] + age if age else item[1]
+            dkey = _INF if deadline is None else deadline
+            if by_priority:
+                append([pkey, dkey, handle, item[0], metadata, deadline, age])
+            else:
+                append([dkey, pkey, handle, item[0], metadata, deadline, age])
+            handle += 1
+        self._counter = handle
+        self._entries.update(zip(range(first, handle), new))
+
+        heap = self._heap
+        total = len(heap) + len(new)
+        if len(new) * max(1, total.bit_length()) > total:
+            heap.extend(new)
+            heapq.heapify(heap)
+        else:
+            for entry in new:
+                heapq.heappush(heap, entry)
+        return list(range(first, self._counter))
+
+    # ---------- 取消 / 改优先级 ----------
+
+    def cancel(self, handle: int) -> bool:
+        """取消一个尚未出队的动作；handle 已出队 / 已取消时返回 False。"""
+        entry = self._entries.pop(handle, None)
+        if entry is None:
+            return False
+        self._kill(entry)
+        return True
+
+    def reprioritize(self, handle: int, priority: int, deadline: Any = _UNCHANGED) -> bool:
+        """修改优先级（可选同时修改 deadline，传 None 表示去掉截止时间）。
+
+        保留原 handle 与老化进度；同键时仍按原入队顺序。
+        """
+        old = self._entries.get(handle)
+        if old is None:
+            return False
+        if deadline is _UNCHANGED:
+            deadline = old[_DEADLINE]
+        entry = self._make_entry(handle, old[_ACTION], priority, old[_METADATA], deadline, old[_AGE])
+        self._entries[handle] = entry
+        heapq.heappush(self._heap, entry)
+        self._kill(old)
+        return True
+
+    def _kill(self, entry: list) -> None:
+        entry[_ACTION] = _REMOVED
+        entry[_METADATA] = None
+        self._dead += 1
+        # 墓碑超过一半时重建，保证堆大小是活元素的常数倍
+        if self._dead > 64 and self._dead * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if e[_ACTION] is not _REMOVED]
+            heapq.heapify(self._heap)
+            self._dead = 0
+
+    # ---------- 出队 ----------
+
+    def _pop_entry(self) -> Optional[list]:
+        heap = self._heap
+        now: Optional[float] = None
+        while heap:
+            entry = heapq.heappop(heap)
+            if entry[_ACTION] is _REMOVED:
+                self._dead -= 1
+                continue
+            del self._entries[entry[2]]
+            deadline = entry[_DEADLINE]
+            if deadline is not None and self.drop_expired:
+                if now is None:
+                    now = self.clock()
+                if deadline < now:
+                    self.expired_count += 1
+                    self._expired.append((entry[_ACTION], entry[_METADATA]))
+                    continue
+            return entry
+        return None
 
     def pop_next(self) -> Optional[Tuple[Any, Dict[str, Any]]]:
-        if not self._heap:
+        entry = self._pop_entry()
+        if entry is None:
+            return None
+        return entry[_ACTION], entry[_METADATA]
+
+    def peek(self) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """查看下一个会出队的动作（不考虑过期）。"""
+        heap = self._heap
+        while heap and heap[0][_ACTION] is _REMOVED:
+            heapq.heappop(heap)
+            self._dead -= 1
+        if not heap:
             return None
-        item = heapq.heappop(self._heap)
-        return item.action, item.metadata
+        return heap[0][_ACTION], heap[0][_METADATA]
+
+    def drain(self, max_items: Optional[int] = None) -> List[Tuple[Any, Dict[str, Any]]]:
+        """按优先级依次取出最多 max_items 个 (action, metadata)。"""
+        results: List[Tuple[Any, Dict[str, Any]]] = []
+        while max_items is None or len(results) < max_items:
+            entry = self._pop_entry()
+            if entry is None:
+                break
+            results.append((entry[_ACTION], entry[_METADATA]))
+        return results
+
+    def drain_expired(self) -> List[Tuple[Any, Dict[str, Any]]]:
+        """取出因过期而被跳过的动作（最多保留最近 expired_capacity 个）。"""
+        expired = list(self._expired)
+        self._expired.clear()
+        return expired
+
+    def __contains__(self, handle: object) -> bool:
+        return handle in self._entries
 
     def __len__(self) -> int:  # pragma: no cover
-        return len(self._heap)
+        return len(self._entries)
+
+
+# MessageBus 的溢出策略
+DROP_OLDEST = "drop_oldest"  # 覆盖最旧的消息，落后的订阅者记一次丢失
+DROP_NEWEST = "drop_newest"  # 拒绝新消息并计数
+BLOCK = "block"  # 等待最慢的订阅者腾出空间（单线程总线上无法等待，等同于拒绝）
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+_WILDCARD_CHARS = frozenset("*?[")
+
+
+class BusMessage(NamedTuple):
+    """订阅者读到的一条消息。seq 是全总线递增的发布序号，用于跨 topic 排序。"""
+
+    seq: int
+    topic: str
+    message: Any
+
+
+@dataclass
+class _TopicRing:
+    """单个 topic 的环形缓冲：序号 s 的消息存放在 slots[s % capacity]。"""
+
+    capacity: int
+    overflow: str
+    slots: List[Optional[BusMessage]] = field(init=False, repr=False)
+    next_seq: int = 0  # topic 内下一条消息的序号
+    published: int = 0
+    rejected: int = 0  # DROP_NEWEST / BLOCK 拒绝的消息数
+    default_cursor: int = 0  # get_messages() 兼容接口使用的读指针
+
+    def __post_init__(self) -> None:
+        self.slots = [None] * self.capacity
+
+    @property
+    def head(self) -> int:
+        """仍保留在缓冲中的最旧消息序号。"""
+        return max(0, self.next_seq - self.capacity)
+
+    def read(self, start: int, end: int) -> List[BusMessage]:
+        cap = self.capacity
+        return [self.slots[s % cap] for s in range(start, end)]  # type: ignore[misc]
+
+
+@dataclass
+class Subscription:
+    """一个订阅者：pattern 支持 fnmatch 通配符（例如 "perception.*"、"*"）。
+
+    cursors 记录在每个匹配 topic 上的读位置；dropped 为因覆盖而错过的消息数。
+    """
+
+    name: str
+    pattern: str
+    cursors: Dict[str, int] = field(default_factory=dict)
+    dropped: int = 0
+
+    @property
+    def is_wildcard(self) -> bool:
+        return not _WILDCARD_CHARS.isdisjoint(self.pattern)
+
+    def matches(self, topic: str) -> bool:
+        if self.is_wildcard:
+            return fnmatchcase(topic, self.pattern)
+        return topic == self.pattern
 
 
 @dataclass
 class MessageBus:
-    """内部消息总线（发布-订阅风格的消息队列）。
+    """内部消息总线（发布-订阅）。
 
-    简化版本：
-    - 按 topic 存放消息列表
-    - 任何组件可以 publish(topic, message)
-    - 消费者通过 get_messages(topic) 取出并（可选）清空
+    - 每个 topic 一个固定容量的环形缓冲，内存有上界；
+    - 订阅者各自维护读指针（cursor），同一条消息可以被多个订阅者读到，
+      消息对象本身只存一份；
+    - 溢出策略见 OVERFLOW_POLICIES，可以按 topic 单独配置；
+    - get_messages(topic, clear) 保留旧接口语义：使用一个内置的默认读指针，
+      它不参与背压（BLOCK / DROP_NEWEST 只看显式订阅者）。
     """
 
-    _topics: DefaultDict[str, List[Any]] = field(
-        default_factory=lambda: defaultdict(list), init=False
-    )
+    capacity: int = 1024
+    overflow: str = DROP_OLDEST
+    _topics: Dict[str, _TopicRing] = field(default_factory=dict, init=False)
+    _subscriptions: Dict[str, Subscription] = field(default_factory=dict, init=False)
+    _topic_overrides: Dict[str, Tuple[int, str]] = field(default_factory=dict, init=False)
+    _seq: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        if self.capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow 必须是 {OVERFLOW_POLICIES} 之一")
+
+    # ---------- topic / 订阅管理 ----------
 
-    def publish(self, topic: str, message: Any) -> None:
-        self._topics[topic].append(message)
+    def configure_topic(self, topic: str, capacity: Optional[int] = None, overflow: Optional[str] = None) -> None:
+        """为某个 topic 单独设置容量 / 溢出策略（需在该 topic 第一次发布之前调用）。"""
+        if topic in self._topics:
+            raise ValueError(f"topic {topic!r} 已经创建，无法再修改配置")
+        cap = self.capacity if capacity is None else capacity
+        policy = self.overflow if overflow is None else overflow
+        if cap <= 0:
+            raise ValueError("capacity must be > 0")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow 必须是 {OVERFLOW_POLICIES} 之一")
+        self._topic_overrides[topic] = (cap, policy)
+
+    def _ring(self, topic: str) -> _TopicRing:
+        ring = self._topics.get(topic)
+        if ring is None:
+            cap, policy = self._topic_overrides.get(topic, (self.capacity, self.overflow))
+            ring = _TopicRing(capacity=cap, overflow=policy)
+            self._topics[topic] = ring
+            # 已有的通配订阅从新 topic 的第一条消息开始读
+            for sub in self._subscriptions.values():
+                if sub.matches(topic):
+                    sub.cursors[topic] = 0
+        return ring
+
+    def subscribe(self, name: str, pattern: str = "*", *, from_start: bool = False) -> Subscription:
+        """注册订阅者。默认只读订阅之后发布的消息；from_start=True 时从缓冲中最旧的消息开始。"""
+        if name in self._subscriptions:
+            raise ValueError(f"订阅者 {name!r} 已存在")
+        sub = Subscription(name=name, pattern=pattern)
+        for topic, ring in self._topics.items():
+            if sub.matches(topic):
+                sub.cursors[topic] = ring.head if from_start else ring.next_seq
+        self._subscriptions[name] = sub
+        return sub
+
+    def unsubscribe(self, name: str) -> None:
+        self._subscriptions.pop(name, None)
+
+    def subscription(self, name: str) -> Subscription:
+        try:
+            return self._subscriptions[name]
+        except KeyError:
+            raise KeyError(f"未知订阅者: {name!r}") from None
+
+    # ---------- 发布 ----------
+
+    def _slowest_cursor(self, topic: str) -> Optional[int]:
+        cursors = [sub.cursors[topic] for sub in self._subscriptions.values() if topic in sub.cursors]
+        return min(cursors) if cursors else None
+
+    def _is_full(self, topic: str, ring: _TopicRing) -> bool:
+        """对 DROP_NEWEST / BLOCK：最慢的订阅者已经落后满一个缓冲区。"""
+        slowest = self._slowest_cursor(topic)
+        return slowest is not None and ring.next_seq - slowest >= ring.capacity
+
+    def publish(self, topic: str, message: Any) -> bool:
+        """发布一条消息。被溢出策略拒绝时返回 False。"""
+        ring = self._ring(topic)
+        if ring.overflow != DROP_OLDEST and self._is_full(topic, ring):
+            ring.rejected += 1
+            return False
+        self._write(topic, ring, message)
+        return True
+
+    def _write(self, topic: str, ring: _TopicRing, message: Any) -> None:
+        ring.slots[ring.next_seq % ring.capacity] = BusMessage(self._seq, topic, message)
+        ring.next_seq += 1
+        ring.published += 1
+        self._seq += 1
+
+    # ---------- 读取 ----------
+
+    def poll(self, name: str, max_items: Optional[int] = None) -> List[BusMessage]:
+        """读取订阅者尚未读过的消息（跨 topic 按发布顺序），并推进它的读指针。"""
+        sub = self.subscription(name)
+        batches: List[List[BusMessage]] = []
+        for topic, cursor in sub.cursors.items():
+            ring = self._topics[topic]
+            head = ring.head
+            if cursor < head:
+                # 被 DROP_OLDEST 覆盖掉的部分
+                sub.dropped += head - cursor
+                cursor = head
+            if cursor < ring.next_seq:
+                end = ring.next_seq if max_items is None else min(ring.next_seq, cursor + max_items)
+                batches.append(ring.read(cursor, end))
+            sub.cursors[topic] = cursor
+
+        if not batches:
+            return []
+        if len(batches) == 1:
+            merged = batches[0]
+        else:
+            merged = list(heapq.merge(*batches))
+        if max_items is not None:
+            merged = merged[:max_items]
+
+        # 只推进真正交付出去的部分
+        for msg in merged:
+            sub.cursors[msg.topic] += 1
+        return merged
+
+    def pending(self, name: str) -> int:
+        """订阅者还有多少条未读消息（不含已被覆盖的）。"""
+        sub = self.subscription(name)
+        total = 0
+        for topic, cursor in sub.cursors.items():
+            ring = self._topics[topic]
+            total += ring.next_seq - max(cursor, ring.head)
+        return total
 
     def get_messages(self, topic: str, clear: bool = True) -> List[Any]:
-        msgs = list(self._topics.get(topic, []))
-        if clear and topic in self._topics:
-            self._topics[topic].clear()
+        """兼容旧接口：返回该 topic 上默认读指针之后的全部消息，clear=True 时推进读指针。"""
+        ring = self._topics.get(topic)
+        if ring is None:
+            return []
+        start = max(ring.default_cursor, ring.head)
+        msgs = [m.message for m in ring.read(start, ring.next_seq)]
+        if clear:
+            ring.default_cursor = ring.next_seq
         return msgs
 
     def topics(self) -> List[str]:  # pragma: no cover - 用于调试
         return list(self._topics.keys())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """每个 topic 的发布 / 拒绝 / 当前保留条数。"""
+        return {
+            topic: {
+                "published": ring.published,
+                "rejected": ring.rejected,
+                "retained": ring.next_seq - ring.head,
+                "capacity": ring.capacity,
+            }
+            for topic, ring in self._topics.items()
+        }
@@ -0,0 +1,315 @@
+"""循环系统缓冲区的并发版本。
+
+- ThreadSafe*: 基于 threading.Condition，可以由感知线程写入、心跳线程读取；
+  get / get_batch 支持阻塞等待（timeout 秒，None 表示一直等）。
+- Async*: 单个事件循环内使用，get / get_batch 是协程，语义类似 asyncio.Queue；
+  其他线程写入时使用 push_threadsafe(loop, ...)。
+
+所有版本都保留基类的同步非阻塞接口（push / pop_all / pop_next / drain），
+因此可以直接塞进 CirculationSystem。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .buffers import BLOCK, ActionQueue, BusMessage, MessageBus, PerceptionBuffer, Subscription
+
+
+# ========= 线程版本 =========
+
+
+@dataclass
+class ThreadSafePerceptionBuffer(PerceptionBuffer):
+    """线程安全的感知缓冲区。"""
+
+    _cond: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False)
+
+    def push(self, item: Any) -> None:
+        with self._cond:
+            super().push(item)
+            self._cond.notify()
+
+    def pop_all(self) -> List[Any]:
+        with self._cond:
+            return super().pop_all()
+
+    def drain(self, max_items: Optional[int] = None) -> List[Any]:
+        with self._cond:
+            return super().drain(max_items)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """阻塞取出一条；超时返回 None。"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._buffer) > 0, timeout):
+                return None
+            return self._buffer.popleft()
+
+    def get_batch(self, max_items: Optional[int] = None, timeout: Optional[float] = None) -> List[Any]:
+        """至少等到一条数据后批量取出（最多 max_items 条）；超时返回 []。"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._buffer) > 0, timeout):
+                return []
+            return super().drain(max_items)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._buffer)
+
+
+@dataclass
+class ThreadSafeActionQueue(ActionQueue):
+    """线程安全的动作优先级队列。"""
+
+    _cond: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False)
+
+    def push(
+        self,
+        action: Any,
+        priority: int = 0,
+        metadata: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+    ) -> int:
+        with self._cond:
+            handle = super().push(action, priority=priority, metadata=metadata, deadline=deadline)
+            self._cond.notify()
+            return handle
+
+    def push_many(self, items: Iterable[Sequence[Any]]) -> List[int]:
+        with self._cond:
+            handles = super().push_many(items)
+            self._cond.notify_all()
+            return handles
+
+    def cancel(self, handle: int) -> bool:
+        with self._cond:
+            return super().cancel(handle)
+
+    def reprioritize(self, handle: int, priority: int, *args: Any, **kwargs: Any) -> bool:
+        with self._cond:
+            return super().reprioritize(handle, priority, *args, **kwargs)
+
+    def pop_next(self) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        with self._cond:
+            return super().pop_next()
+
+    def peek(self) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        with self._cond:
+            return super().peek()
+
+    def drain_expired(self) -> List[Tuple[Any, Dict[str, Any]]]:
+        with self._cond:
+            return super().drain_expired()
+
+    def drain(self, max_items: Optional[int] = None) -> List[Tuple[Any, Dict[str, Any]]]:
+        with self._cond:
+            return super().drain(max_items)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """阻塞取出优先级最高的动作；超时返回 None。"""
+        # 队列里可能只剩过期动作，因此等到真正取到一个为止
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not self._cond.wait_for(lambda: len(self._entries) > 0, remaining):
+                    return None
+                item = super().pop_next()
+                if item is not None:
+                    return item
+
+    def get_batch(
+        self, max_items: Optional[int] = None, timeout: Optional[float] = None
+    ) -> List[Tuple[Any, Dict[str, Any]]]:
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._entries) > 0, timeout):
+                return []
+            return super().drain(max_items)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+
+@dataclass
+class ThreadSafeMessageBus(MessageBus):
+    """线程安全的消息总线。
+
+    BLOCK 策略在这里是真正的阻塞：publish 等待最慢的订阅者 poll 腾出空间，
+    timeout 到期仍然满则拒绝（返回 False，计入 stats 的 rejected）。
+    不传 timeout 时最多等 block_timeout 秒，避免一个不再 poll 的订阅者把发布方
+    （通常是心跳线程）永远卡住；block_timeout=None 表示一直等。
+    """
+
+    block_timeout: Optional[float] = 1.0
+    _cond: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False)
+
+    def configure_topic(self, topic: str, capacity: Optional[int] = None, overflow: Optional[str] = None) -> None:
+        with self._cond:
+            super().configure_topic(topic, capacity, overflow)
+
+    def subscribe(self, name: str, pattern: str = "*", *, from_start: bool = False) -> Subscription:
+        with self._cond:
+            return super().subscribe(name, pattern, from_start=from_start)
+
+    def unsubscribe(self, name: str) -> None:
+        with self._cond:
+            super().unsubscribe(name)
+            self._cond.notify_all()
+
+    def publish(self, topic: str, message: Any, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            ring = self._ring(topic)
+            if ring.overflow != BLOCK:
+                return super().publish(topic, message)
+            if timeout is None:
+                timeout = self.block_timeout
+            if not self._cond.wait_for(lambda: not self._is_full(topic, ring), timeout):
+                ring.rejected += 1
+                return False
+            self._write(topic, ring, message)
+            return True
+
+    def poll(self, name: str, max_items: Optional[int] = None) -> List[BusMessage]:
+        with self._cond:
+            msgs = super().poll(name, max_items)
+            if msgs:
+                self._cond.notify_all()
+            return msgs
+
+    def pending(self, name: str) -> int:
+        with self._cond:
+            return super().pending(name)
+
+    def get_messages(self, topic: str, clear: bool = True) -> List[Any]:
+        with self._cond:
+            return super().get_messages(topic, clear)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._cond:
+            return super().stats()
+
+
+# ========= asyncio 版本 =========
+
+
+class _Waiters:
+    """等待中的协程（与 asyncio.Queue 内部做法相同：每个等待者一个 future）。"""
+
+    def __init__(self) -> None:
+        self._futures: Deque[asyncio.Future] = deque()
+
+    def wake_one(self) -> None:
+        while self._futures:
+            fut = self._futures.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+
+    async def wait(self) -> None:
+        fut = asyncio.get_running_loop().create_future()
+        self._futures.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # 已被唤醒但又被取消：把唤醒让给下一个等待者，避免数据没人取
+            if fut.done() and not fut.cancelled():
+                self.wake_one()
+            else:
+                try:
+                    self._futures.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+
+@dataclass
+class AsyncPerceptionBuffer(PerceptionBuffer):
+    """协程版感知缓冲区：await get() / await get_batch()。"""
+
+    _waiters: _Waiters = field(default_factory=_Waiters, init=False, repr=False)
+
+    def push(self, item: Any) -> None:
+        super().push(item)
+        self._waiters.wake_one()
+
+    def push_threadsafe(self, loop: asyncio.AbstractEventLoop, item: Any) -> None:
+        """从事件循环之外的线程写入。"""
+        loop.call_soon_threadsafe(self.push, item)
+
+    async def get(self) -> Any:
+        while not self._buffer:
+            await self._waiters.wait()
+        item = self._buffer.popleft()
+        if self._buffer:
+            self._waiters.wake_one()
+        return item
+
+    async def get_batch(self, max_items: Optional[int] = None) -> List[Any]:
+        while not self._buffer:
+            await self._waiters.wait()
+        items = self.drain(max_items)
+        if self._buffer:
+            self._waiters.wake_one()
+        return items
+
+
+@dataclass
+class AsyncActionQueue(ActionQueue):
+    """协程版动作队列：await get() / await get_batch() 等到有动作为止。
+
+    pop_next() / drain() 保持基类的同步非阻塞语义。
+    """
+
+    _waiters: _Waiters = field(default_factory=_Waiters, init=False, repr=False)
+
+    def push(
+        self,
+        action: Any,
+        priority: int = 0,
+        metadata: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+    ) -> int:
+        handle = super().push(action, priority=priority, metadata=metadata, deadline=deadline)
+        self._waiters.wake_one()
+        return handle
+
+    def push_many(self, items: Iterable[Sequence[Any]]) -> List[int]:
+        handles = super().push_many(items)
+        if handles:
+            self._waiters.wake_one()  # 被唤醒的消费者取完后若还有剩余会继续唤醒下一个
+        return handles
+
+    def push_threadsafe(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        action: Any,
+        priority: int = 0,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        loop.call_soon_threadsafe(lambda: self.push(action, priority=priority, metadata=metadata))
+
+    async def get(self) -> Tuple[Any, Dict[str, Any]]:
+        while True:
+            while not self._entries:
+                await self._waiters.wait()
+            item = self.pop_next()
+            if self._entries:
+                self._waiters.wake_one()
+            if item is not None:  # 取到的全是过期动作时继续等
+                return item
+
+    async def get_batch(self, max_items: Optional[int] = None) -> List[Tuple[Any, Dict[str, Any]]]:
+        while True:
+            while not self._entries:
+                await self._waiters.wait()
+            items = self.drain(max_items)
+            if self._entries:
+                self._waiters.wake_one()
+            if items:
+                return items
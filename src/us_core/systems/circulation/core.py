@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
-from .buffers import PerceptionBuffer, ActionQueue, MessageBus
+from .buffers import BusMessage, PerceptionBuffer, ActionQueue, MessageBus, Subscription
+from .concurrent import ThreadSafeActionQueue, ThreadSafeMessageBus, ThreadSafePerceptionBuffer
 from .api_client import ModelApiClient, ChatMessage
 
 
@@ -23,6 +24,16 @@ class CirculationSystem:
     message_bus: MessageBus = field(default_factory=MessageBus)
     model_client: Optional[ModelApiClient] = None
 
+    @classmethod
+    def thread_safe(cls, model_client: Optional[ModelApiClient] = None) -> "CirculationSystem":
+        """使用线程安全缓冲区构造：感知线程写入，心跳线程读取。"""
+        return cls(
+            perception_buffer=ThreadSafePerceptionBuffer(),
+            action_queue=ThreadSafeActionQueue(),
+            message_bus=ThreadSafeMessageBus(),
+            model_client=model_client,
+        )
+
     # ========= 感官相关 =========
 
     def ingest_perception(self, perception: Dict[str, Any]) -> None:
@@ -32,7 +43,7 @@ class CirculationSystem:
 
     def drain_perceptions(self) -> List[Dict[str, Any]]:
         """取出并清空感知缓冲区。"""
-        return self.perception_buffer.pop_all()
+        return self.perception_buffer.drain()
 
     # ========= 动作相关 =========
 
@@ -41,21 +52,25 @@ class CirculationSystem:
         action: Dict[str, Any],
         priority: int = 0,
         metadata: Optional[Dict[str, Any]] = None,
-    ) -> None:
-        """将动作放入优先级队列，并在消息总线上广播。"""
-        self.action_queue.push(action, priority=priority, metadata=metadata or {})
-        self.message_bus.publish("action_queued", {"action": action, "priority": priority})
+        deadline: Optional[float] = None,
+    ) -> int:
+        """将动作放入优先级队列，并在消息总线上广播。返回可用于取消 / 改优先级的 handle。"""
+        handle = self.action_queue.push(action, priority=priority, metadata=metadata or {}, deadline=deadline)
+        self.message_bus.publish("action_queued", {"action": action, "priority": priority, "handle": handle})
+        return handle
+
+    def cancel_action(self, handle: int) -> bool:
+        """取消一个尚未执行的动作。"""
+        return self.action_queue.cancel(handle)
+
+    def reprioritize_action(self, handle: int, priority: int) -> bool:
+        """修改尚未执行动作的优先级。"""
+        return self.action_queue.reprioritize(handle, priority)
 
     def get_actions_to_execute(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """按优先级依次取出待执行动作。"""
-        results: List[Dict[str, Any]] = []
-        while len(self.action_queue) > 0 and (limit is None or len(results) < limit):
-            popped = self.action_queue.pop_next()
-            if popped is None:
-                break
-            action, _meta = popped
-            results.append(action)
-        return results
+        # drain 在并发版本中是原子操作，不会出现 len() 与 pop 之间被别的线程取走的情况
+        return [action for action, _meta in self.action_queue.drain(limit)]
 
     # ========= 消息广播 =========
 
@@ -63,6 +78,14 @@ class CirculationSystem:
         """向任意 topic 广播消息。"""
         self.message_bus.publish(topic, payload)
 
+    def subscribe(self, name: str, pattern: str = "*", from_start: bool = False) -> Subscription:
+        """为某个下游系统注册订阅（支持通配符），各订阅者独立读取同一份消息。"""
+        return self.message_bus.subscribe(name, pattern, from_start=from_start)
+
+    def poll_messages(self, name: str, max_items: Optional[int] = None) -> List[BusMessage]:
+        """读取订阅者 name 的未读消息。"""
+        return self.message_bus.poll(name, max_items=max_items)
+
     # ========= 外部模型调用 =========
 
     def ask_model(self, messages: List[ChatMessage]) -> Optional[str]:
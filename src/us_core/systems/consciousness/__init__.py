@@ -3,12 +3,30 @@
 This package provides:
 - GlobalWorkspaceSystem: competition & selection of conscious content
 - Attention* helpers: filtering, allocation and monitoring of attention
+  (AttentionHistory: ring-buffered history with windowed statistics)
 - BroadcastSystem: fan-out of conscious content to subscribers
+  (sync, or threaded with per-subscriber bounded backlogs)
 """
 
 from .global_workspace import GlobalWorkspaceSystem, WorkspaceItem
-from .attention import AttentionFilter, AttentionAllocator, AttentionMonitor, AttentionSnapshot
-from .broadcast import BroadcastSystem
+from .attention import (
+    AttentionAllocator,
+    AttentionFilter,
+    AttentionHistory,
+    AttentionMonitor,
+    AttentionSnapshot,
+    allocation_entropy,
+)
+from .broadcast import (
+    BACKLOG_POLICIES,
+    DELIVERY_MODES,
+    DELIVERY_SYNC,
+    DELIVERY_THREADED,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    LATEST_ONLY,
+    BroadcastSystem,
+)
 
 __all__ = [
     "GlobalWorkspaceSystem",
@@ -16,6 +34,15 @@ __all__ = [
     "AttentionFilter",
     "AttentionAllocator",
     "AttentionMonitor",
+    "AttentionHistory",
     "AttentionSnapshot",
+    "allocation_entropy",
     "BroadcastSystem",
+    "DELIVERY_MODES",
+    "DELIVERY_SYNC",
+    "DELIVERY_THREADED",
+    "BACKLOG_POLICIES",
+    "DROP_OLDEST",
+    "DROP_NEWEST",
+    "LATEST_ONLY",
 ]
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
 
 
 @dataclass
@@ -11,6 +14,26 @@ class AttentionSnapshot:
     scores: Dict[str, float]
 
 
+def _normalize(values: np.ndarray) -> np.ndarray:
+    """Scale values to sum to 1.0; fall back to a uniform split when total <= 0."""
+    if values.size == 0:
+        return values
+    total = float(values.sum())
+    if total <= 0.0:
+        # fallback:均分
+        return np.full(values.shape, 1.0 / values.size)
+    return values / total
+
+
+def allocation_entropy(allocation: Any) -> float:
+    """Shannon entropy (bits) of an allocation that sums to 1.0."""
+    p = np.asarray(allocation, dtype=np.float64)
+    p = p[p > 0.0]
+    if p.size == 0:
+        return 0.0
+    return float(-(p * np.log2(p)).sum())
+
+
 class AttentionFilter:
     """Filter out low-relevance candidates."""
 
@@ -25,6 +48,10 @@ class AttentionFilter:
             if float(score) >= self.min_relevance
         }
 
+    def mask(self, values: Any) -> np.ndarray:
+        """Boolean mask over an array of scores (array counterpart of `filter`)."""
+        return np.asarray(values, dtype=np.float64) >= self.min_relevance
+
 
 class AttentionAllocator:
     """Normalize attention weights so they sum to 1.0."""
@@ -32,31 +59,240 @@ class AttentionAllocator:
     def allocate(self, candidates: Dict[str, float]) -> Dict[str, float]:
         if not candidates:
             return {}
+        values = np.fromiter((float(v) for v in candidates.values()), dtype=np.float64, count=len(candidates))
+        return dict(zip(candidates.keys(), _normalize(values).tolist()))
+
+    def allocate_array(self, values: Any) -> np.ndarray:
+        """Array counterpart of `allocate`, without building dicts."""
+        return _normalize(np.asarray(values, dtype=np.float64))
+
+
+class AttentionHistory:
+    """Fixed-capacity ring buffer of attention records, exposed as channels × time.
+
+    Channels are registered on first sight; a channel absent from a record
+    is stored as NaN. Each record is normalized once on append and kept only
+    in sparse form (channel rows, raw scores, allocations, entropy); the dense
+    (channels, time) view is built on demand by `to_array`. Sums over the last
+    `window` records are kept incrementally, so moving averages and entropy
+    cost O(channels) per update regardless of capacity. Absent channels count
+    as 0 in the averages.
+
+    Channel names (and their two window sums) are never reclaimed while
+    records are being appended, even after a channel has dropped out of the
+    buffer; `clear()` forgets them. With capacity 0 nothing is retained and
+    only `total_records` advances.
+    """
+
+    def __init__(self, capacity: int = 100, window: Optional[int] = None) -> None:
+        self.capacity = int(capacity)
+        if self.capacity < 0:
+            raise ValueError("capacity must be >= 0")
+        self.window = self.capacity if window is None else int(window)
+        if self.capacity and not 1 <= self.window <= self.capacity:
+            raise ValueError("window must be in [1, capacity]")
+        if not self.capacity and self.window:
+            raise ValueError("window must be 0 when capacity is 0")
+
+        self._channels: List[str] = []
+        self._index: Dict[str, int] = {}
+        # 每个槽位的 (行号, 原始分数, 分配比例, 熵)，出窗时按稀疏记录扣减
+        self._records: List[Optional[Tuple[List[int], List[float], List[float], float]]] = [None] * self.capacity
+        self._score_sum: List[float] = []
+        self._alloc_sum: List[float] = []
+        self._entropy_sum = 0.0
+        self._pos = 0
+        self._size = 0
+        self._count = 0
+
+    # ---------- 写入 ----------
+
+    def _row(self, channel: str) -> int:
+        row = self._index.get(channel)
+        if row is None:
+            row = len(self._channels)
+            self._index[channel] = row
+            self._channels.append(channel)
+            self._score_sum.append(0.0)
+            self._alloc_sum.append(0.0)
+        return row
+
+    def append(self, scores: Mapping[str, float]) -> None:
+        self._count += 1
+        if not self.capacity:
+            return
+        rows = [self._row(k) for k in scores]
+        values = [float(v) for v in scores.values()]
+        total = sum(values)
+        if not values:
+            alloc: List[float] = []
+        elif total <= 0.0:
+            alloc = [1.0 / len(values)] * len(values)
+        else:
+            alloc = [v / total for v in values]
+        entropy = -sum(p * math.log2(p) for p in alloc if p > 0.0)
+
+        score_sum, alloc_sum = self._score_sum, self._alloc_sum
+        pos = self._pos
+        if self._size >= self.window:
+            # 移出窗口的那一拍
+            old = (pos - self.window) % self.capacity
+            old_rows, old_values, old_alloc, old_entropy = self._records[old]  # type: ignore[misc]
+            for r, v, a in zip(old_rows, old_values, old_alloc):
+                score_sum[r] -= v
+                alloc_sum[r] -= a
+            self._entropy_sum -= old_entropy
+
+        for r, v, a in zip(rows, values, alloc):
+            score_sum[r] += v
+            alloc_sum[r] += a
+        self._entropy_sum += entropy
+        self._records[pos] = (rows, values, alloc, entropy)
+
+        self._pos = (pos + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        if self._count % self.capacity == 0:
+            # 每绕一圈重算一次窗口和，消除浮点累积误差（摊还 O(1)）
+            self._resync()
+
+    def _window_slots(self) -> List[int]:
+        n = min(self._size, self.window)
+        return [(self._pos - k) % self.capacity for k in range(n, 0, -1)]
+
+    def _resync(self) -> None:
+        score_sum = [0.0] * len(self._channels)
+        alloc_sum = [0.0] * len(self._channels)
+        entropy_sum = 0.0
+        for slot in self._window_slots():
+            rows, values, alloc, entropy = self._records[slot]  # type: ignore[misc]
+            for r, v, a in zip(rows, values, alloc):
+                score_sum[r] += v
+                alloc_sum[r] += a
+            entropy_sum += entropy
+        self._score_sum, self._alloc_sum, self._entropy_sum = score_sum, alloc_sum, entropy_sum
+
+    def clear(self) -> None:
+        """Drop all records and forget registered channels."""
+        self._channels = []
+        self._index = {}
+        self._records = [None] * self.capacity
+        self._score_sum = []
+        self._alloc_sum = []
+        self._entropy_sum = 0.0
+        self._pos = self._size = self._count = 0
+
+    # ---------- 读取 ----------
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def total_records(self) -> int:
+        """Records appended since creation (including evicted ones)."""
+        return self._count
+
+    @property
+    def channels(self) -> List[str]:
+        return list(self._channels)
+
+    def _ordered_slots(self) -> List[int]:
+        if self._size < self.capacity:
+            return list(range(self._size))
+        return [(self._pos + k) % self.capacity for k in range(self.capacity)]
+
+    def to_array(self, allocation: bool = False) -> np.ndarray:
+        """History as a new (channels, time) array, oldest first.
+
+        Raw scores use NaN for absent channels; allocations use 0.
+        """
+        slots = self._ordered_slots()
+        shape = (len(self._channels), len(slots))
+        out = np.zeros(shape) if allocation else np.full(shape, np.nan)
+        for t, slot in enumerate(slots):
+            rows, values, alloc, _ = self._records[slot]  # type: ignore[misc]
+            out[rows, t] = alloc if allocation else values
+        return out
+
+    def snapshots(self) -> List[Dict[str, float]]:
+        """Reconstruct each record as a {channel: score} dict, oldest first."""
+        names = self._channels
+        out: List[Dict[str, float]] = []
+        for slot in self._ordered_slots():
+            rows, values, _, _ = self._records[slot]  # type: ignore[misc]
+            out.append({names[r]: v for r, v in zip(rows, values)})
+        return out
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        if self._size == 0:
+            return None
+        rows, values, _, _ = self._records[(self._pos - 1) % self.capacity]  # type: ignore[misc]
+        return {self._channels[r]: v for r, v in zip(rows, values)}
+
+    def moving_average(self, allocation: bool = False) -> Dict[str, float]:
+        """Per-channel mean over the last `window` records."""
+        n = min(self._size, self.window)
+        if n == 0:
+            return {}
+        sums = self._alloc_sum if allocation else self._score_sum
+        return {name: total / n for name, total in zip(self._channels, sums)}
+
+    def latest_entropy(self) -> float:
+        if self._size == 0:
+            return 0.0
+        return self._records[(self._pos - 1) % self.capacity][3]  # type: ignore[index]
 
-        values = {k: float(v) for k, v in candidates.items()}
-        total = sum(values.values())
-        if total <= 0.0:
-            # fallback:均分
-            n = len(values)
-            return {k: 1.0 / n for k in values.keys()}
+    def mean_entropy(self) -> float:
+        """Mean per-record allocation entropy (bits) over the window."""
+        n = min(self._size, self.window)
+        return self._entropy_sum / n if n else 0.0
 
-        return {k: v / total for k, v in values.items()}
+    def window_entropy(self) -> float:
+        """Entropy (bits) of the window-averaged allocation."""
+        n = min(self._size, self.window)
+        if n == 0:
+            return 0.0
+        return allocation_entropy([total / n for total in self._alloc_sum])
 
 
 class AttentionMonitor:
-    """Keep a short history of attention allocations for introspection."""
+    """Keep a short history of attention allocations for introspection.
 
-    def __init__(self, max_history: int = 100) -> None:
+    max_history=0 keeps no history (records are only counted).
+    """
+
+    def __init__(self, max_history: int = 100, window: Optional[int] = None) -> None:
         self.max_history = int(max_history)
-        self._history: List[AttentionSnapshot] = []
+        self._history = AttentionHistory(capacity=self.max_history, window=window)
 
     def record(self, scores: Dict[str, float]) -> None:
-        snapshot = AttentionSnapshot(scores={k: float(v) for k, v in scores.items()})
-        self._history.append(snapshot)
-        if len(self._history) > self.max_history:
-            self._history = self._history[-self.max_history :]
+        self._history.append(scores)
 
     @property
     def history(self) -> List[AttentionSnapshot]:
-        # 返回拷贝，避免外部修改内部列表
-        return list(self._history)
+        # 每次按需重建快照，外部修改不会影响内部缓冲
+        return [AttentionSnapshot(scores=s) for s in self._history.snapshots()]
+
+    @property
+    def buffer(self) -> AttentionHistory:
+        return self._history
+
+    def moving_average(self, allocation: bool = True) -> Dict[str, float]:
+        return self._history.moving_average(allocation=allocation)
+
+    def entropy(self) -> float:
+        """Allocation entropy (bits) of the most recent record."""
+        return self._history.latest_entropy()
+
+    def stats(self) -> Dict[str, Any]:
+        h = self._history
+        return {
+            "records": len(h),
+            "total_records": h.total_records,
+            "window": h.window,
+            "channels": h.channels,
+            "moving_average": h.moving_average(allocation=True),
+            "latest_entropy": h.latest_entropy(),
+            "mean_entropy": h.mean_entropy(),
+            "window_entropy": h.window_entropy(),
+        }
@@ -1,33 +1,289 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Mapping
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Mapping, Optional, Tuple
+
+from us_core.utils.monitoring import latency_percentiles_ms
 
 
 SubscriberFn = Callable[[Mapping[str, Any]], None]
 
+# Delivery modes
+DELIVERY_SYNC = "sync"  # call subscribers inline in the broadcasting thread
+DELIVERY_THREADED = "threaded"  # one worker thread + bounded backlog per subscriber
+DELIVERY_MODES = (DELIVERY_SYNC, DELIVERY_THREADED)
+
+# Backlog policies when a subscriber falls behind
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+LATEST_ONLY = "latest_only"  # coalesce: only the newest pending message is kept
+BACKLOG_POLICIES = (DROP_OLDEST, DROP_NEWEST, LATEST_ONLY)
+
+
+@dataclass
+class _Subscriber:
+    """Per-subscriber queue, worker and delivery metrics."""
+
+    name: str
+    callback: SubscriberFn
+    backlog: int
+    policy: str
+    latency_window: int
+    _queue: Deque[Tuple[Mapping[str, Any], float]] = field(default_factory=deque, init=False, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False)
+    _thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _closed: bool = field(default=False, init=False)
+    _busy: bool = field(default=False, init=False)
+    delivered: int = field(default=0, init=False)
+    dropped: int = field(default=0, init=False)
+    coalesced: int = field(default=0, init=False)
+    errors: int = field(default=0, init=False)
+    last_error: Optional[str] = field(default=None, init=False)
+    max_latency: float = field(default=0.0, init=False)
+    _latencies: Deque[float] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._latencies = deque(maxlen=self.latency_window)
+
+    # ---------- 同步投递 ----------
+
+    def call(self, message: Mapping[str, Any]) -> None:
+        t0 = time.perf_counter()
+        try:
+            self.callback(message)
+        except Exception as exc:
+            self.errors += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            raise
+        self._record(time.perf_counter() - t0)
+
+    def _record(self, latency: float) -> None:
+        self.delivered += 1
+        self._latencies.append(latency)
+        if latency > self.max_latency:
+            self.max_latency = latency
+
+    # ---------- 线程投递 ----------
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=f"broadcast-{self.name}", daemon=True)
+        self._thread.start()
+
+    def offer(self, message: Mapping[str, Any]) -> bool:
+        """Enqueue without blocking; False when the message was rejected."""
+        with self._cond:
+            if self._closed:
+                return False
+            queue = self._queue
+            if self.policy == LATEST_ONLY:
+                self.coalesced += len(queue)
+                queue.clear()
+            elif len(queue) >= self.backlog:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                queue.popleft()
+                self.dropped += 1
+            queue.append((message, time.perf_counter()))
+            self._cond.notify_all()
+            return True
+
+    def _run(self) -> None:
+        cond = self._cond
+        while True:
+            with cond:
+                cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                message, enqueued = self._queue.popleft()
+                self._busy = True
+            try:
+                self.callback(message)
+            except Exception as exc:  # 订阅者的异常不能拖垮其他订阅者
+                error: Optional[str] = f"{type(exc).__name__}: {exc}"
+            else:
+                error = None
+            latency = time.perf_counter() - enqueued
+            with cond:
+                self._busy = False
+                if error is None:
+                    self._record(latency)
+                else:
+                    self.errors += 1
+                    self.last_error = error
+                cond.notify_all()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def wait_idle(self, deadline: Optional[float]) -> bool:
+        with self._cond:
+            while self._queue or self._busy:
+                if self._thread is None or not self._thread.is_alive():
+                    return not (self._queue or self._busy)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, discard: bool = False) -> None:
+        with self._cond:
+            self._closed = True
+            if discard:
+                self.dropped += len(self._queue)
+                self._queue.clear()
+            self._cond.notify_all()
+
+    def join(self, timeout: Optional[float]) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            latencies = list(self._latencies)
+            out: Dict[str, Any] = {
+                "policy": self.policy,
+                "backlog": self.backlog,
+                "pending": len(self._queue),
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "last_error": self.last_error,
+                "max_latency_ms": self.max_latency * 1e3,
+            }
+        # 与心跳指标同一口径（nearest-rank）
+        for key, value in latency_percentiles_ms(latencies).items():
+            out[f"latency_{key}_ms"] = value
+        return out
+
 
 class BroadcastSystem:
-    """Simple pub-sub style broadcaster for conscious content."""
+    """Simple pub-sub style broadcaster for conscious content.
+
+    mode="sync" (default) calls subscribers inline, as before; exceptions
+    propagate to the caller. mode="threaded" gives every subscriber its own
+    worker thread and bounded backlog, so a slow subscriber only delays
+    itself: when its backlog is full the policy decides whether the oldest
+    or the newest message is dropped, and "latest_only" keeps just the most
+    recent pending message (e.g. the latest workspace winner). Subscriber
+    exceptions are counted in stats() instead of being raised.
+
+    Latency metrics are per subscriber: callback duration in sync mode,
+    enqueue → callback finished in threaded mode.
+    """
+
+    def __init__(
+        self,
+        mode: str = DELIVERY_SYNC,
+        backlog: int = 64,
+        policy: str = DROP_OLDEST,
+        latency_window: int = 1024,
+    ) -> None:
+        if mode not in DELIVERY_MODES:
+            raise ValueError(f"mode must be one of {DELIVERY_MODES}")
+        self._check(backlog, policy)
+        self.mode = mode
+        self.backlog = int(backlog)
+        self.policy = policy
+        self.latency_window = int(latency_window)
+        self._subscribers: Dict[str, _Subscriber] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _check(backlog: int, policy: str) -> None:
+        if backlog <= 0:
+            raise ValueError("backlog must be > 0")
+        if policy not in BACKLOG_POLICIES:
+            raise ValueError(f"policy must be one of {BACKLOG_POLICIES}")
+
+    @property
+    def threaded(self) -> bool:
+        return self.mode == DELIVERY_THREADED
 
-    def __init__(self) -> None:
-        self._subscribers: Dict[str, SubscriberFn] = {}
+    def subscribe(
+        self,
+        name: str,
+        callback: SubscriberFn,
+        *,
+        backlog: Optional[int] = None,
+        policy: Optional[str] = None,
+    ) -> None:
+        """Register or replace a subscriber under a given name.
 
-    def subscribe(self, name: str, callback: SubscriberFn) -> None:
-        """Register or replace a subscriber under a given name."""
-        self._subscribers[name] = callback
+        backlog / policy override the broadcaster defaults for this subscriber.
+        Replacing a threaded subscriber discards its pending messages.
+        """
+        backlog = self.backlog if backlog is None else int(backlog)
+        policy = self.policy if policy is None else policy
+        self._check(backlog, policy)
+        sub = _Subscriber(name, callback, backlog, policy, self.latency_window)
+        with self._lock:
+            old = self._subscribers.get(name)
+            self._subscribers[name] = sub
+        if old is not None:
+            old.close(discard=True)
+        if self.threaded:
+            sub.start()
 
     def unsubscribe(self, name: str) -> None:
-        """Remove a subscriber if present."""
-        self._subscribers.pop(name, None)
+        """Remove a subscriber if present (pending messages are discarded)."""
+        with self._lock:
+            sub = self._subscribers.pop(name, None)
+        if sub is not None:
+            sub.close(discard=True)
 
     def broadcast(self, message: Mapping[str, Any]) -> int:
         """Send message to all subscribers.
 
-        Returns the number of subscribers that received the message.
+        Returns the number of subscribers that received the message (sync)
+        or accepted it into their backlog (threaded).
         """
-        for cb in self._subscribers.values():
-            cb(message)
-        return len(self._subscribers)
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        if not self.threaded:
+            for sub in subscribers:
+                sub.call(message)
+            return len(subscribers)
+        return sum(sub.offer(message) for sub in subscribers)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every threaded subscriber has drained its backlog.
+
+        Returns False on timeout. No-op in sync mode.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        return all(sub.wait_idle(deadline) for sub in subscribers)
+
+    def close(self, timeout: Optional[float] = None, drain: bool = True) -> None:
+        """Stop worker threads; with drain=True pending messages are delivered first."""
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+            self._subscribers.clear()
+        for sub in subscribers:
+            sub.close(discard=not drain)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for sub in subscribers:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            sub.join(remaining)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-subscriber delivery metrics."""
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        return {sub.name: sub.stats() for sub in subscribers}
+
+    def pending(self, name: str) -> int:
+        with self._lock:
+            sub = self._subscribers.get(name)
+        return 0 if sub is None else sub.pending()
 
     @property
     def subscriber_count(self) -> int:
@@ -1,19 +1,29 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from .broadcast import BroadcastSystem
 
+#: Feature columns used for scoring, in weight-vector order
+FEATURE_NAMES: Tuple[str, ...] = ("newness", "relevance", "affect", "goal_alignment")
+#: Blueprint weights: newness 0.3, relevance 0.3, affect (valence) 0.2, goal alignment 0.2
+DEFAULT_WEIGHTS: Tuple[float, ...] = (0.3, 0.3, 0.2, 0.2)
+#: Value used for a missing feature
+DEFAULT_FEATURE = 0.5
+#: Below this many candidates compete() ranks in pure Python; NumPy's per-call overhead dominates there
+SMALL_COMPETE_SIZE = 32
+
+# (N, 4) array or {feature name: (N,) column}
+BatchFeatures = Union[np.ndarray, Mapping[str, Any]]
+
 
-def _clamp01(value: float) -> float:
-    """Clamp a float into [0, 1]."""
+def _clamp01(value: Any) -> float:
+    # 与 np.clip 一致：NaN 原样保留
     v = float(value)
-    if v < 0.0:
-        return 0.0
-    if v > 1.0:
-        return 1.0
-    return v
+    return 0.0 if v < 0.0 else 1.0 if v > 1.0 else v
 
 
 @dataclass
@@ -26,18 +36,17 @@ class WorkspaceItem:
     relevance: float
     affect: float
     goal_alignment: float
+    weights: Tuple[float, ...] = field(default=DEFAULT_WEIGHTS, repr=False, compare=False)
 
     @property
     def score(self) -> float:
-        """Weighted score, following blueprint weights.
-
-        newness 0.3, relevance 0.3, affect (valence) 0.2, goal alignment 0.2
-        """
+        """Weighted score (DEFAULT_WEIGHTS unless the workspace configured others)."""
+        w = self.weights
         return (
-            0.3 * self.newness
-            + 0.3 * self.relevance
-            + 0.2 * self.affect
-            + 0.2 * self.goal_alignment
+            w[0] * self.newness
+            + w[1] * self.relevance
+            + w[2] * self.affect
+            + w[3] * self.goal_alignment
         )
 
 
@@ -59,51 +68,109 @@ class GlobalWorkspaceSystem:
             },
             "memory": {...},
         }
+
+    For thousands of candidates per beat use `compete_batch` /
+    `compete_and_broadcast_batch`, which take NumPy feature columns and only
+    build WorkspaceItems for the top-k.
     """
 
     def __init__(
         self,
         min_score: float = 0.0,
         broadcaster: Optional[BroadcastSystem] = None,
+        weights: Optional[Sequence[float]] = None,
     ) -> None:
         self.min_score = min_score
         self.broadcaster = broadcaster
+        self.weights = DEFAULT_WEIGHTS if weights is None else tuple(float(w) for w in weights)
+        if len(self.weights) != len(FEATURE_NAMES):
+            raise ValueError(f"weights must have {len(FEATURE_NAMES)} entries {FEATURE_NAMES}")
         self.last_winner: Optional[WorkspaceItem] = None
 
     # -------- internal helpers --------
-    def _coerce_item(self, source: str, payload: Dict[str, Any]) -> WorkspaceItem:
-        content = str(payload.get("content", ""))
-
-        newness = _clamp01(payload.get("newness", payload.get("novelty", 0.5)))
-        relevance = _clamp01(payload.get("relevance", 0.5))
-        affect = _clamp01(payload.get("affect", payload.get("emotion", 0.5)))
-        goal_alignment = _clamp01(payload.get("goal_alignment", payload.get("goal_score", 0.5)))
-
-        return WorkspaceItem(
-            source=source,
-            content=content,
-            newness=newness,
-            relevance=relevance,
-            affect=affect,
-            goal_alignment=goal_alignment,
+    @staticmethod
+    def _payload_features(payload: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
+        return (
+            payload.get("newness", payload.get("novelty", DEFAULT_FEATURE)),
+            payload.get("relevance", DEFAULT_FEATURE),
+            payload.get("affect", payload.get("emotion", DEFAULT_FEATURE)),
+            payload.get("goal_alignment", payload.get("goal_score", DEFAULT_FEATURE)),
         )
 
-    # -------- public API --------
-    def compete(self, inputs: Dict[str, Dict[str, Any]]) -> List[WorkspaceItem]:
-        """Convert raw inputs into WorkspaceItems and rank them."""
-        items = [self._coerce_item(source, payload) for source, payload in inputs.items()]
-        items.sort(key=lambda it: it.score, reverse=True)
-        return items
+    def _feature_matrix(self, features: BatchFeatures) -> np.ndarray:
+        """Clip candidates into an (N, 4) float64 matrix in [0, 1]."""
+        if isinstance(features, Mapping):
+            n = None
+            for col in features.values():
+                n = len(col)
+                break
+            if n is None:
+                return np.empty((0, len(FEATURE_NAMES)))
+            mat = np.empty((n, len(FEATURE_NAMES)), dtype=np.float64)
+            for j, name in enumerate(FEATURE_NAMES):
+                col = features.get(name)
+                if col is None:
+                    mat[:, j] = DEFAULT_FEATURE
+                else:
+                    mat[:, j] = col
+        else:
+            mat = np.array(features, dtype=np.float64)  # 拷贝，后面原地 clip
+            if mat.ndim != 2 or mat.shape[1] != len(FEATURE_NAMES):
+                raise ValueError(f"features must have shape (N, {len(FEATURE_NAMES)})")
+        np.clip(mat, 0.0, 1.0, out=mat)
+        return mat
 
-    def compete_and_broadcast(
-        self, inputs: Dict[str, Dict[str, Any]]
-    ) -> Optional[Dict[str, Any]]:
-        """Run competition and optionally broadcast the winning content.
+    def _scores(self, mat: np.ndarray) -> np.ndarray:
+        # 与 WorkspaceItem.score 同样的求和顺序，保证逐位相同：并列项的排序和 min_score 判断都以它为准
+        w = self.weights
+        return w[0] * mat[:, 0] + w[1] * mat[:, 1] + w[2] * mat[:, 2] + w[3] * mat[:, 3]
 
-        Returns a lightweight dict describing the result, or None if
-        no candidate passes the min_score threshold.
-        """
-        ranked = self.compete(inputs)
+    def score_batch(self, features: BatchFeatures) -> np.ndarray:
+        """Weighted scores (N,) for a batch of candidates."""
+        return self._scores(self._feature_matrix(features))
+
+    @staticmethod
+    def _top_k_indices(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+        """Indices of the k best scores, best first; ties keep input order."""
+        n = scores.shape[0]
+        if k is None or k >= n:
+            candidates = np.arange(n)
+        elif k <= 0:
+            return np.empty(0, dtype=np.int64)
+        else:
+            # 第 k 名的分数作为阈值；压线的并列项按输入顺序取，保证与全量排序一致
+            kth = -np.partition(-scores, k - 1)[k - 1]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[: k - above.size]
+            candidates = np.concatenate((above, ties))
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order]
+
+    def _rank(
+        self,
+        mat: np.ndarray,
+        sources: Sequence[str],
+        contents: Optional[Sequence[Any]],
+        top_k: Optional[int],
+    ) -> List[WorkspaceItem]:
+        scores = self._scores(mat)
+        items: List[WorkspaceItem] = []
+        for i in self._top_k_indices(scores, top_k):
+            row = mat[i]
+            items.append(
+                WorkspaceItem(
+                    source=str(sources[i]),
+                    content="" if contents is None else str(contents[i]),
+                    newness=float(row[0]),
+                    relevance=float(row[1]),
+                    affect=float(row[2]),
+                    goal_alignment=float(row[3]),
+                    weights=self.weights,
+                )
+            )
+        return items
+
+    def _finish(self, ranked: List[WorkspaceItem]) -> Optional[Dict[str, Any]]:
         if not ranked:
             self.last_winner = None
             return None
@@ -130,3 +197,81 @@ class GlobalWorkspaceSystem:
             self.broadcaster.broadcast(result)
 
         return result
+
+    def _compete_small(self, inputs: Dict[str, Dict[str, Any]], top_k: Optional[int]) -> List[WorkspaceItem]:
+        items: List[WorkspaceItem] = []
+        for source, payload in inputs.items():
+            newness, relevance, affect, goal_alignment = self._payload_features(payload)
+            items.append(
+                WorkspaceItem(
+                    source=str(source),
+                    content=str(payload.get("content", "")),
+                    newness=_clamp01(newness),
+                    relevance=_clamp01(relevance),
+                    affect=_clamp01(affect),
+                    goal_alignment=_clamp01(goal_alignment),
+                    weights=self.weights,
+                )
+            )
+        # 稳定排序（reverse=True 也保持并列项的输入顺序），与向量化路径的结果一致
+        items.sort(key=lambda it: it.score, reverse=True)
+        return items if top_k is None else items[: max(0, top_k)]
+
+    # -------- public API --------
+    def compete(self, inputs: Dict[str, Dict[str, Any]], top_k: Optional[int] = None) -> List[WorkspaceItem]:
+        """Convert raw inputs into WorkspaceItems and rank them (best first).
+
+        top_k limits how many ranked items are returned (None = all). Fewer
+        than SMALL_COMPETE_SIZE candidates are ranked in pure Python, larger
+        inputs go through the vectorized path; both give the same ranking.
+        """
+        if not inputs:
+            return []
+        if len(inputs) < SMALL_COMPETE_SIZE:
+            return self._compete_small(inputs, top_k)
+        sources = list(inputs.keys())
+        payloads = list(inputs.values())
+        mat = np.array([self._payload_features(p) for p in payloads], dtype=np.float64)
+        np.clip(mat, 0.0, 1.0, out=mat)
+        contents = [p.get("content", "") for p in payloads]
+        return self._rank(mat, sources, contents, top_k)
+
+    def compete_batch(
+        self,
+        features: BatchFeatures,
+        sources: Sequence[str],
+        contents: Optional[Sequence[Any]] = None,
+        top_k: Optional[int] = 5,
+    ) -> List[WorkspaceItem]:
+        """Vectorized competition over N candidates given as NumPy columns.
+
+        `features` is an (N, 4) array in FEATURE_NAMES order, or a mapping of
+        feature name → (N,) column (missing columns default to 0.5). Only the
+        top_k winners are materialized as WorkspaceItems.
+        """
+        mat = self._feature_matrix(features)
+        if len(sources) != mat.shape[0]:
+            raise ValueError("sources must have one entry per candidate")
+        if contents is not None and len(contents) != mat.shape[0]:
+            raise ValueError("contents must have one entry per candidate")
+        return self._rank(mat, sources, contents, top_k)
+
+    def compete_and_broadcast(
+        self, inputs: Dict[str, Dict[str, Any]], top_k: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Run competition and optionally broadcast the winning content.
+
+        Returns a lightweight dict describing the result, or None if
+        no candidate passes the min_score threshold.
+        """
+        return self._finish(self.compete(inputs, top_k=top_k))
+
+    def compete_and_broadcast_batch(
+        self,
+        features: BatchFeatures,
+        sources: Sequence[str],
+        contents: Optional[Sequence[Any]] = None,
+        top_k: int = 5,
+    ) -> Optional[Dict[str, Any]]:
+        """Batch counterpart of compete_and_broadcast; "candidates" holds the top_k."""
+        return self._finish(self.compete_batch(features, sources, contents, top_k=max(1, top_k)))
@@ -1,7 +1,10 @@
 """神经系统基础模块。
 
 当前实现了：
-- networks: 轻量级 MLP / 世界模型 / 特征提取
-- learning: 经验回放缓冲区
+- networks: 轻量级 MLP（含反向传播）/ 世界模型 / 特征提取
+- learning: 经验回放缓冲区（均匀 / 优先级采样）
+- optim: SGD / Adam 优化器（原地更新参数）
+- training: 回归 / 世界模型 / DQN 的小批量 train_step
+- checkpoint: 单文件 checkpoint（JSON header + 原始数据，支持 memmap 加载）
 - decision: ε-贪婪策略与简单规划 stub
 """
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .networks import MLP, FeatureExtractor, PolicyNetwork, ValueNetwork, WorldModel
+
+
+# 文件布局：
+#   MAGIC (8 字节) | header 长度 (uint32, 小端) | JSON header | 对齐填充 | 张量数据
+# 每个张量的起始位置都按 ALIGNMENT 对齐，加载时可以直接在整块 memmap 上取视图。
+MAGIC = b"USCKPT\x00\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+Model = Union[MLP, PolicyNetwork, ValueNetwork, FeatureExtractor, WorldModel]
+
+MODEL_TYPES: Dict[str, type] = {
+    "MLP": MLP,
+    "PolicyNetwork": PolicyNetwork,
+    "ValueNetwork": ValueNetwork,
+    "FeatureExtractor": FeatureExtractor,
+    "WorldModel": WorldModel,
+}
+
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _model_config(model: Model) -> Dict[str, Any]:
+    """取出 dataclass 的构造参数（init=True 的字段），tuple 转成 list 便于 JSON。"""
+    config: Dict[str, Any] = {}
+    for f in dataclasses.fields(model):
+        if not f.init:
+            continue
+        value = getattr(model, f.name)
+        config[f.name] = list(value) if isinstance(value, (tuple, list)) else value
+    return config
+
+
+def _model_mlp(model: Model) -> MLP:
+    return model if isinstance(model, MLP) else model.mlp
+
+
+def save_checkpoint(
+    model: Model,
+    path: Path,
+    *,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """把网络参数写成「JSON header + 原始 float32 数据」的单文件 checkpoint。"""
+    model_type = type(model).__name__
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"不支持保存的模型类型: {model_type}")
+
+    mlp = _model_mlp(model)
+    tensors: List[Dict[str, Any]] = []
+    arrays: List[np.ndarray] = []
+    offset = 0
+    for i, (w, b) in enumerate(zip(mlp._weights, mlp._biases)):
+        for name, arr in ((f"w{i}", w), (f"b{i}", b)):
+            arr = np.ascontiguousarray(arr, dtype="<f4")
+            tensors.append({"name": name, "dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset})
+            arrays.append(arr)
+            offset = _align(offset + arr.nbytes)
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "model_type": model_type,
+        "config": _model_config(model),
+        "layer_sizes": [int(n) for n in mlp.layer_sizes],
+        "tensors": tensors,
+        "metadata": metadata or {},
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + 4 + len(header_bytes))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for spec, arr in zip(tensors, arrays):
+            f.seek(data_start + spec["offset"])
+            f.write(arr.tobytes())
+    tmp_path.replace(path)
+    return path
+
+
+def read_checkpoint_header(path: Path) -> Tuple[Dict[str, Any], int]:
+    """读取并校验 header，返回 (header, 数据区起始偏移)。"""
+    with Path(path).open("rb") as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path} 不是 checkpoint 文件")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+
+    version = header.get("format_version")
+    if not isinstance(version, int) or version > FORMAT_VERSION:
+        raise ValueError(f"不支持的 checkpoint 版本: {version}（当前支持 <= {FORMAT_VERSION}）")
+    return header, _align(len(MAGIC) + 4 + header_len)
+
+
+def load_checkpoint(path: Path, *, mmap_mode: Optional[str] = "c") -> Model:
+    """加载 checkpoint，恢复为保存时的模型类型。
+
+    mmap_mode:
+        - "c"（默认）：copy-on-write 映射，启动时不拷贝参数，训练写入只改内存中的页；
+        - "r"：只读映射（推理用，写参数会报错）；
+        - None：一次性读入内存。
+    """
+    header, data_start = read_checkpoint_header(path)
+    model_type = header.get("model_type")
+    cls = MODEL_TYPES.get(model_type)
+    if cls is None:
+        raise ValueError(f"未知的模型类型: {model_type}")
+
+    if mmap_mode is None:
+        raw = np.fromfile(path, dtype=np.uint8)
+    else:
+        raw = np.memmap(path, dtype=np.uint8, mode=mmap_mode)
+
+    params: List[np.ndarray] = []
+    for spec in header["tensors"]:
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        start = data_start + int(spec["offset"])
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        params.append(raw[start : start + nbytes].view(dtype).reshape(shape))
+
+    config = dict(header.get("config") or {})
+    mlp = MLP.from_parameters(header["layer_sizes"], params, seed=config.get("seed"))
+    if cls is MLP:
+        return mlp
+
+    # 不走 __post_init__（那会重新随机初始化一遍），直接挂上加载好的 MLP
+    model = cls.__new__(cls)
+    for f in dataclasses.fields(cls):
+        if not f.init:
+            continue
+        if f.name in config:
+            value = config[f.name]
+        elif f.default is not dataclasses.MISSING:
+            value = f.default
+        else:
+            raise ValueError(f"checkpoint 缺少构造参数: {f.name}")
+        setattr(model, f.name, tuple(value) if isinstance(value, list) else value)
+    model._mlp = mlp
+    return model
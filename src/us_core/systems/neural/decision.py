@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
 
 import numpy as np
 
@@ -15,10 +15,17 @@ class EpsilonGreedyPolicy:
     policy_net: PolicyNetwork
     action_size: int
     epsilon: float = 0.1
+    _rng: Optional[np.random.Generator] = field(default=None, init=False, repr=False)
+
+    def _default_rng(self) -> np.random.Generator:
+        # 不传 rng 时复用同一个生成器，避免每步都 default_rng() 一次
+        if self._rng is None:
+            self._rng = np.random.default_rng()
+        return self._rng
 
     def select_action(self, state: np.ndarray, rng: Optional[np.random.Generator] = None) -> tuple[int, float]:
         if rng is None:
-            rng = np.random.default_rng()
+            rng = self._default_rng()
 
         if state.ndim == 1:
             state = state[None, :]
@@ -30,30 +37,100 @@ class EpsilonGreedyPolicy:
             return action, float(confidence)
 
         # 贪婪选择
-        logits = self.policy_net.forward(state)[0]  # (action_size,)
-        # softmax 得到一个“信心”感
-        max_logit = float(np.max(logits))
-        exp = np.exp(logits - max_logit)
-        probs = exp / np.sum(exp)
-        action = int(np.argmax(probs))
-        confidence = float(probs[action])
+        logits = self.policy_net.infer(state)[0]  # (action_size,)
+        action = int(np.argmax(logits))
+        # “信心”取 softmax 后最大动作的概率：1 / sum(exp(l - max))，不需要完整的 softmax
+        confidence = 1.0 / float(np.sum(np.exp(logits - logits[action])))
         return action, confidence
 
+    def select_actions(
+        self,
+        states: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """一批状态一次前向，返回 (actions (N,) int64, confidences (N,) float32)。
+
+        每个状态独立地以 epsilon 概率探索；探索位置的 confidence 为 1 / action_size。
+        """
+        if rng is None:
+            rng = self._default_rng()
+        if states.ndim == 1:
+            states = states[None, :]
+        n = states.shape[0]
+
+        explore = rng.random(n) < self.epsilon
+        actions = np.empty(n, dtype=np.int64)
+        confidences = np.full(n, 1.0 / self.action_size, dtype=np.float32)
+
+        num_explore = int(explore.sum())
+        if num_explore:
+            actions[explore] = rng.integers(0, self.action_size, size=num_explore)
+
+        if num_explore < n:
+            logits = self.policy_net.infer(states)  # (N, action_size)
+            greedy = np.argmax(logits, axis=1)
+            best = logits[np.arange(n), greedy]
+            exp_sum = np.exp(logits - best[:, None]).sum(axis=1)
+            exploit = ~explore
+            actions[exploit] = greedy[exploit]
+            confidences[exploit] = 1.0 / exp_sum[exploit]
+
+        return actions, confidences
+
+
+PLANNER_METHODS = ("random", "cem")
+
 
 @dataclass
 class SimplePlanner:
-    """极简 3 步前瞻规划模块（stub 版本）。
+    """基于 WorldModel 的短视界前瞻规划（随机打靶 / CEM）。
+
+    - method="random": 一次性采样 num_samples 条长度为 horizon 的随机动作序列；
+    - method="cem": 交叉熵方法，每个时间步维护一个动作分布，每轮按得分取前
+      elite_frac 的序列重新估计分布，迭代 cem_iterations 轮。
 
-    当前实现：
-    - 对给定起始状态，尝试若干随机动作序列
-    - 使用 WorldModel rollout 预测未来奖励“分数”
-    - 返回得分最高的第一步动作
+    所有候选序列在每个时间步作为一个 (num_samples, state_dim) 的 batch 交给
+    WorldModel.predict_next_states，一次前向完成；返回得分最高序列的第一步动作。
     """
 
     world_model: WorldModel
     action_size: int
     horizon: int = 3
     num_samples: int = 16
+    method: str = "random"
+    cem_iterations: int = 3
+    elite_frac: float = 0.1
+    cem_smoothing: float = 0.7  # 新分布的权重，其余保留旧分布，防止过早收敛
+
+    def __post_init__(self) -> None:
+        if self.method not in PLANNER_METHODS:
+            raise ValueError(f"method 必须是 {PLANNER_METHODS} 之一")
+        if self.horizon <= 0 or self.num_samples <= 0:
+            raise ValueError("horizon / num_samples 必须为正数")
+
+    def step_reward(self, states: np.ndarray) -> np.ndarray:
+        """每一步的“奖励”：这里沿用极简版本，取状态向量的 L2 范数。返回 (N,)。"""
+        return np.sqrt(np.einsum("ij,ij->i", states, states))
+
+    def evaluate_sequences(self, state: np.ndarray, action_seqs: np.ndarray) -> np.ndarray:
+        """对 (N, horizon) 的动作序列做批量 rollout，返回每条序列的累计得分 (N,)。"""
+        if state.ndim == 1:
+            state = state[None, :]
+        action_seqs = np.asarray(action_seqs, dtype=np.int64)
+        n = action_seqs.shape[0]
+        states = np.repeat(np.asarray(state, dtype=np.float32)[:1], n, axis=0)
+        scores = np.zeros(n, dtype=np.float64)
+        for t in range(action_seqs.shape[1]):
+            self.world_model.predict_next_states(states, action_seqs[:, t], out=states)
+            scores += self.step_reward(states)
+        return scores
+
+    def _sample_categorical(self, probs: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+        """按 (horizon, action_size) 的分布批量采样 (n, horizon) 的动作序列。"""
+        cdf = np.cumsum(probs, axis=1)
+        cdf[:, -1] = 1.0
+        u = rng.random((n, self.horizon))
+        return (u[:, :, None] > cdf[None, :, :]).sum(axis=2)
 
     def plan(self, state: np.ndarray, rng: Optional[np.random.Generator] = None) -> int:
         if rng is None:
@@ -61,21 +138,31 @@ class SimplePlanner:
         if state.ndim == 1:
             state = state[None, :]
 
-        best_action = 0
-        best_score = -1e9
-
-        for _ in range(self.num_samples):
-            # 随机采样一个动作序列
-            actions = rng.integers(0, self.action_size, size=self.horizon)
-            s = state.copy()
-            score = 0.0
-            for a in actions:
-                s = self.world_model.predict_next_state(s, int(a))
-                # 这里用一个非常简化的“奖励”：状态向量的 L2 范数
-                score += float(np.linalg.norm(s))
-
-            if score > best_score:
-                best_score = score
-                best_action = int(actions[0])
+        if self.method == "random":
+            seqs = rng.integers(0, self.action_size, size=(self.num_samples, self.horizon))
+            scores = self.evaluate_sequences(state, seqs)
+            return int(seqs[int(np.argmax(scores)), 0])
+
+        return self._plan_cem(state, rng)
+
+    def _plan_cem(self, state: np.ndarray, rng: np.random.Generator) -> int:
+        probs = np.full((self.horizon, self.action_size), 1.0 / self.action_size)
+        num_elites = max(1, int(round(self.num_samples * self.elite_frac)))
+        best_action, best_score = 0, -np.inf
+        cols = np.arange(self.horizon)
+
+        for _ in range(max(1, self.cem_iterations)):
+            seqs = self._sample_categorical(probs, self.num_samples, rng)
+            scores = self.evaluate_sequences(state, seqs)
+
+            top = int(np.argmax(scores))
+            if scores[top] > best_score:
+                best_score = float(scores[top])
+                best_action = int(seqs[top, 0])
+
+            elites = seqs[np.argpartition(scores, -num_elites)[-num_elites:]]
+            counts = np.zeros_like(probs)
+            np.add.at(counts, (np.broadcast_to(cols, elites.shape), elites), 1.0)
+            probs = self.cem_smoothing * counts / num_elites + (1.0 - self.cem_smoothing) * probs
 
         return best_action
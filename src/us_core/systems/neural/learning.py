@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Tuple
+from pathlib import Path
+from typing import Optional, Tuple
 
 import numpy as np
 
@@ -17,45 +18,341 @@ class Experience:
     done: bool
 
 
+Batch = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
 class ReplayBuffer:
-    """经验回放缓冲区（简单实现）。"""
+    """经验回放缓冲区：预分配 numpy 数组实现的环形缓冲。
 
-    def __init__(self, capacity: int) -> None:
+    - states / next_states: (capacity, state_dim) float32
+    - actions: (capacity,) int64；rewards: (capacity,) float32；dones: (capacity,) bool
+
+    state_dim 可以在构造时给出，也可以在第一次 add 时根据状态形状推断。
+    传入 storage_dir 时使用 np.memmap 作为底层存储，适合比内存更大的缓冲区。
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        state_dim: Optional[int] = None,
+        *,
+        storage_dir: Optional[Path] = None,
+    ) -> None:
         if capacity <= 0:
             raise ValueError("capacity must be > 0")
         self._capacity = capacity
-        self._buffer: List[Experience] = []
+        self._storage_dir = Path(storage_dir) if storage_dir is not None else None
+        self._size: int = 0
         self._position: int = 0
 
+        self._states: Optional[np.ndarray] = None
+        self._next_states: Optional[np.ndarray] = None
+        self._actions: Optional[np.ndarray] = None
+        self._rewards: Optional[np.ndarray] = None
+        self._dones: Optional[np.ndarray] = None
+
+        if state_dim is not None:
+            self._allocate(state_dim)
+
     def __len__(self) -> int:
-        return len(self._buffer)
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def state_dim(self) -> Optional[int]:
+        return None if self._states is None else self._states.shape[1]
+
+    def _new_array(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        if self._storage_dir is None:
+            return np.zeros(shape, dtype=dtype)
+        self._storage_dir.mkdir(parents=True, exist_ok=True)
+        return np.memmap(self._storage_dir / f"{name}.dat", dtype=dtype, mode="w+", shape=shape)
+
+    def _allocate(self, state_dim: int) -> None:
+        if state_dim <= 0:
+            raise ValueError("state_dim must be > 0")
+        cap = self._capacity
+        self._states = self._new_array("states", (cap, state_dim), np.float32)
+        self._next_states = self._new_array("next_states", (cap, state_dim), np.float32)
+        self._actions = self._new_array("actions", (cap,), np.int64)
+        self._rewards = self._new_array("rewards", (cap,), np.float32)
+        self._dones = self._new_array("dones", (cap,), np.bool_)
 
     def add(self, state: np.ndarray, action: int, reward: float,
             next_state: np.ndarray, done: bool) -> None:
-        exp = Experience(
-            state=state.astype(np.float32),
-            action=int(action),
-            reward=float(reward),
-            next_state=next_state.astype(np.float32),
-            done=bool(done),
+        state = np.asarray(state)
+        if self._states is None:
+            self._allocate(int(state.size))
+
+        pos = self._position
+        # 直接写入预分配数组，dtype 转换在赋值时完成
+        self._states[pos] = state.reshape(-1)
+        self._next_states[pos] = np.asarray(next_state).reshape(-1)
+        self._actions[pos] = action
+        self._rewards[pos] = reward
+        self._dones[pos] = done
+
+        self._position = (pos + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+
+    def add_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray,
+    ) -> None:
+        """批量写入 n 条经验（例如 VecGridWorld 一次 step 的结果），环形回绕一次完成。"""
+        states = np.asarray(states)
+        if states.ndim == 1:
+            states = states[None, :]
+        n = states.shape[0]
+        if n == 0:
+            return
+        if self._states is None:
+            self._allocate(int(states.shape[1]))
+
+        next_states = np.asarray(next_states).reshape(n, -1)
+        actions = np.asarray(actions).reshape(n)
+        rewards = np.asarray(rewards).reshape(n)
+        dones = np.asarray(dones).reshape(n)
+
+        # 超过容量时只保留最后 capacity 条
+        if n > self._capacity:
+            drop = n - self._capacity
+            self._position = (self._position + drop) % self._capacity
+            states, actions, rewards, next_states, dones = (
+                states[drop:], actions[drop:], rewards[drop:], next_states[drop:], dones[drop:]
+            )
+            n = self._capacity
+
+        idxs = (self._position + np.arange(n)) % self._capacity
+        self._states[idxs] = states
+        self._next_states[idxs] = next_states
+        self._actions[idxs] = actions
+        self._rewards[idxs] = rewards
+        self._dones[idxs] = dones
+
+        self._position = (self._position + n) % self._capacity
+        self._size = min(self._size + n, self._capacity)
+
+    def sample_indices(self, batch_size: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """均匀（有放回）采样 batch_size 个下标。"""
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        if self._size == 0:
+            raise ValueError("buffer is empty")
+        if rng is None:
+            return np.random.randint(0, self._size, size=batch_size)
+        return rng.integers(0, self._size, size=batch_size)
+
+    def gather(self, idxs: np.ndarray, out: Optional[Batch] = None) -> Batch:
+        """按下标取出一批经验。
+
+        传入 out（预先分配好的 5 个数组）时直接 np.take 写入，不产生新的分配。
+        """
+        if self._states is None:
+            raise ValueError("buffer is empty")
+        arrays = (self._states, self._actions, self._rewards, self._next_states, self._dones)
+        if out is None:
+            return tuple(arr[idxs] for arr in arrays)  # type: ignore[return-value]
+        # mode="raise" 时 np.take 会先写临时缓冲再拷贝到 out；下标由 sample_indices 保证合法
+        for arr, dst in zip(arrays, out):
+            np.take(arr, idxs, axis=0, out=dst, mode="clip")
+        return out
+
+    def allocate_batch(self, batch_size: int) -> Batch:
+        """分配一组可以反复传给 gather(out=...) / sample(out=...) 的输出数组。"""
+        if self._states is None:
+            raise ValueError("state_dim unknown: add data or pass state_dim first")
+        dim = self._states.shape[1]
+        return (
+            np.empty((batch_size, dim), dtype=np.float32),
+            np.empty(batch_size, dtype=np.int64),
+            np.empty(batch_size, dtype=np.float32),
+            np.empty((batch_size, dim), dtype=np.float32),
+            np.empty(batch_size, dtype=np.bool_),
         )
-        if len(self._buffer) < self._capacity:
-            self._buffer.append(exp)
-        else:
-            self._buffer[self._position] = exp
-        self._position = (self._position + 1) % self._capacity
 
-    def sample(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    def sample(
+        self,
+        batch_size: int,
+        rng: Optional[np.random.Generator] = None,
+        out: Optional[Batch] = None,
+    ) -> Batch:
+        """均匀采样一批 (states, actions, rewards, next_states, dones)。"""
+        idxs = self.sample_indices(batch_size, rng)
+        return self.gather(idxs, out=out)
+
+    def __getitem__(self, index: int) -> Experience:
+        if not -self._size <= index < self._size:
+            raise IndexError("replay buffer index out of range")
+        index %= self._size
+        return Experience(
+            state=self._states[index].copy(),
+            action=int(self._actions[index]),
+            reward=float(self._rewards[index]),
+            next_state=self._next_states[index].copy(),
+            done=bool(self._dones[index]),
+        )
+
+    def flush(self) -> None:
+        """memmap 存储时把数据刷到磁盘；内存存储时什么都不做。"""
+        for arr in (self._states, self._next_states, self._actions, self._rewards, self._dones):
+            if isinstance(arr, np.memmap):
+                arr.flush()
+
+
+class SumTree:
+    """数组实现的求和树，叶子数补齐到 2 的幂。
+
+    tree[1] 是根，节点 i 的孩子为 2i / 2i+1，第 j 个叶子位于 leaf_count + j。
+    批量更新和批量前缀和查找都按层向量化，每次 O(batch * log N)。
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self.capacity = capacity
+        leaf_count = 1
+        while leaf_count < capacity:
+            leaf_count *= 2
+        self._leaf_count = leaf_count
+        self._depth = leaf_count.bit_length() - 1
+        self._tree = np.zeros(2 * leaf_count, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self._tree[1])
+
+    def get(self, idxs: np.ndarray) -> np.ndarray:
+        return self._tree[self._leaf_count + np.asarray(idxs, dtype=np.int64)]
+
+    def update(self, idxs: np.ndarray, values: np.ndarray) -> None:
+        """设置若干叶子的值，并逐层向上重算父节点。下标重复时以最后一个为准。"""
+        pos = self._leaf_count + np.asarray(idxs, dtype=np.int64).reshape(-1)
+        if pos.size == 0:
+            return
+        self._tree[pos] = np.asarray(values, dtype=np.float64).reshape(-1)
+        tree = self._tree
+        for _ in range(self._depth):
+            # 重复的父节点写入的是同一个值，不需要去重
+            pos >>= 1
+            tree[pos] = tree[2 * pos] + tree[2 * pos + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """对每个 value ∈ [0, total) 找到前缀和首次超过它的叶子下标。"""
+        values = np.array(values, dtype=np.float64).reshape(-1)
+        tree = self._tree
+        node = np.ones(values.shape[0], dtype=np.int64)
+        for _ in range(self._depth):
+            left = 2 * node
+            left_sum = tree[left]
+            # 左子树为 0 时 values >= 0 必然走右边，不会落到空叶子上
+            go_right = values >= left_sum
+            values -= np.where(go_right, left_sum, 0.0)
+            node = left + go_right
+        return np.minimum(node - self._leaf_count, self.capacity - 1)
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """按 TD 误差优先级采样的经验回放（Schaul et al. 2015 的比例式变体）。
+
+    存储布局与 ReplayBuffer 完全相同，只额外维护一棵 SumTree：
+    - 新写入的经验使用当前最大优先级，保证至少被采到一次；
+    - sample() 仍返回 5 元组（按优先级采样），可以直接替换 ReplayBuffer；
+    - sample_with_weights() 额外返回下标和重要性采样权重，
+      训练后用 update_priorities(idxs, td_errors) 批量回写优先级。
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        state_dim: Optional[int] = None,
+        *,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        eps: float = 1e-6,
+        storage_dir: Optional[Path] = None,
+    ) -> None:
+        super().__init__(capacity, state_dim, storage_dir=storage_dir)
+        if alpha < 0:
+            raise ValueError("alpha must be >= 0")
+        self.alpha = alpha
+        self.beta = beta
+        self.eps = eps
+        self._tree = SumTree(capacity)
+        self._max_priority = 1.0
+
+    def add(self, state: np.ndarray, action: int, reward: float,
+            next_state: np.ndarray, done: bool) -> None:
+        pos = self._position
+        super().add(state, action, reward, next_state, done)
+        self._tree.update(np.array([pos]), np.array([self._max_priority ** self.alpha]))
+
+    def add_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray,
+    ) -> None:
+        states = np.asarray(states)
+        n = 1 if states.ndim == 1 else states.shape[0]
+        kept = min(n, self._capacity)
+        start = (self._position + n - kept) % self._capacity
+        super().add_batch(states, actions, rewards, next_states, dones)
+        if kept:
+            idxs = (start + np.arange(kept)) % self._capacity
+            self._tree.update(idxs, np.full(kept, self._max_priority ** self.alpha))
+
+    def sample_indices(self, batch_size: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """分层采样：把 [0, total) 等分为 batch_size 段，每段按优先级取一个下标。"""
         if batch_size <= 0:
             raise ValueError("batch_size must be > 0")
-        if not self._buffer:
+        if self._size == 0:
             raise ValueError("buffer is empty")
+        u = np.random.random(batch_size) if rng is None else rng.random(batch_size)
+        segment = self._tree.total / batch_size
+        values = (np.arange(batch_size) + u) * segment
+        return np.minimum(self._tree.find(values), self._size - 1)
+
+    def importance_weights(self, idxs: np.ndarray, beta: Optional[float] = None) -> np.ndarray:
+        """w_i = (N * P(i))^-beta，再除以 batch 内最大值归一化到 (0, 1]。"""
+        if beta is None:
+            beta = self.beta
+        probs = self._tree.get(idxs) / self._tree.total
+        weights = (self._size * probs) ** (-beta)
+        return (weights / weights.max()).astype(np.float32)
+
+    def sample_with_weights(
+        self,
+        batch_size: int,
+        rng: Optional[np.random.Generator] = None,
+        out: Optional[Batch] = None,
+        beta: Optional[float] = None,
+    ) -> Tuple[Batch, np.ndarray, np.ndarray]:
+        """按优先级采样，返回 (batch, idxs, is_weights)。"""
+        idxs = self.sample_indices(batch_size, rng)
+        batch = self.gather(idxs, out=out)
+        return batch, idxs, self.importance_weights(idxs, beta)
 
-        idxs = np.random.choice(len(self._buffer), size=batch_size, replace=len(self._buffer) < batch_size)
-        states = np.stack([self._buffer[i].state for i in idxs], axis=0)
-        actions = np.array([self._buffer[i].action for i in idxs], dtype=np.int64)
-        rewards = np.array([self._buffer[i].reward for i in idxs], dtype=np.float32)
-        next_states = np.stack([self._buffer[i].next_state for i in idxs], axis=0)
-        dones = np.array([self._buffer[i].done for i in idxs], dtype=np.bool_)
+    def update_priorities(self, idxs: np.ndarray, td_errors: np.ndarray) -> None:
+        """用新的 TD 误差批量更新优先级：p = (|δ| + eps) ^ alpha。"""
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64).reshape(-1)) + self.eps
+        idxs = np.asarray(idxs, dtype=np.int64).reshape(-1)
+        if idxs.shape != priorities.shape:
+            raise ValueError("idxs and td_errors must have the same length")
+        if idxs.size == 0:
+            return
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+        self._tree.update(idxs, priorities ** self.alpha)
 
-        return states, actions, rewards, next_states, dones
+    def priorities(self, idxs: np.ndarray) -> np.ndarray:
+        """当前（已取 alpha 次幂的）优先级。"""
+        return self._tree.get(idxs)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import copy
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -12,23 +14,66 @@ def _relu(x: np.ndarray) -> np.ndarray:
 
 @dataclass
 class MLP:
-    """简单的全连接前馈网络（只用于前向推理，不做训练）。"""
+    """简单的全连接前馈网络（ReLU 隐层，线性输出）。
+
+    - forward: 纯推理，不缓存中间结果；
+    - forward_train + backward: 训练路径，缓存每层输入，反向传播把梯度写进
+      预分配的 _grad_weights / _grad_biases（与参数一一对应，供优化器原地更新）；
+    - inference(): 免分配的推理引擎（见 MLPInference）。
+    """
 
     layer_sizes: Sequence[int]
+    seed: Optional[int] = None  # 固定随机种子时初始化可复现
     _weights: List[np.ndarray] = field(init=False)
     _biases: List[np.ndarray] = field(init=False)
+    _grad_weights: List[np.ndarray] = field(init=False, repr=False)
+    _grad_biases: List[np.ndarray] = field(init=False, repr=False)
+    _cache: List[np.ndarray] = field(default_factory=list, init=False, repr=False)
+    _engines: Dict[Tuple[str, bool], "MLPInference"] = field(default_factory=dict, init=False, repr=False)
 
     def __post_init__(self) -> None:
         if len(self.layer_sizes) < 2:
             raise ValueError("layer_sizes 至少包含 input 和 output 大小")
         self._weights = []
         self._biases = []
-        rng = np.random.default_rng()
+        rng = np.random.default_rng(self.seed)
         for in_dim, out_dim in zip(self.layer_sizes[:-1], self.layer_sizes[1:]):
             w = rng.normal(0.0, 0.1, size=(in_dim, out_dim)).astype(np.float32)
             b = np.zeros(out_dim, dtype=np.float32)
             self._weights.append(w)
             self._biases.append(b)
+        self._grad_weights = [np.zeros_like(w) for w in self._weights]
+        self._grad_biases = [np.zeros_like(b) for b in self._biases]
+
+    @classmethod
+    def from_parameters(
+        cls,
+        layer_sizes: Sequence[int],
+        params: Sequence[np.ndarray],
+        seed: Optional[int] = None,
+    ) -> "MLP":
+        """直接用给定参数（w0, b0, w1, b1, ...）构造网络，不做随机初始化。
+
+        参数数组按原样引用（例如 checkpoint 的 memmap 视图），不会拷贝。
+        """
+        layer_sizes = tuple(int(n) for n in layer_sizes)
+        if len(params) != 2 * (len(layer_sizes) - 1):
+            raise ValueError("参数数量与 layer_sizes 不匹配")
+        weights, biases = list(params[0::2]), list(params[1::2])
+        for w, b, in_dim, out_dim in zip(weights, biases, layer_sizes[:-1], layer_sizes[1:]):
+            if w.shape != (in_dim, out_dim) or b.shape != (out_dim,):
+                raise ValueError(f"参数形状不匹配：期望 {(in_dim, out_dim)} / {(out_dim,)}")
+
+        mlp = cls.__new__(cls)
+        mlp.layer_sizes = layer_sizes
+        mlp.seed = seed
+        mlp._weights = weights
+        mlp._biases = biases
+        mlp._grad_weights = [np.zeros(w.shape, dtype=np.float32) for w in weights]
+        mlp._grad_biases = [np.zeros(b.shape, dtype=np.float32) for b in biases]
+        mlp._cache = []
+        mlp._engines = {}
+        return mlp
 
     def forward(self, x: np.ndarray) -> np.ndarray:
         if x.ndim == 1:
@@ -40,6 +85,201 @@ class MLP:
                 h = _relu(h)
         return h
 
+    def forward_train(self, x: np.ndarray) -> np.ndarray:
+        """前向传播并缓存每层的输入（ReLU 之后的激活），供 backward 使用。"""
+        if x.ndim == 1:
+            x = x[None, :]
+        h = np.asarray(x, dtype=np.float32)
+        cache = [h]
+        last = len(self._weights) - 1
+        for i, (w, b) in enumerate(zip(self._weights, self._biases)):
+            h = h @ w
+            h += b
+            if i < last:
+                np.maximum(h, 0.0, out=h)
+                cache.append(h)
+        self._cache = cache
+        return h
+
+    def backward(self, grad_output: np.ndarray, *, need_input_grad: bool = False) -> Optional[np.ndarray]:
+        """根据 dLoss/dOutput 计算所有参数梯度（覆盖写入，不累加）。
+
+        need_input_grad=True 时额外返回 dLoss/dInput（用于串联多个网络）。
+        """
+        if not self._cache:
+            raise RuntimeError("backward() 之前需要先调用 forward_train()")
+        grad = np.asarray(grad_output, dtype=np.float32)
+        for i in range(len(self._weights) - 1, -1, -1):
+            inp = self._cache[i]
+            np.matmul(inp.T, grad, out=self._grad_weights[i])
+            np.sum(grad, axis=0, out=self._grad_biases[i])
+            if i == 0 and not need_input_grad:
+                break
+            grad = grad @ self._weights[i].T
+            if i > 0:
+                # ReLU 的导数：激活值 > 0 的位置梯度保留
+                grad *= inp > 0
+        self._cache = []
+        return grad if need_input_grad else None
+
+    def parameters(self) -> List[np.ndarray]:
+        """参数列表（w0, b0, w1, b1, ...），与 gradients() 顺序一致。"""
+        return [p for pair in zip(self._weights, self._biases) for p in pair]
+
+    def gradients(self) -> List[np.ndarray]:
+        return [g for pair in zip(self._grad_weights, self._grad_biases) for g in pair]
+
+    def copy_weights_from(self, other: "MLP") -> None:
+        """把另一个同结构网络的参数原地拷贝过来（例如同步 DQN 的目标网络）。"""
+        if tuple(other.layer_sizes) != tuple(self.layer_sizes):
+            raise ValueError("layer_sizes 不一致，无法拷贝参数")
+        for dst, src in zip(self.parameters(), other.parameters()):
+            np.copyto(dst, src)
+
+    def inference(self, precision: str = "float32", fuse_bias: bool = False) -> "MLPInference":
+        """取（或创建）该网络的推理引擎，同一配置复用同一个实例。"""
+        key = (precision, fuse_bias)
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = MLPInference(self, precision=precision, fuse_bias=fuse_bias)
+            self._engines[key] = engine
+        return engine
+
+    def __deepcopy__(self, memo):
+        # 推理引擎持有工作区和权重视图，拷贝时不带上，由新网络按需重建
+        cls = type(self)
+        clone = cls.__new__(cls)
+        memo[id(self)] = clone
+        for name, value in self.__dict__.items():
+            if name == "_engines":
+                clone._engines = {}
+            elif name == "_cache":
+                clone._cache = []
+            else:
+                setattr(clone, name, copy.deepcopy(value, memo))
+        return clone
+
+
+INFERENCE_PRECISIONS = ("float32", "float16", "int8")
+
+
+@dataclass
+class MLPInference:
+    """MLP 的免分配推理路径。
+
+    - 每个 batch size 一组预分配的工作区，matmul / 偏置 / ReLU 全部 out= 原地完成；
+    - fuse_bias=True 时把偏置并进权重最后一行，输入末尾补一列 1，一次 matmul 完成仿射变换；
+    - precision="float16" / "int8" 时权重以半精度 / 按输出列对称量化的 int8 保存，
+      计算仍在 float32 中进行（int8 在 matmul 之后乘回缩放系数）。
+
+    返回值是工作区里的数组：同一 batch size 的下一次调用会覆盖它，需要保留时请 copy()
+    或传入 out。float32 且不融合偏置时直接引用 MLP 的参数，训练后无需同步；
+    其它配置在参数更新后需要调用 refresh()。
+    """
+
+    mlp: MLP
+    precision: str = "float32"
+    fuse_bias: bool = False
+    max_workspaces: int = 8
+    _weights: List[np.ndarray] = field(init=False, repr=False)
+    _biases: List[Optional[np.ndarray]] = field(init=False, repr=False)
+    _scales: List[Optional[np.ndarray]] = field(init=False, repr=False)
+    _workspaces: "OrderedDict[int, List[np.ndarray]]" = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.precision not in INFERENCE_PRECISIONS:
+            raise ValueError(f"precision 必须是 {INFERENCE_PRECISIONS} 之一")
+        self._workspaces = OrderedDict()
+        self.refresh()
+
+    @property
+    def shares_parameters(self) -> bool:
+        return self.precision == "float32" and not self.fuse_bias
+
+    def refresh(self) -> None:
+        """从 MLP 重新生成推理用的权重（参数被训练修改之后调用）。"""
+        self._weights, self._biases, self._scales = [], [], []
+        for w, b in zip(self.mlp._weights, self.mlp._biases):
+            if self.shares_parameters:
+                self._weights.append(w)
+                self._biases.append(b)
+                self._scales.append(None)
+                continue
+
+            full = np.vstack([w, b[None, :]]) if self.fuse_bias else w
+            scale: Optional[np.ndarray] = None
+            if self.precision == "float16":
+                packed = full.astype(np.float16)
+            elif self.precision == "int8":
+                scale = (np.abs(full).max(axis=0) / 127.0).astype(np.float32)
+                scale[scale == 0] = 1.0
+                packed = np.clip(np.rint(full / scale), -127, 127).astype(np.int8)
+            else:
+                packed = np.ascontiguousarray(full, dtype=np.float32)
+
+            self._weights.append(packed)
+            self._biases.append(None if self.fuse_bias else b)
+            self._scales.append(scale)
+
+    @property
+    def weight_nbytes(self) -> int:
+        return sum(w.nbytes for w in self._weights)
+
+    def _workspace(self, batch: int) -> List[np.ndarray]:
+        ws = self._workspaces.get(batch)
+        if ws is not None:
+            self._workspaces.move_to_end(batch)
+            return ws
+
+        extra = 1 if self.fuse_bias else 0
+        sizes = list(self.mlp.layer_sizes)
+        ws = [np.empty((batch, sizes[0] + extra), dtype=np.float32)]
+        for k, size in enumerate(sizes[1:]):
+            is_last = k == len(sizes) - 2
+            ws.append(np.empty((batch, size + (0 if is_last else extra)), dtype=np.float32))
+        if self.fuse_bias:
+            # 常数 1 列只需写一次
+            for buf in ws[:-1]:
+                buf[:, -1] = 1.0
+
+        self._workspaces[batch] = ws
+        if len(self._workspaces) > self.max_workspaces:
+            self._workspaces.popitem(last=False)
+        return ws
+
+    def __call__(self, x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if x.ndim == 1:
+            x = x[None, :]
+        ws = self._workspace(x.shape[0])
+        in_dim = self.mlp.layer_sizes[0]
+
+        if self.fuse_bias:
+            np.copyto(ws[0][:, :in_dim], x, casting="unsafe")
+            h = ws[0]
+        elif x.dtype == np.float32:
+            h = x
+        else:
+            np.copyto(ws[0], x, casting="unsafe")
+            h = ws[0]
+
+        last = len(self._weights) - 1
+        for i, (w, b, scale) in enumerate(zip(self._weights, self._biases, self._scales)):
+            buf = ws[i + 1]
+            if i == last:
+                dst = buf if out is None else out
+            else:
+                dst = buf[:, : self.mlp.layer_sizes[i + 1]] if self.fuse_bias else buf
+            np.matmul(h, w, out=dst)
+            if scale is not None:
+                dst *= scale
+            if b is not None:
+                dst += b
+            if i < last:
+                # 融合偏置时对整块工作区做 ReLU：常数 1 列不受影响，且连续内存不需要 ufunc 缓冲
+                np.maximum(buf, 0.0, out=buf)
+            h = buf
+        return dst
+
 
 @dataclass
 class PolicyNetwork:
@@ -48,15 +288,27 @@ class PolicyNetwork:
     input_size: int
     output_size: int
     hidden_sizes: Tuple[int, int, int] = (256, 128, 64)
+    seed: Optional[int] = None
     _mlp: MLP = field(init=False)
 
     def __post_init__(self) -> None:
         layer_sizes: Tuple[int, ...] = (self.input_size, *self.hidden_sizes, self.output_size)
-        self._mlp = MLP(layer_sizes=layer_sizes)
+        self._mlp = MLP(layer_sizes=layer_sizes, seed=self.seed)
+
+    @property
+    def mlp(self) -> MLP:
+        return self._mlp
 
     def forward(self, state: np.ndarray) -> np.ndarray:
         return self._mlp.forward(state)
 
+    def infer(self, state: np.ndarray) -> np.ndarray:
+        """免分配的前向推理，结果位于工作区中，下一次调用会被覆盖。
+
+        EpsilonGreedyPolicy 每步都走这里；需要自定义策略输出时覆盖 infer。
+        """
+        return self._mlp.inference()(state)
+
 
 @dataclass
 class ValueNetwork:
@@ -64,11 +316,16 @@ class ValueNetwork:
 
     input_size: int
     hidden_sizes: Tuple[int, int, int] = (256, 128, 32)
+    seed: Optional[int] = None
     _mlp: MLP = field(init=False)
 
     def __post_init__(self) -> None:
         layer_sizes: Tuple[int, ...] = (self.input_size, *self.hidden_sizes, 1)
-        self._mlp = MLP(layer_sizes=layer_sizes)
+        self._mlp = MLP(layer_sizes=layer_sizes, seed=self.seed)
+
+    @property
+    def mlp(self) -> MLP:
+        return self._mlp
 
     def forward(self, state: np.ndarray) -> np.ndarray:
         return self._mlp.forward(state)  # (batch, 1)
@@ -80,10 +337,15 @@ class FeatureExtractor:
 
     input_size: int
     feature_dim: int = 32
+    seed: Optional[int] = None
     _mlp: MLP = field(init=False)
 
     def __post_init__(self) -> None:
-        self._mlp = MLP(layer_sizes=(self.input_size, 64, self.feature_dim))
+        self._mlp = MLP(layer_sizes=(self.input_size, 64, self.feature_dim), seed=self.seed)
+
+    @property
+    def mlp(self) -> MLP:
+        return self._mlp
 
     def forward(self, state: np.ndarray) -> np.ndarray:
         return self._mlp.forward(state)
@@ -99,11 +361,28 @@ class WorldModel:
 
     state_dim: int
     num_actions: int
+    seed: Optional[int] = None
     _mlp: MLP = field(init=False)
 
     def __post_init__(self) -> None:
         input_dim = self.state_dim + self.num_actions
-        self._mlp = MLP(layer_sizes=(input_dim, 128, self.state_dim))
+        self._mlp = MLP(layer_sizes=(input_dim, 128, self.state_dim), seed=self.seed)
+
+    @property
+    def mlp(self) -> MLP:
+        return self._mlp
+
+    def encode_batch(self, states: np.ndarray, actions: np.ndarray) -> np.ndarray:
+        """把一批 (state, action) 拼成网络输入：每行动作各不相同，用于训练。"""
+        states = np.asarray(states, dtype=np.float32)
+        if states.ndim == 1:
+            states = states[None, :]
+        batch = states.shape[0]
+        actions = np.asarray(actions, dtype=np.int64).reshape(batch)
+        sa = np.zeros((batch, self.state_dim + self.num_actions), dtype=np.float32)
+        sa[:, : self.state_dim] = states
+        sa[np.arange(batch), self.state_dim + actions] = 1.0
+        return sa
 
     def _concat_state_action(self, state: np.ndarray, action: int) -> np.ndarray:
         if state.ndim == 1:
@@ -119,3 +398,22 @@ class WorldModel:
         if state.ndim == 1:
             state = state[None, :]
         return state + delta
+
+    def predict_next_states(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """批量预测：每行状态配各自的动作，一次前向完成。
+
+        out 可以就是 states 本身，用于原地推进 rollout。
+        """
+        states = np.asarray(states, dtype=np.float32)
+        if states.ndim == 1:
+            states = states[None, :]
+        delta = self._mlp.inference()(self.encode_batch(states, actions))
+        if out is None:
+            return states + delta
+        np.add(states, delta, out=out)
+        return out
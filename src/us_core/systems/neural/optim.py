@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+
+def clip_grad_norm(grads: List[np.ndarray], max_norm: float) -> float:
+    """按全局 L2 范数原地裁剪梯度，返回裁剪前的范数。"""
+    total = float(np.sqrt(sum(float(np.vdot(g, g)) for g in grads)))
+    if max_norm > 0 and total > max_norm:
+        scale = max_norm / (total + 1e-12)
+        for g in grads:
+            g *= scale
+    return total
+
+
+@dataclass
+class SGD:
+    """随机梯度下降（可选动量）。
+
+    params / grads 是一一对应的数组列表（通常来自 MLP.parameters() / gradients()），
+    step() 原地更新参数，动量和临时缓冲都在构造时预分配。
+    """
+
+    params: List[np.ndarray]
+    grads: List[np.ndarray]
+    lr: float = 1e-2
+    momentum: float = 0.0
+    _velocity: List[np.ndarray] = field(init=False, repr=False)
+    _scratch: List[np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if len(self.params) != len(self.grads):
+            raise ValueError("params 和 grads 数量不一致")
+        self._velocity = [np.zeros_like(p) for p in self.params] if self.momentum else []
+        self._scratch = [np.empty_like(p) for p in self.params]
+
+    def step(self) -> None:
+        for i, (p, g) in enumerate(zip(self.params, self.grads)):
+            update = g
+            if self.momentum:
+                v = self._velocity[i]
+                v *= self.momentum
+                v += g
+                update = v
+            s = self._scratch[i]
+            np.multiply(update, self.lr, out=s)
+            p -= s
+
+
+@dataclass
+class Adam:
+    """Adam 优化器（Kingma & Ba 2014），一阶 / 二阶矩估计都预分配并原地更新。"""
+
+    params: List[np.ndarray]
+    grads: List[np.ndarray]
+    lr: float = 1e-3
+    beta1: float = 0.9
+    beta2: float = 0.999
+    eps: float = 1e-8
+    weight_decay: float = 0.0
+    step_count: int = field(default=0, init=False)
+    _m: List[np.ndarray] = field(init=False, repr=False)
+    _v: List[np.ndarray] = field(init=False, repr=False)
+    _scratch: List[np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if len(self.params) != len(self.grads):
+            raise ValueError("params 和 grads 数量不一致")
+        self._m = [np.zeros_like(p) for p in self.params]
+        self._v = [np.zeros_like(p) for p in self.params]
+        self._scratch = [np.empty_like(p) for p in self.params]
+
+    def step(self) -> None:
+        self.step_count += 1
+        t = self.step_count
+        b1, b2 = self.beta1, self.beta2
+        # 偏差修正合并进步长
+        step_size = self.lr * np.sqrt(1.0 - b2 ** t) / (1.0 - b1 ** t)
+
+        for p, g, m, v, s in zip(self.params, self.grads, self._m, self._v, self._scratch):
+            if self.weight_decay:
+                np.multiply(p, self.weight_decay, out=s)
+                g += s
+
+            # m = b1 * m + (1 - b1) * g
+            m *= b1
+            np.multiply(g, 1.0 - b1, out=s)
+            m += s
+
+            # v = b2 * v + (1 - b2) * g^2
+            v *= b2
+            np.multiply(g, g, out=s)
+            s *= 1.0 - b2
+            v += s
+
+            # p -= step_size * m / (sqrt(v) + eps)
+            np.sqrt(v, out=s)
+            s += self.eps
+            np.divide(m, s, out=s)
+            s *= step_size
+            p -= s
+
+
+def make_optimizer(
+    params: List[np.ndarray],
+    grads: List[np.ndarray],
+    kind: str = "adam",
+    lr: Optional[float] = None,
+):
+    """按名字创建优化器："adam" / "sgd"。"""
+    kind = kind.lower()
+    if kind == "adam":
+        return Adam(params, grads, lr=1e-3 if lr is None else lr)
+    if kind == "sgd":
+        return SGD(params, grads, lr=1e-2 if lr is None else lr)
+    raise ValueError(f"未知的优化器类型: {kind}")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from .learning import Batch
+from .networks import MLP, PolicyNetwork, WorldModel
+from .optim import Adam, clip_grad_norm
+
+
+@dataclass
+class TrainStepResult:
+    """一次 train_step 的结果。td_errors 可直接交给 PrioritizedReplayBuffer.update_priorities。"""
+
+    loss: float
+    td_errors: np.ndarray
+    grad_norm: float
+
+
+def regression_step(
+    mlp: MLP,
+    optimizer,
+    x: np.ndarray,
+    y: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    max_grad_norm: Optional[float] = None,
+) -> float:
+    """对 MLP 做一步 (加权) 均方误差回归，返回本步 loss。
+
+    ValueNetwork / FeatureExtractor / WorldModel 都可以通过 .mlp 使用这条路径。
+    """
+    pred = mlp.forward_train(x)
+    y = np.asarray(y, dtype=np.float32).reshape(pred.shape)
+    diff = pred - y  # (B, D)
+    batch = diff.shape[0]
+
+    if weights is None:
+        loss = float(np.mean(diff * diff))
+        grad = diff * (2.0 / diff.size)
+    else:
+        w = np.asarray(weights, dtype=np.float32).reshape(batch, 1)
+        loss = float(np.mean(w * diff * diff))
+        grad = diff * w * (2.0 / diff.size)
+
+    mlp.backward(grad)
+    if max_grad_norm is not None:
+        clip_grad_norm(mlp.gradients(), max_grad_norm)
+    optimizer.step()
+    return loss
+
+
+def world_model_step(
+    world_model: WorldModel,
+    optimizer,
+    batch: Batch,
+    max_grad_norm: Optional[float] = None,
+) -> float:
+    """用一批回放经验训练 WorldModel：拟合 next_state - state 的增量。"""
+    states, actions, _rewards, next_states, _dones = batch
+    x = world_model.encode_batch(states, actions)
+    return regression_step(world_model.mlp, optimizer, x, next_states - states, max_grad_norm=max_grad_norm)
+
+
+@dataclass
+class DQNTrainer:
+    """用回放缓冲区的小批量训练 PolicyNetwork（把输出 logits 当作 Q 值）。
+
+    - 目标值 r + gamma * max_a' Q_target(s', a')，目标网络每 target_sync_interval 步同步一次；
+    - weights 为 PER 的重要性采样权重；返回的 td_errors 用于回写优先级。
+    """
+
+    q_net: PolicyNetwork
+    optimizer: Optional[object] = None
+    gamma: float = 0.99
+    target_sync_interval: int = 500
+    max_grad_norm: Optional[float] = 10.0
+    steps: int = field(default=0, init=False)
+    _target: MLP = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        mlp = self.q_net.mlp
+        if self.optimizer is None:
+            self.optimizer = Adam(mlp.parameters(), mlp.gradients(), lr=1e-3)
+        self._target = copy.deepcopy(mlp)
+
+    @property
+    def target(self) -> MLP:
+        return self._target
+
+    def sync_target(self) -> None:
+        self._target.copy_weights_from(self.q_net.mlp)
+
+    def compute_targets(self, rewards: np.ndarray, next_states: np.ndarray, dones: np.ndarray) -> np.ndarray:
+        q_next = self._target.forward(next_states).max(axis=1)
+        not_done = ~np.asarray(dones, dtype=bool)
+        return np.asarray(rewards, dtype=np.float32) + self.gamma * q_next * not_done
+
+    def train_step(self, batch: Batch, weights: Optional[np.ndarray] = None) -> TrainStepResult:
+        states, actions, rewards, next_states, dones = batch
+        targets = self.compute_targets(rewards, next_states, dones)
+
+        mlp = self.q_net.mlp
+        q = mlp.forward_train(states)  # (B, A)
+        rows = np.arange(q.shape[0])
+        actions = np.asarray(actions, dtype=np.int64)
+        td = q[rows, actions] - targets
+        n = td.shape[0]
+
+        # 只有被选中的动作有梯度
+        grad = np.zeros_like(q)
+        if weights is None:
+            loss = float(np.mean(td * td))
+            grad[rows, actions] = td * (2.0 / n)
+        else:
+            w = np.asarray(weights, dtype=np.float32)
+            loss = float(np.mean(w * td * td))
+            grad[rows, actions] = w * td * (2.0 / n)
+
+        mlp.backward(grad)
+        grad_norm = (
+            clip_grad_norm(mlp.gradients(), self.max_grad_norm)
+            if self.max_grad_norm is not None
+            else 0.0
+        )
+        self.optimizer.step()
+
+        self.steps += 1
+        if self.target_sync_interval > 0 and self.steps % self.target_sync_interval == 0:
+            self.sync_target()
+
+        return TrainStepResult(loss=loss, td_errors=td, grad_norm=grad_norm)
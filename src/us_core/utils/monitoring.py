@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import math
 import time
-from typing import Callable
+from typing import Callable, Dict, Iterable, Sequence
 
 
 def measure_step_throughput(step_fn: Callable[[], None], num_steps: int = 100) -> float:
@@ -24,3 +25,18 @@ def measure_step_throughput(step_fn: Callable[[], None], num_steps: int = 100) -
     if duration <= 0:
         return float("inf")
     return num_steps / duration
+
+
+def latency_percentiles_ms(
+    latencies: Iterable[float], percentiles: Sequence[float] = (50, 95, 99)
+) -> Dict[str, float]:
+    """Nearest-rank percentiles of latencies given in seconds, returned in ms as {"p50": ...}."""
+    ordered = sorted(latencies)
+    n = len(ordered)
+    if n == 0:
+        return {}
+    out: Dict[str, float] = {}
+    for p in percentiles:
+        rank = max(1, math.ceil(p / 100.0 * n))
+        out[f"p{p:g}"] = ordered[min(rank, n) - 1] * 1e3
+    return out
@@ -0,0 +1,286 @@
+"""
+按系统的心跳剖析器（opt-in）。
+
+每次系统 step 记录：
+- wall 时间（perf_counter_ns）
+- CPU 时间（thread_time_ns，只统计执行该 step 的线程）
+- tracemalloc 分配增量（step 结束时的净增量和 step 内的峰值增量）
+
+样本写入固定容量的环形缓冲（NumPy 列存储），同时累积到 HDR 风格的对数-线性直方图，
+可导出 JSON 摘要和 flamegraph 兼容的 collapsed stacks。enable() / disable() 可在运行中切换。
+
+注意：tracemalloc 是进程级的，并发模式下多个系统同时运行时分配增量会互相混入；
+需要精确的分配数据时请用顺序模式。
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+PROFILE_METRICS = ("wall_ns", "cpu_ns", "alloc_bytes", "peak_bytes")
+
+
+@dataclass
+class HdrHistogram:
+    """对数-线性直方图（HdrHistogram 的简化版）。
+
+    小于 2**sub_bucket_bits 的值精确计数；更大的值按二的幂分段，每段再均分为
+    2**(sub_bucket_bits-1) 个子桶，相对误差不超过 2**-(sub_bucket_bits-1)。
+    只接受非负整数（纳秒、字节）。
+    """
+
+    sub_bucket_bits: int = 6
+    counts: List[int] = field(default_factory=list, repr=False)
+    total: int = 0
+    min_value: Optional[int] = None
+    max_value: int = 0
+    sum_value: int = 0
+
+    def _index(self, value: int) -> int:
+        bits = self.sub_bucket_bits
+        if value < (1 << bits):
+            return value
+        shift = value.bit_length() - bits
+        # value >> shift 落在 [2**(bits-1), 2**bits)
+        return shift * (1 << (bits - 1)) + (value >> shift)
+
+    def _lower_bound(self, index: int) -> int:
+        bits = self.sub_bucket_bits
+        if index < (1 << bits):
+            return index
+        half = 1 << (bits - 1)
+        shift, sub = divmod(index - (1 << bits), half)
+        shift += 1
+        return (half + sub) << shift
+
+    def record(self, value: int) -> None:
+        value = max(0, int(value))
+        idx = self._index(value)
+        if idx >= len(self.counts):
+            self.counts.extend([0] * (idx + 1 - len(self.counts)))
+        self.counts[idx] += 1
+        self.total += 1
+        self.sum_value += value
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+
+    def percentile(self, p: float) -> int:
+        """第 p 百分位：取所在桶的上界（与 HdrHistogram 的 highest equivalent value 一致），不超过真实最大值。"""
+        if self.total == 0:
+            return 0
+        target = max(1, math.ceil(p / 100.0 * self.total))
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._lower_bound(idx + 1) - 1, self.max_value)
+        return self.max_value
+
+    @property
+    def mean(self) -> float:
+        return self.sum_value / self.total if self.total else 0.0
+
+    def summary(self, percentiles: Sequence[float] = (50, 90, 99, 99.9)) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "count": self.total,
+            "min": self.min_value or 0,
+            "max": self.max_value,
+            "mean": self.mean,
+        }
+        for p in percentiles:
+            out[f"p{p:g}"] = self.percentile(p)
+        return out
+
+
+@dataclass
+class SystemProfiler:
+    """按系统记录每拍的 wall / CPU / 分配数据。"""
+
+    capacity: int = 4096
+    track_allocations: bool = True
+    enabled: bool = False
+    _beat: np.ndarray = field(init=False, repr=False)
+    _system: np.ndarray = field(init=False, repr=False)
+    _values: np.ndarray = field(init=False, repr=False)  # (capacity, len(PROFILE_METRICS))
+    _size: int = field(default=0, init=False)
+    _pos: int = field(default=0, init=False)
+    _names: List[str] = field(default_factory=list, init=False, repr=False)
+    _ids: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _histograms: Dict[str, Dict[str, HdrHistogram]] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _started_tracemalloc: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self._beat = np.zeros(self.capacity, dtype=np.int64)
+        self._system = np.zeros(self.capacity, dtype=np.int32)
+        self._values = np.zeros((self.capacity, len(PROFILE_METRICS)), dtype=np.int64)
+        if self.enabled:
+            self.enabled = False
+            self.enable(self.track_allocations)
+
+    # ---------- 开关 ----------
+
+    def enable(self, track_allocations: Optional[bool] = None) -> None:
+        if track_allocations is not None:
+            self.track_allocations = track_allocations
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._size = self._pos = 0
+            self._histograms.clear()
+            self._names.clear()
+            self._ids.clear()
+
+    # ---------- 记录 ----------
+
+    @contextmanager
+    def measure(self, system: str, beat: int = 0) -> Iterator[None]:
+        """包住一次 step；未启用时几乎零开销。"""
+        if not self.enabled:
+            yield
+            return
+        track = self.track_allocations and tracemalloc.is_tracing()
+        if track:
+            mem0 = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        cpu0 = time.thread_time_ns()
+        wall0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - wall0
+            cpu = time.thread_time_ns() - cpu0
+            alloc = peak = 0
+            if track:
+                mem1, peak1 = tracemalloc.get_traced_memory()
+                alloc, peak = mem1 - mem0, max(0, peak1 - mem0)
+            self.record(system, beat, wall, cpu, alloc, peak)
+
+    def record(
+        self,
+        system: str,
+        beat: int,
+        wall_ns: int,
+        cpu_ns: int,
+        alloc_bytes: int = 0,
+        peak_bytes: int = 0,
+    ) -> None:
+        with self._lock:
+            sid = self._ids.get(system)
+            if sid is None:
+                sid = len(self._names)
+                self._ids[system] = sid
+                self._names.append(system)
+                self._histograms[system] = {m: HdrHistogram() for m in PROFILE_METRICS}
+            pos = self._pos
+            self._beat[pos] = beat
+            self._system[pos] = sid
+            row = self._values[pos]
+            row[0], row[1], row[2], row[3] = wall_ns, cpu_ns, alloc_bytes, peak_bytes
+            self._pos = (pos + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+            hists = self._histograms[system]
+            hists["wall_ns"].record(wall_ns)
+            hists["cpu_ns"].record(cpu_ns)
+            # 净增量可能为负（释放多于分配），直方图只统计非负部分
+            hists["alloc_bytes"].record(max(0, alloc_bytes))
+            hists["peak_bytes"].record(peak_bytes)
+
+    # ---------- 读取 / 导出 ----------
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ordered_slice(self) -> np.ndarray:
+        """环形缓冲中样本的时间顺序下标。"""
+        if self._size < self.capacity:
+            return np.arange(self._size)
+        return (np.arange(self.capacity) + self._pos) % self.capacity
+
+    def samples(self, system: Optional[str] = None) -> List[Dict[str, Any]]:
+        """按时间顺序返回缓冲中的样本。"""
+        with self._lock:
+            order = self._ordered_slice()
+            out: List[Dict[str, Any]] = []
+            for i in order:
+                name = self._names[self._system[i]]
+                if system is not None and name != system:
+                    continue
+                rec: Dict[str, Any] = {"beat": int(self._beat[i]), "system": name}
+                for j, metric in enumerate(PROFILE_METRICS):
+                    rec[metric] = int(self._values[i, j])
+                out.append(rec)
+            return out
+
+    def histogram(self, system: str, metric: str = "wall_ns") -> HdrHistogram:
+        return self._histograms[system][metric]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """每个系统、每个指标的直方图摘要（覆盖启用以来的全部样本）。"""
+        with self._lock:
+            return {
+                name: {metric: hist.summary() for metric, hist in hists.items()}
+                for name, hists in self._histograms.items()
+            }
+
+    def to_collapsed(self, metric: str = "wall_ns", root: str = "heartbeat") -> str:
+        """flamegraph.pl / speedscope 可读的 collapsed stacks：每个系统一行 "root;system value"。
+
+        value 为环形缓冲内该指标的总和（wall/cpu 换算成微秒）。
+        """
+        if metric not in PROFILE_METRICS:
+            raise ValueError(f"metric 必须是 {PROFILE_METRICS} 之一")
+        col = PROFILE_METRICS.index(metric)
+        with self._lock:
+            order = self._ordered_slice()
+            ids = self._system[order]
+            values = np.clip(self._values[order, col], 0, None)
+            totals = np.bincount(ids, weights=values, minlength=len(self._names))
+            names = list(self._names)
+        scale = 1e-3 if metric.endswith("_ns") else 1.0
+        lines = [f"{root};{name} {int(round(total * scale))}" for name, total in zip(names, totals) if total > 0]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def dump_json(self, path: Union[str, Path], include_samples: bool = True) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload: Dict[str, Any] = {
+            "capacity": self.capacity,
+            "track_allocations": self.track_allocations,
+            "summary": self.summary(),
+        }
+        if include_samples:
+            payload["samples"] = self.samples()
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+    def dump_collapsed(self, path: Union[str, Path], metric: str = "wall_ns") -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_collapsed(metric), encoding="utf-8")
+        return path
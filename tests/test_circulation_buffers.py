@@ -3,6 +3,8 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
@@ -52,3 +54,166 @@ def test_message_bus_publish_and_get():
     assert len(msgs2) == 1
     # 再次获取，仍然存在
     assert len(bus.get_messages("topic2", clear=False)) == 1
+
+
+def test_message_bus_fan_out_with_independent_cursors():
+    bus = MessageBus()
+    bus.subscribe("a", "perception")
+    bus.subscribe("b", "*")
+    bus.publish("perception", 1)
+    bus.publish("action_queued", 2)
+    bus.publish("perception", 3)
+
+    assert [m.message for m in bus.poll("a")] == [1, 3]
+    # 通配订阅跨 topic 按发布顺序
+    got = bus.poll("b", max_items=2)
+    assert [(m.topic, m.message) for m in got] == [("perception", 1), ("action_queued", 2)]
+    assert bus.pending("b") == 1
+    assert [m.message for m in bus.poll("b")] == [3]
+    assert bus.poll("a") == []
+    # 旧接口不受订阅者影响
+    assert bus.get_messages("perception") == [1, 3]
+
+
+def test_message_bus_wildcard_picks_up_new_topics():
+    bus = MessageBus()
+    bus.publish("sensor.old", "before")
+    bus.subscribe("s", "sensor.*")
+    bus.publish("sensor.new", "x")
+    bus.publish("motor.cmd", "y")
+    assert [m.message for m in bus.poll("s")] == ["x"]
+
+
+def test_message_bus_drop_oldest_counts_drops():
+    bus = MessageBus(capacity=4)
+    sub = bus.subscribe("slow", "t")
+    for i in range(10):
+        assert bus.publish("t", i)
+    assert [m.message for m in bus.poll("slow")] == [6, 7, 8, 9]
+    assert sub.dropped == 6
+    assert bus.stats()["t"]["retained"] == 4
+
+
+def test_message_bus_drop_newest_and_block_reject_when_slowest_is_full():
+    for policy in ("drop_newest", "block"):
+        bus = MessageBus(capacity=3, overflow=policy)
+        bus.subscribe("slow", "t")
+        results = [bus.publish("t", i) for i in range(5)]
+        assert results == [True, True, True, False, False]
+        assert bus.stats()["t"]["rejected"] == 2
+        assert [m.message for m in bus.poll("slow", max_items=1)] == [0]
+        assert bus.publish("t", 99)
+        assert [m.message for m in bus.poll("slow")] == [1, 2, 99]
+
+
+def test_message_bus_rejects_bad_config():
+    with pytest.raises(ValueError):
+        MessageBus(capacity=0)
+    with pytest.raises(ValueError):
+        MessageBus(overflow="spill")
+    bus = MessageBus()
+    bus.configure_topic("t", capacity=2)
+    bus.publish("t", 1)
+    with pytest.raises(ValueError):
+        bus.configure_topic("t", capacity=8)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_action_queue_cancel_and_reprioritize():
+    q = ActionQueue()
+    a = q.push("a", priority=1)
+    b = q.push("b", priority=2)
+    c = q.push("c", priority=3)
+
+    assert q.cancel(b)
+    assert not q.cancel(b)
+    assert q.reprioritize(c, 0)
+    assert b not in q and len(q) == 2
+    assert [x for x, _ in q.drain()] == ["c", "a"]
+    assert not q.reprioritize(a, 5)
+
+
+def test_action_queue_push_many_matches_push_order():
+    items = [(f"x{i}", (i * 7) % 5, {"i": i}) for i in range(200)]
+    q1, q2 = ActionQueue(), ActionQueue()
+    for action, prio, meta in items:
+        q1.push(action, priority=prio, metadata=meta)
+    handles = q2.push_many(items)
+    assert handles == list(range(200))
+    # 小批量走 heappush 分支
+    q2.push_many([("late", 0)])
+    q1.push("late", priority=0)
+    assert q1.drain() == q2.drain()
+
+
+def test_action_queue_aging_prevents_starvation():
+    clock = _FakeClock()
+    q = ActionQueue(aging_rate=1.0, clock=clock)
+    q.push("old-low", priority=5)
+    clock.now = 10.0
+    q.push("new-high", priority=0)
+    # 等了 10 秒的低优先级动作，有效优先级 5 - 10 < 0
+    assert q.pop_next()[0] == "old-low"
+
+    no_aging = ActionQueue(clock=clock)
+    no_aging.push("old-low", priority=5)
+    no_aging.push("new-high", priority=0)
+    assert no_aging.pop_next()[0] == "new-high"
+
+
+def test_action_queue_deadlines():
+    clock = _FakeClock()
+    q = ActionQueue(clock=clock)
+    q.push("late", priority=1, deadline=50.0)
+    q.push("soon", priority=1, deadline=5.0)
+    q.push("gone", priority=0, deadline=1.0)
+    clock.now = 2.0
+    assert [x for x, _ in q.drain()] == ["soon", "late"]
+    assert [x for x, _ in q.drain_expired()] == ["gone"]
+
+    edf = ActionQueue(ordering="deadline", clock=clock)
+    edf.push("urgent-low", priority=9, deadline=3.0)
+    edf.push("no-deadline", priority=0)
+    edf.push("relaxed-high", priority=0, deadline=30.0)
+    assert [x for x, _ in edf.drain()] == ["urgent-low", "relaxed-high", "no-deadline"]
+
+
+def test_action_queue_expired_backlog_is_bounded():
+    clock = _FakeClock()
+    q = ActionQueue(clock=clock, expired_capacity=3)
+    q.push_many((f"a{i}", 0, None, 1.0) for i in range(10))
+    clock.now = 2.0
+    assert q.drain() == []
+
+    assert q.expired_count == 10
+    assert [x for x, _ in q.drain_expired()] == ["a7", "a8", "a9"]
+    assert q.drain_expired() == []
+
+
+def test_action_queue_reprioritize_keeps_or_clears_deadline():
+    clock = _FakeClock()
+    q = ActionQueue(clock=clock)
+    keep = q.push("keep", priority=5, deadline=1.0)
+    clear = q.push("clear", priority=5, deadline=1.0)
+    q.reprioritize(keep, 0)
+    q.reprioritize(clear, 1, deadline=None)
+    clock.now = 2.0
+    assert [x for x, _ in q.drain()] == ["clear"]
+    assert [x for x, _ in q.drain_expired()] == ["keep"]
+
+
+def test_action_queue_compacts_tombstones():
+    q = ActionQueue()
+    handles = q.push_many([(i, i) for i in range(1000)])
+    for h in handles[:900]:
+        q.cancel(h)
+    assert len(q) == 100
+    assert len(q._heap) < 600
+    assert q.pop_next()[0] == 900
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.systems.circulation.concurrent import (  # noqa: E402
+    AsyncActionQueue,
+    AsyncPerceptionBuffer,
+    ThreadSafeActionQueue,
+    ThreadSafeMessageBus,
+    ThreadSafePerceptionBuffer,
+)
+from us_core.systems.circulation.core import CirculationSystem  # noqa: E402
+
+
+def test_thread_safe_buffer_producers_and_consumers_lose_nothing():
+    buf = ThreadSafePerceptionBuffer(maxlen=100_000)
+    n_producers, per_producer = 4, 2_000
+    received = []
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def produce(pid: int) -> None:
+        for i in range(per_producer):
+            buf.push((pid, i))
+
+    def consume() -> None:
+        while not (done.is_set() and len(buf) == 0):
+            items = buf.get_batch(max_items=64, timeout=0.01)
+            with lock:
+                received.extend(items)
+
+    consumers = [threading.Thread(target=consume) for _ in range(2)]
+    producers = [threading.Thread(target=produce, args=(p,)) for p in range(n_producers)]
+    for t in consumers + producers:
+        t.start()
+    for t in producers:
+        t.join()
+    done.set()
+    for t in consumers:
+        t.join()
+
+    assert len(received) == n_producers * per_producer
+    assert len(set(received)) == len(received)
+
+
+def test_thread_safe_get_times_out():
+    assert ThreadSafePerceptionBuffer().get(timeout=0.01) is None
+    q = ThreadSafeActionQueue()
+    assert q.get_batch(timeout=0.01) == []
+    q.push("b", priority=2)
+    q.push("a", priority=1)
+    assert [a for a, _ in q.get_batch(max_items=5)] == ["a", "b"]
+
+
+def test_thread_safe_bus_block_waits_for_slowest_subscriber():
+    bus = ThreadSafeMessageBus(capacity=2, overflow="block")
+    bus.subscribe("slow", "t")
+    assert bus.publish("t", 0) and bus.publish("t", 1)
+    assert bus.publish("t", 2, timeout=0.01) is False
+
+    reader = threading.Timer(0.02, lambda: bus.poll("slow", max_items=1))
+    reader.start()
+    assert bus.publish("t", 2, timeout=2.0) is True
+    reader.join()
+    assert [m.message for m in bus.poll("slow")] == [1, 2]
+
+
+def test_thread_safe_bus_block_gives_up_when_consumer_never_polls():
+    assert ThreadSafeMessageBus().block_timeout is not None  # 默认不会无限等待
+
+    bus = ThreadSafeMessageBus(capacity=1, overflow="block", block_timeout=0.05)
+    bus.subscribe("stalled", "t")
+    assert bus.publish("t", 0)
+
+    start = time.perf_counter()
+    assert bus.publish("t", 1) is False  # 没传 timeout：按 block_timeout 放弃
+    assert time.perf_counter() - start < 1.0
+    assert bus.stats()["t"]["rejected"] == 1
+
+
+def test_async_buffers_await_items():
+    async def run():
+        buf = AsyncPerceptionBuffer()
+        q = AsyncActionQueue()
+
+        getter = asyncio.ensure_future(buf.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        buf.push("p1")
+        assert await getter == "p1"
+
+        loop = asyncio.get_running_loop()
+        threading.Thread(target=lambda: q.push_threadsafe(loop, "act", priority=1)).start()
+        action, _meta = await asyncio.wait_for(q.get(), timeout=2.0)
+        assert action == "act"
+        assert q.pop_next() is None  # 同步接口不变，可直接给 CirculationSystem 用
+
+        for i in range(5):
+            buf.push(i)
+        assert await buf.get_batch(max_items=3) == [0, 1, 2]
+        assert buf.drain() == [3, 4]
+
+        # 被取消的等待者不会吞掉后续数据
+        waiter = asyncio.ensure_future(buf.get())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        buf.push("late")
+        assert await buf.get() == "late"
+
+    asyncio.run(run())
+
+
+def test_circulation_system_thread_safe_factory():
+    system = CirculationSystem.thread_safe()
+    system.queue_action({"type": "b"}, priority=2)
+    system.queue_action({"type": "a"}, priority=1)
+    assert system.get_actions_to_execute(limit=1) == [{"type": "a"}]
+    assert isinstance(system.action_queue, ThreadSafeActionQueue)
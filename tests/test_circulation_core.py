@@ -57,3 +57,16 @@ def test_circulation_ask_model_uses_client():
 def test_circulation_ask_model_without_client_returns_none():
     system = CirculationSystem(model_client=None)
     assert system.ask_model([{"role": "user", "content": "hi"}]) is None
+
+
+def test_circulation_fan_out_to_subscribers():
+    system = CirculationSystem()
+    system.subscribe("memory", "*")
+    system.subscribe("motor", "action_queued")
+
+    system.ingest_perception({"value": 1})
+    system.queue_action({"type": "move"}, priority=1)
+
+    assert [m.topic for m in system.poll_messages("memory")] == ["perception", "action_queued"]
+    motor = system.poll_messages("motor")
+    assert len(motor) == 1 and motor[0].message["action"] == {"type": "move"}
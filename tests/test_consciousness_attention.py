@@ -1,9 +1,14 @@
+import math
+
+import numpy as np
 import pytest
 
 from us_core.systems.consciousness.attention import (
     AttentionFilter,
     AttentionAllocator,
+    AttentionHistory,
     AttentionMonitor,
+    allocation_entropy,
 )
 
 
@@ -36,3 +41,98 @@ def test_attention_monitor_keeps_bounded_history():
     # 应该保留最近两次
     assert history[0].scores == {"b": 0.2}
     assert history[1].scores == {"c": 0.3}
+
+
+def test_attention_allocator_array_matches_dict():
+    allocator = AttentionAllocator()
+    arr = allocator.allocate_array([1.0, 3.0])
+
+    assert arr.tolist() == pytest.approx([0.25, 0.75])
+    assert allocator.allocate_array([0.0, 0.0]).tolist() == [0.5, 0.5]
+    assert allocator.allocate({"a": 0.0, "b": 0.0}) == {"a": 0.5, "b": 0.5}
+
+
+def test_attention_filter_mask():
+    f = AttentionFilter(min_relevance=0.5)
+    assert f.mask([0.2, 0.5, 0.8]).tolist() == [False, True, True]
+
+
+def test_allocation_entropy_bits():
+    assert allocation_entropy([1.0, 0.0]) == 0.0
+    assert allocation_entropy([0.25] * 4) == pytest.approx(2.0)
+
+
+def test_attention_history_channels_by_time_with_absent_channels():
+    h = AttentionHistory(capacity=3)
+    h.append({"a": 1.0})
+    h.append({"a": 1.0, "b": 3.0})
+
+    arr = h.to_array()
+    assert h.channels == ["a", "b"]
+    assert arr.shape == (2, 2)
+    assert arr[0].tolist() == [1.0, 1.0]
+    assert math.isnan(arr[1, 0]) and arr[1, 1] == 3.0
+    assert h.to_array(allocation=True)[:, 1].tolist() == pytest.approx([0.25, 0.75])
+    assert h.snapshots() == [{"a": 1.0}, {"a": 1.0, "b": 3.0}]
+    assert h.latest() == {"a": 1.0, "b": 3.0}
+
+    h.clear()
+    assert len(h) == 0 and h.latest() is None and h.moving_average() == {}
+    assert h.channels == [] and h.to_array().shape == (0, 0)
+
+
+def test_attention_history_windowed_stats_match_recompute():
+    rng = np.random.default_rng(1)
+    names = [f"c{i}" for i in range(7)]
+    h = AttentionHistory(capacity=16, window=5)
+    records = []
+    for _ in range(60):
+        present = rng.random(len(names)) < 0.7
+        rec = {n: float(v) for n, v, p in zip(names, rng.random(len(names)), present) if p}
+        records.append(rec)
+        h.append(rec)
+
+    window = records[-5:]
+    for ch, avg in h.moving_average().items():
+        assert avg == pytest.approx(sum(r.get(ch, 0.0) for r in window) / 5)
+
+    allocator = AttentionAllocator()
+    allocs = [allocator.allocate(r) for r in window]
+    for ch, avg in h.moving_average(allocation=True).items():
+        assert avg == pytest.approx(sum(a.get(ch, 0.0) for a in allocs) / 5)
+
+    entropies = [allocation_entropy(list(a.values())) for a in allocs]
+    assert h.latest_entropy() == pytest.approx(entropies[-1])
+    assert h.mean_entropy() == pytest.approx(sum(entropies) / 5)
+    assert len(h) == 16 and h.total_records == 60
+    assert h.snapshots() == records[-16:]
+
+
+def test_attention_history_validates_window():
+    with pytest.raises(ValueError):
+        AttentionHistory(capacity=-1)
+    with pytest.raises(ValueError):
+        AttentionHistory(capacity=4, window=5)
+
+
+def test_attention_monitor_stats():
+    monitor = AttentionMonitor(max_history=10, window=2)
+    monitor.record({"a": 1.0, "b": 1.0})
+    monitor.record({"a": 1.0})
+    monitor.record({"a": 3.0, "b": 1.0})
+
+    stats = monitor.stats()
+    assert stats["records"] == 3
+    assert monitor.entropy() == pytest.approx(allocation_entropy([0.75, 0.25]))
+    assert monitor.moving_average() == pytest.approx({"a": 0.875, "b": 0.125})
+    assert stats["mean_entropy"] == pytest.approx(allocation_entropy([0.75, 0.25]) / 2)
+
+
+def test_attention_monitor_zero_history_keeps_nothing():
+    monitor = AttentionMonitor(max_history=0)
+    monitor.record({"a": 1.0})
+
+    stats = monitor.stats()
+    assert monitor.history == []
+    assert stats["records"] == 0 and stats["total_records"] == 1
+    assert stats["moving_average"] == {} and monitor.entropy() == 0.0
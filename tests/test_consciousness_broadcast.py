@@ -1,4 +1,16 @@
-from us_core.systems.consciousness.broadcast import BroadcastSystem
+import threading
+import time
+
+import pytest
+
+from us_core.utils.monitoring import latency_percentiles_ms
+from us_core.systems.consciousness.broadcast import (
+    DELIVERY_THREADED,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    LATEST_ONLY,
+    BroadcastSystem,
+)
 
 
 def test_broadcast_delivers_to_all_subscribers():
@@ -29,3 +41,160 @@ def test_unsubscribe_removes_subscriber():
 
     assert calls == ["s2"]
     assert system.subscriber_count == 1
+
+
+def test_sync_mode_records_latency_and_propagates_errors():
+    system = BroadcastSystem()
+
+    def boom(msg):
+        raise RuntimeError("bad subscriber")
+
+    system.subscribe("ok", lambda msg: None)
+    system.broadcast({"x": 1})
+    stats = system.stats()["ok"]
+    assert stats["delivered"] == 1
+    assert stats["latency_p50_ms"] >= 0.0
+
+    system.subscribe("bad", boom)
+    with pytest.raises(RuntimeError):
+        system.broadcast({"x": 2})
+    bad = system.stats()["bad"]
+    assert bad["errors"] == 1 and bad["delivered"] == 0
+
+
+def test_threaded_slow_subscriber_does_not_block_others():
+    system = BroadcastSystem(mode=DELIVERY_THREADED)
+    release = threading.Event()
+    fast = []
+
+    system.subscribe("slow", lambda msg: release.wait(5.0))
+    system.subscribe("fast", lambda msg: fast.append(msg["i"]))
+    try:
+        t0 = time.perf_counter()
+        for i in range(5):
+            assert system.broadcast({"i": i}) == 2
+        assert time.perf_counter() - t0 < 1.0
+
+        deadline = time.monotonic() + 5.0
+        while len(fast) < 5 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert fast == [0, 1, 2, 3, 4]
+        assert system.pending("slow") >= 3
+    finally:
+        release.set()
+        system.close(timeout=5.0)
+
+
+def _blocked_subscriber(system, name, **kwargs):
+    """Subscribe a callback that blocks on its first message until released."""
+    started = threading.Event()
+    release = threading.Event()
+    got = []
+
+    def cb(msg):
+        started.set()
+        release.wait(5.0)
+        got.append(msg["i"])
+
+    system.subscribe(name, cb, **kwargs)
+    return started, release, got
+
+
+@pytest.mark.parametrize(
+    "policy, expected, dropped, coalesced",
+    [
+        (DROP_OLDEST, [0, 3, 4], 2, 0),
+        (DROP_NEWEST, [0, 1, 2], 2, 0),
+        (LATEST_ONLY, [0, 4], 0, 3),
+    ],
+)
+def test_threaded_backlog_policies(policy, expected, dropped, coalesced):
+    system = BroadcastSystem(mode=DELIVERY_THREADED)
+    started, release, got = _blocked_subscriber(system, "s", backlog=2, policy=policy)
+    try:
+        system.broadcast({"i": 0})
+        assert started.wait(5.0)  # 第 0 条已被取走，正在处理
+        for i in range(1, 5):
+            system.broadcast({"i": i})
+        release.set()
+        assert system.flush(timeout=5.0)
+    finally:
+        system.close(timeout=5.0)
+
+    assert got == expected
+
+
+def test_threaded_policy_counters_and_latency():
+    system = BroadcastSystem(mode=DELIVERY_THREADED, backlog=1, policy=LATEST_ONLY)
+    started, release, got = _blocked_subscriber(system, "s")
+    system.broadcast({"i": 0})
+    assert started.wait(5.0)
+    for i in range(1, 4):
+        system.broadcast({"i": i})
+    release.set()
+    assert system.flush(timeout=5.0)
+
+    stats = system.stats()["s"]
+    system.close(timeout=5.0)
+    assert stats["delivered"] == 2
+    assert stats["coalesced"] == 2
+    assert stats["pending"] == 0
+    assert stats["latency_p99_ms"] >= stats["latency_p50_ms"] > 0.0
+
+
+def test_threaded_errors_are_isolated():
+    system = BroadcastSystem(mode=DELIVERY_THREADED)
+    received = []
+
+    def boom(msg):
+        raise ValueError("nope")
+
+    system.subscribe("bad", boom)
+    system.subscribe("good", received.append)
+    for i in range(3):
+        system.broadcast({"x": i})
+    assert system.flush(timeout=5.0)
+    stats = system.stats()
+    system.close(timeout=5.0)
+
+    assert received == [{"x": 0}, {"x": 1}, {"x": 2}]
+    assert stats["bad"]["errors"] == 3
+    assert stats["bad"]["delivered"] == 0
+    assert "latency_p50_ms" not in stats["bad"]
+    assert stats["good"]["delivered"] == 3 and stats["good"]["errors"] == 0
+    assert "ValueError" in stats["bad"]["last_error"]
+
+
+def test_close_drains_pending_messages():
+    system = BroadcastSystem(mode=DELIVERY_THREADED, backlog=100)
+    received = []
+    system.subscribe("s", lambda msg: (time.sleep(0.001), received.append(msg["i"])))
+    for i in range(20):
+        system.broadcast({"i": i})
+    system.close(timeout=5.0)
+
+    assert received == list(range(20))
+    assert system.subscriber_count == 0
+    assert system.broadcast({"i": 99}) == 0
+
+
+def test_invalid_configuration_rejected():
+    with pytest.raises(ValueError):
+        BroadcastSystem(mode="carrier-pigeon")
+    with pytest.raises(ValueError):
+        BroadcastSystem(backlog=0)
+    with pytest.raises(ValueError):
+        BroadcastSystem().subscribe("s", print, policy="random")
+
+
+def test_latency_percentiles_match_heartbeat_metrics():
+    system = BroadcastSystem()
+    system.subscribe("s", lambda msg: time.sleep(msg["sleep"]))
+    for delay in (0.0, 0.0, 0.0, 0.01):
+        system.broadcast({"sleep": delay})
+
+    sub = system._subscribers["s"]
+    stats = system.stats()["s"]
+    expected = latency_percentiles_ms(sub._latencies)
+    assert stats["latency_p50_ms"] == expected["p50"]
+    assert stats["latency_p99_ms"] == expected["p99"] == stats["max_latency_ms"]
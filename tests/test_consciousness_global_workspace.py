@@ -1,4 +1,8 @@
+import numpy as np
+import pytest
+
 from us_core.systems.consciousness.global_workspace import (
+    SMALL_COMPETE_SIZE,
     GlobalWorkspaceSystem,
     WorkspaceItem,
 )
@@ -48,3 +52,122 @@ def test_global_workspace_respects_min_score_threshold():
     result = gw.compete_and_broadcast(inputs)
     assert result is None
     assert gw.last_winner is None
+
+
+def test_compete_top_k_matches_full_ranking():
+    gw = GlobalWorkspaceSystem()
+    inputs = {
+        f"s{i}": {"content": f"c{i}", "newness": (i * 37 % 11) / 10, "relevance": 0.5}
+        for i in range(20)
+    }
+
+    full = gw.compete(inputs)
+    top = gw.compete(inputs, top_k=3)
+    assert [it.source for it in top] == [it.source for it in full[:3]]
+    assert all(a.score >= b.score for a, b in zip(full, full[1:]))
+
+
+def test_compete_keeps_input_order_on_ties():
+    gw = GlobalWorkspaceSystem()
+    inputs = {name: {"content": name} for name in ("b", "a", "c")}
+
+    assert [it.source for it in gw.compete(inputs)] == ["b", "a", "c"]
+
+
+def test_compete_batch_clips_and_selects_top_k():
+    gw = GlobalWorkspaceSystem()
+    rng = np.random.default_rng(0)
+    features = rng.uniform(-0.5, 1.5, size=(5000, 4))
+    sources = [f"s{i}" for i in range(len(features))]
+
+    top = gw.compete_batch(features, sources, top_k=5)
+
+    expected = np.clip(features, 0.0, 1.0) @ np.array([0.3, 0.3, 0.2, 0.2])
+    best = np.argsort(-expected, kind="stable")[:5]
+    assert [it.source for it in top] == [sources[i] for i in best]
+    assert [it.score for it in top] == pytest.approx(expected[best].tolist())
+    assert all(0.0 <= it.newness <= 1.0 for it in top)
+
+
+def test_compete_batch_accepts_columns_with_defaults():
+    gw = GlobalWorkspaceSystem()
+    columns = {"newness": np.array([0.0, 1.0, 0.2]), "relevance": [0.1, 0.1, 0.5]}
+
+    top = gw.compete_batch(columns, ["x", "y", "z"], contents=["cx", "cy", "cz"], top_k=2)
+
+    assert [it.source for it in top] == ["y", "z"]
+    assert top[0].content == "cy"
+    assert top[0].affect == 0.5
+
+
+def test_compete_batch_validates_shapes():
+    gw = GlobalWorkspaceSystem()
+    with pytest.raises(ValueError):
+        gw.compete_batch(np.zeros((3, 2)), ["a", "b", "c"])
+    with pytest.raises(ValueError):
+        gw.compete_batch(np.zeros((3, 4)), ["a", "b"])
+
+
+def test_custom_weights_change_winner():
+    inputs = {
+        "novel": {"newness": 1.0, "relevance": 0.0, "affect": 0.0, "goal_alignment": 0.0},
+        "goal": {"newness": 0.0, "relevance": 0.0, "affect": 0.0, "goal_alignment": 1.0},
+    }
+    assert GlobalWorkspaceSystem().compete(inputs)[0].source == "novel"
+
+    gw = GlobalWorkspaceSystem(weights=(0.1, 0.1, 0.1, 0.7))
+    winner = gw.compete(inputs)[0]
+    assert winner.source == "goal"
+    assert winner.score == pytest.approx(0.7)
+
+    with pytest.raises(ValueError):
+        GlobalWorkspaceSystem(weights=(1.0, 0.0))
+
+
+def test_compete_and_broadcast_batch_reports_top_k():
+    gw = GlobalWorkspaceSystem(min_score=0.1)
+    features = np.linspace(0.0, 1.0, 400).reshape(100, 4)
+
+    result = gw.compete_and_broadcast_batch(features, [f"s{i}" for i in range(100)], top_k=3)
+
+    assert result is not None
+    assert result["source"] == "s99"
+    assert len(result["candidates"]) == 3
+    assert gw.last_winner is not None and gw.last_winner.source == "s99"
+
+
+def test_compete_matches_legacy_sort_on_near_ties():
+    gw = GlobalWorkspaceSystem()
+    rng = np.random.default_rng(7)
+    for _ in range(3000):
+        # 取 0.05 的整数倍，制造大量只差浮点舍入的并列分数
+        values = np.round(rng.integers(0, 21, size=(6, 4)) * 0.05, 2).tolist()
+        inputs = {f"s{i}": dict(zip(("newness", "relevance", "affect", "goal_alignment"), row)) for i, row in enumerate(values)}
+
+        legacy = sorted(
+            (WorkspaceItem(source, "", *(min(1.0, max(0.0, v)) for v in row)) for source, row in zip(inputs, values)),
+            key=lambda it: it.score,
+            reverse=True,
+        )
+        ranked = gw.compete(inputs)
+        assert [it.source for it in ranked] == [it.source for it in legacy]
+        assert gw.compete(inputs, top_k=2) == ranked[:2]
+        assert gw.compete_batch(np.array(values), list(inputs), top_k=None) == ranked
+        assert gw.score_batch(np.array(values)).max() == legacy[0].score
+
+
+def test_compete_small_and_vectorized_paths_agree():
+    gw = GlobalWorkspaceSystem()
+    rng = np.random.default_rng(3)
+    n = SMALL_COMPETE_SIZE + 8
+    values = np.round(rng.integers(-2, 23, size=(n, 4)) * 0.05, 2).tolist()
+    inputs = {
+        f"s{i}": {"content": f"c{i}", **dict(zip(("newness", "relevance", "affect", "goal_alignment"), row))}
+        for i, row in enumerate(values)
+    }
+
+    large = gw.compete(inputs)
+    small = gw.compete(dict(list(inputs.items())[: SMALL_COMPETE_SIZE - 1]))
+    assert small == [it for it in large if int(it.source[1:]) < SMALL_COMPETE_SIZE - 1]
+    assert all(0.0 <= it.newness <= 1.0 for it in small)
+    assert gw.compete(inputs, top_k=0) == [] and gw.compete({"a": {}}, top_k=0) == []
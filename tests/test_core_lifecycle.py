@@ -36,3 +36,18 @@ def test_step_without_initialize_raises():
 
     with pytest.raises(RuntimeError):
         manager.step({})
+
+
+def test_step_exposes_schedule():
+    orchestrator = CoreOrchestrator()
+    orchestrator.register_system("cheap", lambda ctx: {})
+    orchestrator.register_system("costly", lambda ctx: {}, every_beats=2)
+    manager = LifecycleManager(orchestrator)
+    manager.initialize()
+
+    manager.step({})
+    assert manager.last_schedule.ran == ["cheap", "costly"]
+    manager.step({})
+    assert manager.last_schedule.beat == 1
+    assert manager.last_schedule.skipped == ["costly"]
+    assert manager.schedule()["costly"]["next_beat"] == 2
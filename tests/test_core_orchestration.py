@@ -1,4 +1,9 @@
-from us_core.core.orchestration import CoreOrchestrator
+import threading
+import time
+
+import pytest
+
+from us_core.core.orchestration import CoreOrchestrator, is_stale
 
 
 def test_orchestrator_register_and_heartbeat_order():
@@ -39,3 +44,180 @@ def test_orchestrator_enable_disable_system():
     orchestrator.enable_system("S")
     orchestrator.heartbeat({})
     assert calls == [True]
+
+
+def test_orchestrator_dependencies_run_first_and_see_upstream():
+    orchestrator = CoreOrchestrator()
+    call_log = []
+
+    def memory(ctx):
+        call_log.append("memory")
+        return {"recalled": ctx["upstream"]["attention"]["focus"]}
+
+    def attention(ctx):
+        call_log.append("attention")
+        return {"focus": "task"}
+
+    orchestrator.register_system("memory", memory, depends_on=["attention"])
+    orchestrator.register_system("attention", attention)
+
+    result = orchestrator.heartbeat({})
+    assert call_log == ["attention", "memory"]
+    assert result["memory"] == {"recalled": "task"}
+    assert list(result) == ["attention", "memory"]
+
+
+def test_orchestrator_rejects_cycles_and_unknown_dependencies():
+    orchestrator = CoreOrchestrator()
+    orchestrator.register_system("a", lambda ctx: {}, depends_on=["b"])
+    orchestrator.register_system("b", lambda ctx: {}, depends_on=["a"])
+    with pytest.raises(ValueError):
+        orchestrator.heartbeat({})
+
+    orchestrator = CoreOrchestrator()
+    orchestrator.register_system("a", lambda ctx: {}, depends_on=["missing"])
+    with pytest.raises(ValueError):
+        orchestrator.heartbeat({})
+
+
+def test_concurrent_heartbeat_overlaps_independent_systems():
+    orchestrator = CoreOrchestrator(mode="concurrent", max_workers=4)
+
+    def slow(ctx):
+        time.sleep(0.1)
+        return {"ok": True}
+
+    for name in ("a", "b", "c"):
+        orchestrator.register_system(name, slow)
+    orchestrator.register_system("after", lambda ctx: {"n": len(ctx["upstream"])}, depends_on=["a", "b", "c"])
+
+    start = time.perf_counter()
+    result = orchestrator.heartbeat({})
+    elapsed = time.perf_counter() - start
+    orchestrator.close()
+
+    assert elapsed < 0.25  # 顺序执行需要 0.3s
+    assert result["after"] == {"n": 3}
+    stats = orchestrator.system_stats()
+    assert stats["a"]["runs"] == 1 and stats["a"]["last_latency"] >= 0.09
+
+
+def test_concurrent_heartbeat_marks_late_systems_stale():
+    orchestrator = CoreOrchestrator(mode="concurrent")
+    release = threading.Event()
+
+    def slow(ctx):
+        release.wait(2.0)
+        return {"value": ctx["tick"]}
+
+    orchestrator.register_system("slow", slow, timeout=0.05)
+    orchestrator.register_system("fast", lambda ctx: {"tick": ctx["tick"]})
+    orchestrator.register_system("child", lambda ctx: dict(ctx["upstream"]["slow"]), depends_on=["slow"])
+
+    first = orchestrator.heartbeat({"tick": 1})
+    assert is_stale(first["slow"]) and first["slow"]["last_result"] is None
+    assert first["fast"] == {"tick": 1}
+    assert is_stale(first["child"])  # 下游拿到的是 stale 标记，不会卡住
+
+    # 上一拍还没结束：不重复提交
+    second = orchestrator.heartbeat({"tick": 2})
+    assert is_stale(second["slow"])
+
+    release.set()
+    deadline = time.time() + 2.0
+    while orchestrator.get_system("slow").last_result is None and time.time() < deadline:
+        time.sleep(0.01)
+    third = orchestrator.heartbeat({"tick": 3})
+    orchestrator.close()
+    assert third["slow"] == {"value": 3}
+    assert orchestrator.get_system("slow").stale_count == 2
+
+
+def test_concurrent_step_error_does_not_leave_other_systems_inflight():
+    orchestrator = CoreOrchestrator(mode="concurrent", max_workers=2)
+    calls = {"fast": 0}
+
+    def fast(ctx):
+        calls["fast"] += 1
+        if calls["fast"] == 1:
+            raise RuntimeError("boom")
+        return {"ok": True}
+
+    def slow(ctx):
+        time.sleep(0.2)
+        return {"value": ctx["tick"]}
+
+    orchestrator.register_system("fast", fast)
+    orchestrator.register_system("slow", slow)
+
+    with pytest.raises(RuntimeError):
+        orchestrator.heartbeat({"tick": 1})
+
+    deadline = time.time() + 2.0
+    while orchestrator.get_system("slow").last_result is None and time.time() < deadline:
+        time.sleep(0.01)
+    assert orchestrator.get_system("slow").last_result == {"value": 1}
+    assert not orchestrator._inflight
+
+    second = orchestrator.heartbeat({"tick": 2})
+    orchestrator.close()
+    assert second["slow"] == {"value": 2}
+    assert second["fast"] == {"ok": True}
+
+
+def test_multi_rate_ticking_every_n_beats_and_seconds():
+    now = [0.0]
+    orchestrator = CoreOrchestrator(clock=lambda: now[0])
+    orchestrator.register_system("fast", lambda ctx: {})
+    orchestrator.register_system("every3", lambda ctx: {}, every_beats=3)
+    orchestrator.register_system("timed", lambda ctx: {}, every_seconds=1.0)
+
+    ran = []
+    for _ in range(6):
+        ran.append(set(orchestrator.heartbeat({})))
+        now[0] += 0.4
+    assert [("every3" in r) for r in ran] == [True, False, False, True, False, False]
+    assert all("fast" in r for r in ran)
+    # t = 0.0, 0.4, 0.8, 1.2, 1.6, 2.0 -> 0.0, 1.2, 2.0
+    assert [("timed" in r) for r in ran] == [True, False, False, True, False, True]
+    assert orchestrator.last_schedule.skipped == ["every3"]
+
+
+def test_jittered_phases_spread_load():
+    orchestrator = CoreOrchestrator(seed=3)
+    for i in range(8):
+        orchestrator.register_system(f"s{i}", lambda ctx: {}, every_beats=4, jitter=True)
+    counts = [len(orchestrator.heartbeat({})) for _ in range(4)]
+    assert sum(counts) == 8  # 每个系统每 4 拍正好跑一次
+    assert max(counts) < 8  # 不会全挤在同一拍
+
+
+def test_adaptive_rate_backs_off_over_budget_and_recovers():
+    orchestrator = CoreOrchestrator()
+    delay = [0.02]
+
+    def slow(ctx):
+        time.sleep(delay[0])
+        return {}
+
+    orchestrator.register_system("slow", slow, latency_budget=0.005, max_slowdown=4)
+    for _ in range(8):
+        orchestrator.heartbeat({})
+    system = orchestrator.get_system("slow")
+    assert system.slowdown == 4
+    assert system.runs < 8
+    assert orchestrator.schedule()["slow"]["slowdown"] == 4
+
+    delay[0] = 0.0
+    for _ in range(40):
+        orchestrator.heartbeat({})
+    assert system.slowdown == 1
+
+
+def test_skipped_dependency_provides_last_result():
+    orchestrator = CoreOrchestrator()
+    counter = iter(range(100))
+    orchestrator.register_system("model", lambda ctx: {"v": next(counter)}, every_beats=2)
+    orchestrator.register_system("user", lambda ctx: dict(ctx["upstream"]["model"]), depends_on=["model"])
+    results = [orchestrator.heartbeat({})["user"]["v"] for _ in range(4)]
+    assert results == [0, 0, 1, 1]
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from us_core.core.embryo import ConsciousDigitalEmbryo
+from us_core.core.monitoring import PerformanceMetrics
+from us_core.core.realtime import FixedRateRunner
+
+
+class FakeTime:
+    """可控时钟：sleep 推进时间，beat 耗时由测试指定。"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.starts = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def make_runner(fake: FakeTime, costs, **kwargs) -> FixedRateRunner:
+    costs = iter(costs)
+
+    def beat() -> None:
+        fake.starts.append(fake.now)
+        fake.now += next(costs)
+
+    return FixedRateRunner(beat_fn=beat, hz=10.0, clock=fake.clock, sleep=fake.sleep, spin_threshold=0.0, **kwargs)
+
+
+def test_fixed_rate_runner_does_not_drift():
+    fake = FakeTime()
+    report = make_runner(fake, [0.03] * 5).run(beats=5)
+    assert fake.starts == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+    assert report.overruns == 0 and report.skipped == 0
+    assert report.percentiles_ms["p50"] == pytest.approx(30.0)
+
+
+def test_fixed_rate_runner_skip_policy_realigns():
+    fake = FakeTime()
+    # 第二拍耗时 0.25s：错过 0.2、0.3 两个槽位
+    report = make_runner(fake, [0.01, 0.25, 0.01, 0.01], policy="skip").run(beats=4)
+    assert fake.starts == pytest.approx([0.0, 0.1, 0.4, 0.5])
+    assert report.overruns == 1
+    assert report.skipped == 2
+
+
+def test_fixed_rate_runner_catch_up_policy_runs_missed_beats():
+    fake = FakeTime()
+    report = make_runner(fake, [0.01, 0.25, 0.01, 0.01, 0.01], policy="catch_up").run(beats=5)
+    # 0.35 时落后两拍，连续补跑，然后回到原来的时间表
+    assert fake.starts == pytest.approx([0.0, 0.1, 0.35, 0.36, 0.4])
+    assert report.skipped == 0
+    assert report.max_lateness == pytest.approx(0.15)
+
+    fake = FakeTime()
+    report = make_runner(fake, [0.01, 0.25, 0.01, 0.01], policy="catch_up", max_catch_up=1).run(beats=4)
+    assert report.skipped == 1
+
+
+def test_metrics_percentiles_and_embryo_realtime_run():
+    metrics = PerformanceMetrics(latency_window=100)
+    for ms in range(1, 101):
+        metrics.record_beat_latency(ms / 1000.0, overrun=ms > 95)
+    pct = metrics.latency_percentiles()
+    assert pct == {"p50": pytest.approx(50.0), "p95": pytest.approx(95.0), "p99": pytest.approx(99.0)}
+    assert metrics.heartbeat_metrics()[PerformanceMetrics.HEARTBEAT_OVERRUN_RATE] == pytest.approx(0.05)
+
+    embryo = ConsciousDigitalEmbryo.simple_demo()
+    report = embryo.run_realtime(hz=200.0, beats=10)
+    assert report.beats == 10
+    assert embryo.context["heartbeat_steps"] == 10
+    assert embryo.metrics.heartbeats == 10
+    all_metrics = PerformanceMetrics.calculate_all_metrics(embryo)
+    assert PerformanceMetrics.HEARTBEAT_P99_MS in all_metrics
+
+
+def test_embryo_realtime_runs_registered_systems_and_reports_overruns():
+    embryo = ConsciousDigitalEmbryo.simple_demo()
+    calls = []
+
+    def slow(ctx):
+        calls.append(ctx["heartbeat_steps"])
+        time.sleep(0.03)
+        return {"ok": True}
+
+    embryo.orchestrator.register_system("slow", slow)
+    report = embryo.run_realtime(hz=50.0, beats=4)  # 每拍预算 20ms
+
+    assert calls == [1, 2, 3, 4]
+    assert embryo.last_results == {"slow": {"ok": True}}
+    assert report.overruns == 4
+    assert report.percentiles_ms["p50"] >= 30.0
+    assert embryo.metrics.heartbeat_metrics()[PerformanceMetrics.HEARTBEAT_OVERRUN_RATE] == pytest.approx(1.0)
+
+
+def test_stop_interrupts_long_wait_at_low_hz():
+    calls = []
+    runner = FixedRateRunner(beat_fn=lambda: calls.append(1), hz=0.2)  # 周期 5 秒
+    threading.Timer(0.05, runner.stop).start()
+
+    start = time.perf_counter()
+    report = runner.run(duration=60.0)
+
+    assert time.perf_counter() - start < 1.0
+    assert report.beats == 1 and calls == [1]
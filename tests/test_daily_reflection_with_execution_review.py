@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import daily_reflection_with_execution_review as m  # noqa: E402
+from us_core.planner.plan_index import PlanArtifact  # noqa: E402
+
+
+def _setup(tmp_path: Path, monkeypatch, artifacts, plan_files):
+    plans_dir = tmp_path / "data" / "plans"
+    plans_dir.mkdir(parents=True)
+    for name in plan_files:
+        (plans_dir / name).write_text("# plan\n", encoding="utf-8")
+
+    reviewed = []
+    monkeypatch.setattr(m, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(m, "_run_daily_reflection_script", lambda: None)
+    monkeypatch.setattr(m, "query_plan_artifacts", lambda day: artifacts)
+    monkeypatch.setattr(m, "load_tasks_from_jsonl", lambda: [])
+    monkeypatch.setattr(m, "load_execution_for_plan", lambda task_ids, tasks: ("index", tuple(task_ids)))
+    monkeypatch.setattr(m, "analyze_plan_file", lambda path: ("markdown", path.name))
+    monkeypatch.setattr(m, "append_execution_summary", lambda plan_name, summary: reviewed.append((plan_name, summary)))
+    monkeypatch.setattr(m, "aggregate_execution_summaries", lambda named: named)
+    monkeypatch.setattr(m, "daily_review_to_markdown", lambda agg: "review")
+    return reviewed
+
+
+def test_indexed_and_unindexed_plans_are_merged(tmp_path, monkeypatch):
+    today = datetime.now().strftime("%Y-%m-%d")
+    indexed = f"focus_block_balance_{today}_0900.md"
+    handwritten = f"my_plan_{today}.md"
+    artifacts = [PlanArtifact(plan_name=indexed, date=today, mode="balance", task_ids=["t1"])]
+    reviewed = _setup(tmp_path, monkeypatch, artifacts, [indexed, handwritten, "old_plan_2000-01-01.md"])
+
+    assert m.main([]) == 0
+
+    # 索引里的计划用索引数据，只有 Markdown 的计划也被纳入；旧计划不混进来
+    assert reviewed == [
+        (indexed, ("index", ("t1",))),
+        (handwritten, ("markdown", handwritten)),
+    ]
+
+
+def test_scan_falls_back_to_all_plans_without_index(tmp_path, monkeypatch):
+    reviewed = _setup(tmp_path, monkeypatch, [], ["old_plan_2000-01-01.md"])
+
+    assert m.main([]) == 0
+
+    assert reviewed == [("old_plan_2000-01-01.md", ("markdown", "old_plan_2000-01-01.md"))]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.environments.grid_oracle import (  # noqa: E402
+    UNREACHABLE,
+    GridLayout,
+    get_grid_oracle,
+    shaping_reward,
+)
+from us_core.environments.grid_world import SimpleGridWorld  # noqa: E402
+from us_core.environments.vec_grid_world import VecGridWorld  # noqa: E402
+from us_core.systems.environment.interface import GridAction  # noqa: E402
+
+
+def test_following_oracle_actions_reaches_goal_in_optimal_steps():
+    env = SimpleGridWorld()
+    env.reset()
+    oracle = get_grid_oracle(env)
+
+    remaining = oracle.optimal_episode_length
+    assert remaining > 0
+    for _ in range(remaining):
+        action = oracle.optimal_action(*oracle.env_state(env))
+        _, _, done, _ = env.step(action)
+        assert oracle.env_distance(env) == remaining - 1
+        remaining -= 1
+    assert done and remaining == 0
+
+
+def test_oracle_accounts_for_key_and_door():
+    env = SimpleGridWorld()
+    env.reset()
+    oracle = get_grid_oracle(env)
+    door = env._door_pos
+
+    # 站在门左边一格：没钥匙只能从右侧通道绕过去，有钥匙可以直接穿门
+    left_of_door = (door[0], door[1] - 1)
+    without_key = oracle.distance(left_of_door, has_key=False, door_open=False)
+    with_key = oracle.distance(left_of_door, has_key=True, door_open=False)
+    assert with_key < without_key
+    assert oracle.optimal_action(left_of_door, has_key=True, door_open=False) == GridAction.RIGHT
+    # 墙壁格不可达
+    assert oracle.distance((0, 0), has_key=False, door_open=False) == UNREACHABLE
+
+
+def test_oracle_is_cached_per_layout_and_matches_vec_env():
+    env = SimpleGridWorld()
+    env.reset()
+    venv = VecGridWorld(4)
+    venv.reset()
+
+    assert GridLayout.from_env(env) == GridLayout.from_env(venv)
+    oracle = get_grid_oracle(env)
+    assert get_grid_oracle(venv) is oracle
+
+    venv.step(np.array([GridAction.RIGHT, GridAction.DOWN, GridAction.UP, GridAction.RIGHT]))
+    expected = [
+        oracle.distance((int(y), int(x)), bool(k), False)
+        for y, x, k in zip(venv.agent_y, venv.agent_x, venv.has_key)
+    ]
+    assert oracle.vec_env_distances(venv).tolist() == expected
+
+
+def test_shaping_reward_rewards_progress():
+    assert shaping_reward(5, 4, gamma=1.0) == 1.0
+    assert shaping_reward(4, 5, gamma=1.0) == -1.0
+    assert shaping_reward(UNREACHABLE, 3) == 0.0
+
+
+def test_incremental_state_encoding_matches_full_encoding():
+    env = SimpleGridWorld()
+    env.reset()
+    rng = np.random.default_rng(0)
+
+    def full_encoding() -> np.ndarray:
+        g = env.grid.astype(np.float32).reshape(-1)
+        g[env.agent_pos[0] * env.width + env.agent_pos[1]] = 6 if env._has_key else 5
+        return g
+
+    oracle = get_grid_oracle(env)
+    for t in range(300):
+        # 一半时间走最优动作（保证拿到钥匙 / 开门 / 到终点），一半随机
+        action = oracle.optimal_action(*oracle.env_state(env)) if t % 2 else int(rng.integers(0, 6))
+        state, _, done, _ = env.step(action)
+        assert np.array_equal(state, full_encoding())
+        if done:
+            assert np.array_equal(env.reset(), full_encoding())
+
+    # 外部直接改 agent_pos 后编码仍然正确
+    env.agent_pos = (2, 2)
+    assert np.array_equal(env._encode_state(), full_encoding())
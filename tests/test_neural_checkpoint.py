@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.systems.neural.checkpoint import (  # noqa: E402
+    MAGIC,
+    load_checkpoint,
+    read_checkpoint_header,
+    save_checkpoint,
+)
+from us_core.systems.neural.networks import (  # noqa: E402
+    MLP,
+    FeatureExtractor,
+    PolicyNetwork,
+    ValueNetwork,
+    WorldModel,
+)
+from us_core.systems.neural.optim import Adam  # noqa: E402
+from us_core.systems.neural.training import regression_step  # noqa: E402
+
+
+def test_seeded_initialization_is_reproducible():
+    a = PolicyNetwork(input_size=10, output_size=3, seed=7)
+    b = PolicyNetwork(input_size=10, output_size=3, seed=7)
+    c = PolicyNetwork(input_size=10, output_size=3, seed=8)
+    x = np.ones((1, 10), dtype=np.float32)
+    assert np.array_equal(a.forward(x), b.forward(x))
+    assert not np.array_equal(a.forward(x), c.forward(x))
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        PolicyNetwork(input_size=12, output_size=4, hidden_sizes=(16, 8, 8), seed=1),
+        ValueNetwork(input_size=12, hidden_sizes=(16, 8, 4), seed=2),
+        FeatureExtractor(input_size=12, feature_dim=5, seed=3),
+        MLP(layer_sizes=(12, 6, 2), seed=4),
+    ],
+)
+def test_checkpoint_roundtrip(tmp_path, model):
+    path = save_checkpoint(model, tmp_path / "model.ckpt", metadata={"step": 3})
+    loaded = load_checkpoint(path)
+
+    assert type(loaded) is type(model)
+    x = np.random.default_rng(0).normal(size=(3, 12)).astype(np.float32)
+    assert np.array_equal(loaded.forward(x), model.forward(x))
+
+    header, _ = read_checkpoint_header(path)
+    assert header["metadata"] == {"step": 3}
+
+
+def test_world_model_checkpoint_is_memory_mapped(tmp_path):
+    wm = WorldModel(state_dim=6, num_actions=3, seed=5)
+    path = save_checkpoint(wm, tmp_path / "wm.ckpt")
+
+    loaded = load_checkpoint(path)
+    assert (loaded.state_dim, loaded.num_actions, loaded.seed) == (6, 3, 5)
+    assert all(isinstance(p, np.memmap) for p in loaded.mlp.parameters())
+
+    state = np.ones((2, 6), dtype=np.float32)
+    assert np.array_equal(loaded.predict_next_state(state, 1), wm.predict_next_state(state, 1))
+
+    in_memory = load_checkpoint(path, mmap_mode=None)
+    assert not any(isinstance(p, np.memmap) for p in in_memory.mlp.parameters())
+
+
+def test_training_copy_on_write_checkpoint_leaves_file_untouched(tmp_path):
+    mlp = MLP(layer_sizes=(3, 4, 1), seed=0)
+    path = save_checkpoint(mlp, tmp_path / "mlp.ckpt")
+    before = path.read_bytes()
+
+    loaded = load_checkpoint(path)
+    opt = Adam(loaded.parameters(), loaded.gradients(), lr=0.1)
+    regression_step(loaded, opt, np.ones((2, 3), dtype=np.float32), np.full((2, 1), 5.0, dtype=np.float32))
+
+    assert not np.array_equal(loaded.forward(np.ones(3)), mlp.forward(np.ones(3)))
+    assert path.read_bytes() == before
+
+
+def test_checkpoint_rejects_bad_magic_and_future_version(tmp_path):
+    bad = tmp_path / "bad.ckpt"
+    bad.write_bytes(b"not a checkpoint")
+    with pytest.raises(ValueError):
+        load_checkpoint(bad)
+
+    header = json.dumps({"format_version": 999, "model_type": "MLP"}).encode("utf-8")
+    future = tmp_path / "future.ckpt"
+    future.write_bytes(MAGIC + struct.pack("<I", len(header)) + header)
+    with pytest.raises(ValueError, match="版本"):
+        load_checkpoint(future)
@@ -15,12 +15,12 @@ from us_core.systems.neural.networks import PolicyNetwork, WorldModel  # noqa: E
 
 
 def test_epsilon_greedy_policy_with_low_epsilon_prefers_greedy():
-    # 使用一个可控的 policy_net：让 forward 输出固定 logits
+    # 使用一个可控的 policy_net：让 infer 输出固定 logits
     class DummyPolicy(PolicyNetwork):
         def __init__(self):
             pass
 
-        def forward(self, state: np.ndarray) -> np.ndarray:
+        def infer(self, state: np.ndarray) -> np.ndarray:
             # 动作 2 最高
             return np.array([[0.0, 1.0, 5.0, 0.5, -1.0, 0.0]], dtype=np.float32)
 
@@ -38,7 +38,7 @@ def test_epsilon_greedy_policy_with_high_epsilon_explores():
         def __init__(self):
             pass
 
-        def forward(self, state: np.ndarray) -> np.ndarray:
+        def infer(self, state: np.ndarray) -> np.ndarray:
             return np.zeros((1, 6), dtype=np.float32)
 
     policy = DummyPolicy()
@@ -59,3 +59,54 @@ def test_simple_planner_returns_valid_action():
     action = planner.plan(state, rng=rng)
 
     assert 0 <= action < 6
+
+
+def test_simple_planner_batched_scores_match_per_sample_rollout():
+    wm = WorldModel(state_dim=10, num_actions=4)
+    planner = SimplePlanner(world_model=wm, action_size=4, horizon=3, num_samples=5)
+    state = np.random.default_rng(0).normal(size=10).astype(np.float32)
+    seqs = np.random.default_rng(1).integers(0, 4, size=(5, 3))
+
+    expected = []
+    for seq in seqs:
+        s = state[None, :]
+        score = 0.0
+        for a in seq:
+            s = wm.predict_next_state(s, int(a))
+            score += float(np.linalg.norm(s))
+        expected.append(score)
+
+    assert np.allclose(planner.evaluate_sequences(state, seqs), expected, rtol=1e-5)
+
+
+def test_simple_planner_cem_finds_best_first_action():
+    wm = WorldModel(state_dim=10, num_actions=3)
+    state = np.random.default_rng(2).normal(size=10).astype(np.float32)
+    planner = SimplePlanner(world_model=wm, action_size=3, horizon=2, num_samples=64, method="cem")
+
+    all_seqs = np.array([[a, b] for a in range(3) for b in range(3)])
+    best = int(all_seqs[np.argmax(planner.evaluate_sequences(state, all_seqs)), 0])
+
+    assert planner.plan(state, rng=np.random.default_rng(3)) == best
+
+
+def test_epsilon_greedy_select_actions_batch():
+    net = PolicyNetwork(input_size=10, output_size=4, hidden_sizes=(16, 16, 8))
+    states = np.random.default_rng(0).normal(size=(32, 10)).astype(np.float32)
+    logits = net.forward(states)
+
+    greedy = EpsilonGreedyPolicy(policy_net=net, action_size=4, epsilon=0.0)
+    actions, confidences = greedy.select_actions(states, rng=np.random.default_rng(1))
+    probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+    probs /= probs.sum(axis=1, keepdims=True)
+    assert np.array_equal(actions, logits.argmax(axis=1))
+    assert np.allclose(confidences, probs.max(axis=1), atol=1e-5)
+    # 单条接口与批量接口一致
+    assert greedy.select_action(states[3])[0] == actions[3]
+
+    explore = EpsilonGreedyPolicy(policy_net=net, action_size=4, epsilon=1.0)
+    actions, confidences = explore.select_actions(states, rng=np.random.default_rng(2))
+    assert actions.shape == (32,) and actions.dtype == np.int64
+    assert np.all((0 <= actions) & (actions < 4))
+    assert np.allclose(confidences, 0.25)
+    assert len(set(actions.tolist())) > 1
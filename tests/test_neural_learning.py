@@ -10,7 +10,7 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from us_core.systems.neural.learning import ReplayBuffer  # noqa: E402
+from us_core.systems.neural.learning import PrioritizedReplayBuffer, ReplayBuffer, SumTree  # noqa: E402
 
 
 def test_replay_buffer_add_and_len():
@@ -35,3 +35,93 @@ def test_replay_buffer_sample_shapes():
     assert rewards.shape == (16,)
     assert next_states.shape == (16, 100)
     assert dones.shape == (16,)
+
+
+def test_replay_buffer_add_batch_wraps_around():
+    buf = ReplayBuffer(capacity=5, state_dim=4)
+    states = np.arange(7 * 4, dtype=np.float32).reshape(7, 4)
+    buf.add_batch(states, np.arange(7), np.arange(7, dtype=np.float32), states + 1, np.zeros(7, dtype=bool))
+
+    assert len(buf) == 5
+    # 只保留最后 5 条：动作 2..6
+    assert sorted(buf[i].action for i in range(5)) == [2, 3, 4, 5, 6]
+    exp = buf[-1]
+    assert np.array_equal(exp.next_state, states[exp.action] + 1)
+
+
+def test_replay_buffer_sample_into_preallocated_out():
+    buf = ReplayBuffer(capacity=32)
+    for i in range(20):
+        s = np.full(100, i, dtype=np.float32)
+        buf.add(s, action=i, reward=float(i), next_state=s + 1, done=(i % 2 == 0))
+
+    out = buf.allocate_batch(8)
+    rng = np.random.default_rng(0)
+    result = buf.sample(8, rng=rng, out=out)
+    assert all(a is b for a, b in zip(result, out))
+
+    states, actions, rewards, next_states, dones = out
+    assert np.array_equal(states[:, 0], actions.astype(np.float32))
+    assert np.array_equal(next_states[:, 0], states[:, 0] + 1)
+    assert np.array_equal(dones, actions % 2 == 0)
+
+
+def test_replay_buffer_memmap_storage(tmp_path):
+    buf = ReplayBuffer(capacity=8, state_dim=100, storage_dir=tmp_path / "replay")
+    s = np.ones(100, dtype=np.float32)
+    buf.add(s, action=3, reward=0.5, next_state=s * 2, done=True)
+    buf.flush()
+
+    assert (tmp_path / "replay" / "states.dat").exists()
+    exp = buf[0]
+    assert exp.action == 3 and exp.done
+    assert np.allclose(exp.next_state, 2.0)
+
+
+def test_sum_tree_update_and_find():
+    tree = SumTree(5)
+    tree.update(np.arange(5), np.array([1.0, 0.0, 2.0, 3.0, 4.0]))
+    assert tree.total == 10.0
+
+    # 前缀和：[0,1) -> 0, [1,3) -> 2（跳过优先级为 0 的 1）, [3,6) -> 3, [6,10) -> 4
+    found = tree.find(np.array([0.0, 0.99, 1.0, 2.5, 3.0, 5.9, 6.0, 9.99]))
+    assert found.tolist() == [0, 0, 2, 2, 3, 3, 4, 4]
+
+    tree.update(np.array([4, 4]), np.array([9.0, 0.5]))
+    assert tree.total == 6.5
+
+
+def _filled_prioritized(n: int = 20) -> PrioritizedReplayBuffer:
+    buf = PrioritizedReplayBuffer(capacity=32, alpha=1.0, beta=1.0)
+    states = np.repeat(np.arange(n, dtype=np.float32)[:, None], 100, axis=1)
+    buf.add_batch(states, np.arange(n), np.zeros(n, dtype=np.float32), states + 1, np.zeros(n, dtype=bool))
+    return buf
+
+
+def test_prioritized_buffer_samples_by_priority():
+    buf = _filled_prioritized()
+    # 新经验都是最大优先级 1.0；把 7 号提到远高于其它
+    errors = np.full(20, 1e-3)
+    errors[7] = 100.0
+    buf.update_priorities(np.arange(20), errors)
+
+    rng = np.random.default_rng(0)
+    (states, actions, *_), idxs, weights = buf.sample_with_weights(64, rng=rng)
+    assert np.mean(idxs == 7) > 0.9
+    assert np.array_equal(actions, idxs)
+    assert weights.dtype == np.float32
+    assert weights.max() == 1.0
+    # 高优先级样本的 IS 权重最小
+    assert np.isclose(weights[idxs == 7].min(), weights.min())
+
+    # 继承的 sample() 也走优先级采样
+    _, actions, *_ = buf.sample(64, rng=rng)
+    assert np.mean(actions == 7) > 0.9
+
+
+def test_prioritized_buffer_new_items_get_max_priority():
+    buf = _filled_prioritized(4)
+    buf.update_priorities(np.array([0, 1]), np.array([5.0, 0.1]))
+    s = np.zeros(100, dtype=np.float32)
+    buf.add(s, action=9, reward=0.0, next_state=s, done=False)
+    assert np.isclose(buf.priorities(np.array([4]))[0], 5.0 + buf.eps)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+import tracemalloc
 from pathlib import Path
 
 import numpy as np
@@ -11,6 +12,8 @@ if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
 from us_core.systems.neural.networks import (  # noqa: E402
+    MLP,
+    MLPInference,
     FeatureExtractor,
     PolicyNetwork,
     ValueNetwork,
@@ -45,3 +48,103 @@ def test_world_model_predict_next_state_shape():
     state = np.random.randn(3, 100).astype(np.float32)
     next_state = wm.predict_next_state(state, action=2)
     assert next_state.shape == (3, 100)
+
+
+def test_mlp_backward_matches_numerical_gradient():
+    rng = np.random.default_rng(0)
+    mlp = MLP(layer_sizes=(4, 8, 3))
+    # 固定参数，避免随机初始化恰好让某个预激活落在 ReLU 拐点附近
+    for param in mlp.parameters():
+        param[...] = rng.normal(0.0, 0.5, size=param.shape)
+    x = rng.normal(size=(5, 4)).astype(np.float32)
+    y = rng.normal(size=(5, 3)).astype(np.float32)
+
+    def loss() -> float:
+        diff = mlp.forward(x).astype(np.float64) - y
+        return float(0.5 * np.sum(diff * diff))
+
+    out = mlp.forward_train(x)
+    mlp.backward(out - y)
+
+    eps = 1e-3  # 太大会跨过 ReLU 拐点
+    for param, grad in zip(mlp.parameters(), mlp.gradients()):
+        flat, gflat = param.reshape(-1), grad.reshape(-1)
+        for j in range(0, flat.size, max(1, flat.size // 6)):
+            old = flat[j]
+            flat[j] = old + eps
+            up = loss()
+            flat[j] = old - eps
+            down = loss()
+            flat[j] = old
+            assert np.isclose(gflat[j], (up - down) / (2 * eps), rtol=2e-2, atol=2e-3)
+
+
+def test_mlp_copy_weights_from():
+    a = MLP(layer_sizes=(4, 8, 2))
+    b = MLP(layer_sizes=(4, 8, 2))
+    b.copy_weights_from(a)
+    x = np.ones((1, 4), dtype=np.float32)
+    assert np.array_equal(a.forward(x), b.forward(x))
+
+
+def test_mlp_inference_variants_match_forward():
+    mlp = MLP(layer_sizes=(100, 64, 32, 6))
+    x = np.random.default_rng(0).random((16, 100)).astype(np.float32)
+    expected = mlp.forward(x)
+
+    assert np.allclose(mlp.inference()(x), expected, atol=1e-5)
+    assert np.allclose(mlp.inference(fuse_bias=True)(x), expected, atol=1e-5)
+    for precision, atol in (("float16", 1e-2), ("int8", 5e-2)):
+        for fuse in (False, True):
+            got = MLPInference(mlp, precision=precision, fuse_bias=fuse)(x)
+            assert np.allclose(got, expected, atol=atol), (precision, fuse)
+
+
+def test_mlp_inference_reuses_workspace_and_out():
+    mlp = MLP(layer_sizes=(8, 16, 4))
+    engine = mlp.inference()
+    assert mlp.inference() is engine
+
+    x = np.ones((3, 8), dtype=np.float32)
+    first = engine(x)
+    assert engine(x * 2) is first  # 同一 batch size 复用同一块工作区
+
+    out = np.empty((3, 4), dtype=np.float32)
+    assert engine(x, out=out) is out
+    assert np.allclose(out, mlp.forward(x), atol=1e-6)
+
+
+def _peak_bytes(fn, repeats: int = 10) -> int:
+    fn()  # 预热：分配工作区
+    tracemalloc.start()
+    for _ in range(repeats):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def test_mlp_inference_does_not_allocate_arrays_per_call():
+    mlp = MLP(layer_sizes=(100, 256, 128, 6))
+    x = np.ones((4096, 100), dtype=np.float32)
+
+    fused = mlp.inference(fuse_bias=True)
+    assert _peak_bytes(lambda: fused(x)) < 4096
+
+    # 不融合时只有 ufunc 广播加偏置用到的固定大小缓冲，与 batch 无关
+    plain = mlp.inference()
+    assert _peak_bytes(lambda: plain(x)) < 64 * 1024  # 一层激活是 4096 * 256 * 4 字节
+
+
+def test_mlp_inference_refresh_after_training_update():
+    mlp = MLP(layer_sizes=(4, 8, 2))
+    fp32 = mlp.inference()
+    fused = mlp.inference(fuse_bias=True)
+    x = np.ones((1, 4), dtype=np.float32)
+
+    for param in mlp.parameters():
+        param += 0.5
+    # 共享参数的 float32 引擎自动生效；融合偏置的引擎需要 refresh
+    assert np.allclose(fp32(x), mlp.forward(x), atol=1e-6)
+    fused.refresh()
+    assert np.allclose(fused(x), mlp.forward(x), atol=1e-5)
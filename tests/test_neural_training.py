@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.systems.neural.learning import ReplayBuffer  # noqa: E402
+from us_core.systems.neural.networks import MLP, PolicyNetwork, WorldModel  # noqa: E402
+from us_core.systems.neural.optim import SGD, Adam, clip_grad_norm  # noqa: E402
+from us_core.systems.neural.training import DQNTrainer, regression_step, world_model_step  # noqa: E402
+
+
+def _regression_data(rng: np.random.Generator):
+    x = rng.normal(size=(64, 3)).astype(np.float32)
+    y = (x @ np.array([[1.0], [-2.0], [0.5]], dtype=np.float32)) + 0.3
+    return x, y
+
+
+def test_adam_and_sgd_reduce_regression_loss():
+    rng = np.random.default_rng(0)
+    x, y = _regression_data(rng)
+    for make in (lambda m: Adam(m.parameters(), m.gradients(), lr=1e-2),
+                 lambda m: SGD(m.parameters(), m.gradients(), lr=1e-2, momentum=0.9)):
+        mlp = MLP(layer_sizes=(3, 16, 1))
+        opt = make(mlp)
+        first = regression_step(mlp, opt, x, y)
+        for _ in range(300):
+            last = regression_step(mlp, opt, x, y)
+        assert last < first * 0.1
+
+
+def test_optimizer_updates_parameters_in_place():
+    mlp = MLP(layer_sizes=(3, 4, 2))
+    params = mlp.parameters()
+    ids = [id(p) for p in params]
+    opt = Adam(params, mlp.gradients())
+    regression_step(mlp, opt, np.ones((2, 3), dtype=np.float32), np.zeros((2, 2), dtype=np.float32))
+    assert [id(p) for p in mlp.parameters()] == ids
+    assert opt.step_count == 1
+
+
+def test_clip_grad_norm():
+    grads = [np.full(4, 3.0, dtype=np.float32), np.full(1, 4.0, dtype=np.float32)]
+    norm = clip_grad_norm(grads, max_norm=1.0)
+    assert np.isclose(norm, np.sqrt(4 * 9 + 16))
+    assert np.isclose(np.sqrt(sum(float(np.sum(g * g)) for g in grads)), 1.0, atol=1e-5)
+
+
+def test_dqn_trainer_fits_one_step_targets_from_replay_buffer():
+    rng = np.random.default_rng(1)
+    buf = ReplayBuffer(capacity=64, state_dim=8)
+    states = np.eye(8, dtype=np.float32)
+    actions = np.arange(8) % 3
+    rewards = np.linspace(-1, 1, 8).astype(np.float32)
+    buf.add_batch(states, actions, rewards, states, np.ones(8, dtype=bool))
+
+    trainer = DQNTrainer(q_net=PolicyNetwork(input_size=8, output_size=3, hidden_sizes=(32, 32, 16)))
+    trainer.optimizer.lr = 5e-3
+    result = None
+    for _ in range(400):
+        result = trainer.train_step(buf.sample(16, rng=rng))
+
+    assert result is not None and result.td_errors.shape == (16,)
+    q = trainer.q_net.forward(states)
+    assert np.allclose(q[np.arange(8), actions], rewards, atol=0.1)
+
+
+def test_dqn_trainer_syncs_target_network():
+    trainer = DQNTrainer(q_net=PolicyNetwork(input_size=4, output_size=2), target_sync_interval=2)
+    batch = (
+        np.ones((4, 4), dtype=np.float32),
+        np.zeros(4, dtype=np.int64),
+        np.ones(4, dtype=np.float32),
+        np.ones((4, 4), dtype=np.float32),
+        np.zeros(4, dtype=bool),
+    )
+    x = np.ones((1, 4), dtype=np.float32)
+    trainer.train_step(batch)
+    assert not np.array_equal(trainer.target.forward(x), trainer.q_net.forward(x))
+    trainer.train_step(batch)
+    assert np.array_equal(trainer.target.forward(x), trainer.q_net.forward(x))
+
+
+def test_world_model_step_learns_action_dependent_delta():
+    rng = np.random.default_rng(2)
+    wm = WorldModel(state_dim=4, num_actions=2)
+    opt = Adam(wm.mlp.parameters(), wm.mlp.gradients(), lr=1e-2)
+    states = rng.normal(size=(32, 4)).astype(np.float32)
+    actions = rng.integers(0, 2, size=32)
+    next_states = states + np.where(actions[:, None] == 1, 1.0, -1.0).astype(np.float32)
+    batch = (states, actions, np.zeros(32, np.float32), next_states, np.zeros(32, bool))
+
+    first = world_model_step(wm, opt, batch)
+    for _ in range(200):
+        last = world_model_step(wm, opt, batch)
+    assert last < first * 0.05
+    assert np.allclose(wm.predict_next_state(states[:1], 1), states[:1] + 1.0, atol=0.2)
@@ -99,3 +99,62 @@ def test_build_day_plan_returns_empty_when_no_tasks(monkeypatch, tmp_path):
     day_plan = build_day_plan(base_mode="balance", block_specs=block_specs)
 
     assert day_plan.blocks == []
+
+
+def test_build_horizon_plan_respects_due_dates_and_assigns_each_task_once(monkeypatch, tmp_path):
+    from datetime import date, datetime
+
+    from us_core.planner.dayplan import HorizonDaySpec, build_horizon_plan  # type: ignore
+
+    tasks_file = tmp_path / "tasks.jsonl"
+    _write_jsonl(
+        tasks_file,
+        [
+            # 优先级最低，但明天就截止：必须排在第 1 或第 2 天
+            {"id": "due", "title": "tax form", "status": "open", "priority": 1, "due_date": "2025-01-02"},
+            {"id": "u1", "title": "universe 1", "status": "open", "tags": ["universe"], "priority": 3},
+            {"id": "u2", "title": "universe 2", "status": "open", "tags": ["universe"], "priority": 3},
+            {"id": "u3", "title": "universe 3", "status": "open", "tags": ["universe"], "priority": 3},
+            {"id": "s1", "title": "self care", "status": "open", "tags": ["self-care"], "priority": 2},
+            {"id": "done", "title": "old", "status": "done", "priority": 3},
+        ],
+    )
+    monkeypatch.setattr(planner_loader, "get_default_tasks_path", lambda: tasks_file)
+
+    def specs():
+        return [DayBlockSpec(name="morning", mode="focus", duration_minutes=60, max_tasks=2)]
+
+    days = [
+        HorizonDaySpec(day=date(2025, 1, 1), base_mode="focus", block_specs=specs()),
+        HorizonDaySpec(day=date(2025, 1, 2), base_mode="focus", block_specs=specs()),
+        HorizonDaySpec(day=date(2025, 1, 3), base_mode="rest", block_specs=specs()),
+    ]
+
+    results = build_horizon_plan(days, with_history=False, now=datetime(2025, 1, 1, 8, 0))
+
+    assert [r.day for r in results] == [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)]
+    assert [r.base_mode for r in results] == ["focus", "focus", "rest"]
+
+    per_day = [[pt.task.id for b in r.blocks for pt in b.plan.tasks] for r in results]
+    all_ids = [tid for ids in per_day for tid in ids]
+    assert len(all_ids) == len(set(all_ids))
+    assert "done" not in all_ids
+    assert "due" in per_day[0] + per_day[1]
+    assert set(all_ids) == {"due", "u1", "u2", "u3", "s1"}
+
+
+def test_build_horizon_plan_returns_empty_days_when_no_tasks(monkeypatch, tmp_path):
+    from datetime import date
+
+    from us_core.planner.dayplan import HorizonDaySpec, build_horizon_plan  # type: ignore
+
+    tasks_file = tmp_path / "tasks.jsonl"
+    monkeypatch.setattr(planner_loader, "get_default_tasks_path", lambda: tasks_file)
+
+    days = [
+        HorizonDaySpec(day=date(2025, 1, 1), base_mode="weird", block_specs=[DayBlockSpec(name="m", mode="focus")]),
+    ]
+    results = build_horizon_plan(days, with_history=False)
+    assert len(results) == 1
+    assert results[0].base_mode == "balance"
+    assert results[0].blocks == []
@@ -63,3 +63,69 @@ def test_filter_by_search_keyword():
 
     ids = {t.id for t in result}
     assert ids == {"2"}
+
+
+def test_compiled_filter_is_reused_and_matches_spec():
+    from us_core.planner.filters import compile_filter_spec
+
+    spec = FilterSpec(statuses={"OPEN"}, include_tags={"Universe"}, search="Planner")
+    compiled = compile_filter_spec(spec)
+
+    assert compiled is compile_filter_spec(FilterSpec(statuses={"OPEN"}, include_tags={"Universe"}, search="Planner"))
+    assert compiled.statuses == frozenset({"open"})
+    assert compiled.include_tags == frozenset({"universe"})
+    assert compiled.search == "planner"
+
+    assert compiled(_make_task("1", "universe planner", tags=["universe"]))
+    assert not compiled(_make_task("2", "universe planner", status="done", tags=["universe"]))
+
+
+def test_filter_tasks_on_index_matches_linear_scan():
+    from us_core.planner.task_index import TaskIndex
+
+    tasks = [
+        _make_task("1", "self care", priority=1, tags=["self-care", "life"]),
+        _make_task("2", "universe deep", priority=3, tags=["Universe", "deep-work"]),
+        _make_task("3", "mixed", status="done", priority=2, tags=["self-care", "universe"]),
+        _make_task("4", "other", tags=["misc"]),
+        _make_task("5", "planner search", status="Open", priority=2, tags=["universe"]),
+    ]
+    index = TaskIndex(tasks, version=1)
+
+    specs = [
+        FilterSpec(),
+        FilterSpec(statuses={"open"}),
+        FilterSpec(include_tags={"universe"}, exclude_tags={"deep-work"}),
+        FilterSpec(statuses={"open", "done"}, min_priority=2),
+        FilterSpec(include_tags={"unknown"}),
+        FilterSpec(exclude_tags={"self-care"}, search="planner"),
+        FilterSpec(include_tags=set()),
+    ]
+    for spec in specs:
+        assert [t.id for t in filter_tasks(index, spec)] == [t.id for t in filter_tasks(tasks, spec)]
+
+
+def test_load_task_index_caches_per_file_version(tmp_path):
+    import json
+
+    from us_core.planner.loader import load_task_index
+
+    path = tmp_path / "tasks.jsonl"
+    path.write_text(json.dumps({"id": "1", "title": "a", "tags": ["universe"]}) + "\n", encoding="utf-8")
+
+    index = load_task_index(path)
+    assert load_task_index(path) is index
+
+    spec = FilterSpec(include_tags={"universe"})
+    first = filter_tasks(index, spec)
+    assert [t.id for t in first] == ["1"]
+    # 返回的是副本，调用方修改不会污染缓存
+    first.clear()
+    assert [t.id for t in filter_tasks(index, spec)] == ["1"]
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "2", "title": "b", "tags": ["universe"]}) + "\n")
+
+    refreshed = load_task_index(path)
+    assert refreshed is not index
+    assert [t.id for t in filter_tasks(refreshed, spec)] == ["1", "2"]
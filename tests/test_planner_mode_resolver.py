@@ -44,3 +44,33 @@ def test_resolve_mode_falls_back_to_balance_when_no_preferred(tmp_path: Path):
     info = resolve_mode_from_mood_files(base_dir=tmp_path)
     assert info.mode == "balance"
     assert info.source == "fallback"
+
+
+def test_resolve_mode_is_cached_until_mood_file_changes(tmp_path: Path, monkeypatch):
+    from us_core.planner import mode_resolver  # type: ignore
+
+    mood_file = tmp_path / "data" / "mood" / "today_mood.json"
+    _write_json(mood_file, {"mode": "rest"})
+
+    calls = []
+    real_load = mode_resolver._safe_load_json
+
+    def counting_load(path):
+        calls.append(path)
+        return real_load(path)
+
+    monkeypatch.setattr(mode_resolver, "_safe_load_json", counting_load)
+
+    assert resolve_mode_from_mood_files(base_dir=tmp_path).mode == "rest"
+    assert resolve_mode_from_mood_files(base_dir=tmp_path).mode == "rest"
+    assert len(calls) == 1
+
+    # 内容 + 大小都变化：签名变化，自动重新解析
+    _write_json(mood_file, {"mode": "focus"})
+    assert resolve_mode_from_mood_files(base_dir=tmp_path).mode == "focus"
+    assert len(calls) == 2
+
+    # 显式 invalidate 之后也会重新解析
+    mode_resolver.invalidate_mode_cache()
+    assert resolve_mode_from_mood_files(base_dir=tmp_path).mode == "focus"
+    assert len(calls) == 3
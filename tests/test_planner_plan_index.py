@@ -0,0 +1,113 @@
+from datetime import date, datetime
+from pathlib import Path
+import json
+import sys
+
+# 确保 src 在 sys.path 里
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from us_core.planner.daily_review import review_plans_in_range  # type: ignore
+from us_core.planner.plan_index import (  # type: ignore
+    backfill_plan_index,
+    find_plan_artifact,
+    load_plan_artifacts,
+    query_plan_artifacts,
+    record_plan_artifact,
+)
+
+
+def _write_jsonl(path: Path, rows: list[dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for obj in rows:
+            f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+
+
+def test_record_and_query_plan_artifacts_by_date(tmp_path: Path):
+    index_file = tmp_path / "plan_index.jsonl"
+
+    record_plan_artifact(
+        tmp_path / "a.md",
+        mode="focus",
+        task_ids=["1", "2"],
+        kind="focus_block_from_mood",
+        created_at=datetime(2025, 11, 1, 9, 0),
+        index_path=index_file,
+    )
+    record_plan_artifact(
+        tmp_path / "b.md",
+        mode="rest",
+        task_ids=["3"],
+        created_at=datetime(2025, 11, 3, 20, 0),
+        index_path=index_file,
+    )
+
+    assert len(load_plan_artifacts(index_file)) == 2
+
+    first_two_days = query_plan_artifacts(date(2025, 11, 1), date(2025, 11, 2), index_path=index_file)
+    assert [a.plan_name for a in first_two_days] == ["a.md"]
+    assert first_two_days[0].task_ids == ["1", "2"]
+    assert first_two_days[0].mode == "focus"
+
+    found = find_plan_artifact("b.md", index_path=index_file)
+    assert found is not None
+    assert found.created_at == datetime(2025, 11, 3, 20, 0)
+
+
+def test_review_plans_in_range_uses_index_only(tmp_path: Path):
+    index_file = tmp_path / "plan_index.jsonl"
+    tasks_file = tmp_path / "tasks.jsonl"
+    _write_jsonl(
+        tasks_file,
+        [
+            {"id": "1", "title": "A", "status": "done"},
+            {"id": "2", "title": "B", "status": "open"},
+        ],
+    )
+
+    # Markdown 文件本身并不存在：复盘只依赖索引
+    record_plan_artifact(
+        tmp_path / "missing.md",
+        mode="balance",
+        task_ids=["1", "2", "9"],
+        created_at=datetime(2025, 11, 2, 8, 0),
+        index_path=index_file,
+    )
+
+    agg = review_plans_in_range(
+        date(2025, 11, 1),
+        date(2025, 11, 30),
+        index_path=index_file,
+        tasks_path=tasks_file,
+    )
+    assert agg.total_plans == 1
+    assert agg.total_planned == 3
+    assert agg.total_completed == 1
+    assert agg.total_missing == 1
+
+    empty = review_plans_in_range(date(2025, 12, 1), index_path=index_file, tasks_path=tasks_file)
+    assert empty.total_plans == 0
+
+
+def test_backfill_plan_index_from_legacy_markdown(tmp_path: Path):
+    plans_dir = tmp_path / "plans"
+    plans_dir.mkdir()
+    (plans_dir / "focus_block_from_mood_focus_2025-11-23_2157.md").write_text(
+        "### 1. A\n\n- id: `1`\n\n### 2. B\n\n- id: `2`\n",
+        encoding="utf-8",
+    )
+    (plans_dir / "execution_review_x_2025-11-23_2216.md").write_text("- id: `1`\n", encoding="utf-8")
+    index_file = plans_dir / "plan_index.jsonl"
+
+    added = backfill_plan_index(plans_dir, index_path=index_file)
+    assert [a.plan_name for a in added] == ["focus_block_from_mood_focus_2025-11-23_2157.md"]
+    assert added[0].date == "2025-11-23"
+    assert added[0].mode == "focus"
+    assert added[0].kind == "focus_block_from_mood"
+    assert added[0].task_ids == ["1", "2"]
+
+    # 再跑一次不会重复登记
+    assert backfill_plan_index(plans_dir, index_path=index_file) == []
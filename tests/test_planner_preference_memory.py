@@ -104,3 +104,97 @@ def test_attach_task_metadata_joins_titles_and_tags(tmp_path: Path):
     assert by_id["1"]["times_completed"] == 2
     assert by_id["2"]["title"] == "T2"
     assert by_id["2"]["tags"] == ["self-care"]
+
+
+def _summary(items: list[TaskExecution]) -> ExecutionSummary:
+    completed = sum(1 for it in items if it.is_completed)
+    return ExecutionSummary(
+        total_planned=len(items),
+        found_tasks=len(items),
+        completed=completed,
+        not_completed=len(items) - completed,
+        missing=0,
+        completion_rate=completed / len(items) if items else 0.0,
+        items=items,
+    )
+
+
+def test_decayed_completion_rate_favours_recent_behaviour():
+    stats = aggregate_task_stats_from_records(
+        [
+            # 一个月前总是没完成，最近两天都完成了
+            {"type": "task_execution", "timestamp": "2025-01-01T09:00:00", "task_id": "1", "is_completed": False},
+            {"type": "task_execution", "timestamp": "2025-01-02T09:00:00", "task_id": "1", "is_completed": False},
+            {"type": "task_execution", "timestamp": "2025-01-03T09:00:00", "task_id": "1", "is_completed": False},
+            {"type": "task_execution", "timestamp": "2025-02-01T09:00:00", "task_id": "1", "is_completed": True},
+            {"type": "task_execution", "timestamp": "2025-02-02T09:00:00", "task_id": "1", "is_completed": True},
+        ],
+        half_life_days=7.0,
+    )
+
+    st = stats["1"]
+    assert st.times_planned == 5
+    assert st.completion_rate == 0.4
+    assert st.decayed_completion_rate > 0.8
+    assert st.last_seen == datetime(2025, 2, 2, 9, 0, 0)
+
+
+def test_decayed_stats_are_order_independent():
+    records = [
+        {"type": "task_execution", "timestamp": "2025-01-10T09:00:00", "task_id": "1", "is_completed": True},
+        {"type": "task_execution", "timestamp": "2025-01-01T09:00:00", "task_id": "1", "is_completed": False},
+        {"type": "task_execution", "timestamp": "2025-01-05T09:00:00", "task_id": "1", "is_completed": True},
+    ]
+    forward = aggregate_task_stats_from_records(records)["1"]
+    backward = aggregate_task_stats_from_records(list(reversed(records)))["1"]
+
+    assert abs(forward.decayed_planned - backward.decayed_planned) < 1e-9
+    assert abs(forward.decayed_completed - backward.decayed_completed) < 1e-9
+
+
+def test_history_index_window_queries_and_incremental_update(tmp_path: Path):
+    from us_core.planner.preference_memory import (  # type: ignore
+        aggregate_task_stats,
+        get_history_index_path,
+        load_history_index,
+    )
+
+    history_file = tmp_path / "planner_history.jsonl"
+
+    append_execution_summary(
+        plan_name="old.md",
+        summary=_summary([TaskExecution(task_id="1", title="t1", status="open", is_completed=False)]),
+        history_path=history_file,
+        timestamp=datetime(2025, 1, 1, 9, 0, 0),
+    )
+
+    index = load_history_index(history_file)
+    index_path = get_history_index_path(history_file)
+    assert index_path.exists()
+    assert index.tasks["1"].times_planned == 1
+
+    # 索引已存在：追加写入时增量更新，而不是等下次读取时重建
+    append_execution_summary(
+        plan_name="new.md",
+        summary=_summary(
+            [
+                TaskExecution(task_id="1", title="t1", status="done", is_completed=True),
+                TaskExecution(task_id="2", title="t2", status="open", is_completed=False),
+            ]
+        ),
+        history_path=history_file,
+        timestamp=datetime(2025, 1, 20, 9, 0, 0),
+    )
+
+    reloaded = load_history_index(history_file, persist=False)
+    assert reloaded.tasks["1"].times_planned == 2
+    assert reloaded.tasks["1"].times_completed == 1
+    assert set(reloaded.days) == {"2025-01-01", "2025-01-20"}
+
+    recent = aggregate_task_stats(history_file, window_days=7, today=datetime(2025, 1, 21).date())
+    assert set(recent) == {"1", "2"}
+    assert recent["1"].times_planned == 1
+    assert recent["1"].completion_rate == 1.0
+
+    full = aggregate_task_stats(history_file)
+    assert full["1"].times_planned == 2
@@ -36,3 +36,28 @@ def test_score_task_with_history_prefers_higher_completion_rate():
     assert s2 > s1
     assert "preference" in comp1
     assert "preference" in comp2
+
+
+def test_score_task_with_history_prefers_recent_completion_when_decayed():
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    task = Task(id="1", title="Task 1", status="open", priority=1, tags=[], created_at=now)
+
+    # 累计完成率很低，但衰减后（近期）完成率很高
+    stats = {
+        "1": TaskHistoryStats(
+            task_id="1",
+            times_planned=6,
+            times_completed=2,
+            decayed_planned=2.2,
+            decayed_completed=2.0,
+        ),
+    }
+
+    recent, comp_recent = score_task_with_history(task, mode="focus", history_stats=stats, now=now)
+    lifetime, comp_lifetime = score_task_with_history(
+        task, mode="focus", history_stats=stats, now=now, prefer_recent=False
+    )
+
+    assert comp_recent["preference"] > 0
+    assert comp_lifetime["preference"] < 0
+    assert recent > lifetime
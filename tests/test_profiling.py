@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from us_core.core.lifecycle import LifecycleManager  # noqa: E402
+from us_core.core.orchestration import CoreOrchestrator  # noqa: E402
+from us_core.utils.profiling import HdrHistogram, SystemProfiler  # noqa: E402
+
+
+def test_hdr_histogram_percentiles_within_relative_error():
+    hist = HdrHistogram(sub_bucket_bits=6)
+    for v in range(1, 100_001):
+        hist.record(v)
+    assert hist.total == 100_000
+    for p in (50, 90, 99):
+        exact = p * 1000
+        assert abs(hist.percentile(p) - exact) / exact < 2 ** -5
+    assert hist.percentile(100) == 100_000
+    assert hist.summary()["min"] == 1
+
+
+def test_profiler_ring_buffer_keeps_latest_samples():
+    prof = SystemProfiler(capacity=4, track_allocations=False, enabled=True)
+    for beat in range(6):
+        prof.record("a", beat, wall_ns=1000 * (beat + 1), cpu_ns=500)
+    assert len(prof) == 4
+    assert [s["beat"] for s in prof.samples()] == [2, 3, 4, 5]
+    # 直方图覆盖全部 6 个样本
+    assert prof.histogram("a").total == 6
+    assert prof.to_collapsed() == "heartbeat;a 18\n"  # (3+4+5+6) us
+
+
+def test_orchestrator_profiling_toggles_at_runtime(tmp_path):
+    orchestrator = CoreOrchestrator()
+
+    def allocating(ctx):
+        ctx["blob"] = bytearray(200_000)
+        return {}
+
+    def sleepy(ctx):
+        time.sleep(0.005)
+        return {}
+
+    orchestrator.register_system("alloc", allocating)
+    orchestrator.register_system("sleep", sleepy)
+    manager = LifecycleManager(orchestrator)
+    manager.initialize()
+
+    manager.step({})
+    assert manager.profiler is None
+
+    prof = manager.enable_profiling(capacity=16)
+    for _ in range(3):
+        manager.step({})
+    manager.disable_profiling()
+    manager.step({})
+
+    samples = prof.samples()
+    assert len(samples) == 6
+    assert {s["beat"] for s in samples} == {1, 2, 3}
+    alloc = [s for s in samples if s["system"] == "alloc"]
+    assert all(s["peak_bytes"] >= 200_000 for s in alloc)
+    sleep = [s for s in samples if s["system"] == "sleep"]
+    assert all(s["wall_ns"] >= 4_000_000 > s["cpu_ns"] for s in sleep)
+
+    data = json.loads(prof.dump_json(tmp_path / "profile.json").read_text(encoding="utf-8"))
+    assert data["summary"]["sleep"]["wall_ns"]["count"] == 3
+    collapsed = prof.dump_collapsed(tmp_path / "wall.folded").read_text(encoding="utf-8")
+    assert {line.split()[0] for line in collapsed.splitlines()} == {"heartbeat;alloc", "heartbeat;sleep"}
+
+
+def test_profiling_in_concurrent_mode_records_each_system():
+    orchestrator = CoreOrchestrator(mode="concurrent")
+    orchestrator.register_system("a", lambda ctx: {})
+    orchestrator.register_system("b", lambda ctx: {}, depends_on=["a"])
+    prof = orchestrator.enable_profiling(track_allocations=False)
+    orchestrator.heartbeat({})
+    orchestrator.close()
+    assert sorted(s["system"] for s in prof.samples()) == ["a", "b"]
@@ -72,3 +72,44 @@ def test_decide_day_mode_agreement_uses_that_mode():
     assert decision.self_model_mode == "focus"
     assert decision.final_mode == "focus"
     assert "判断一致" in decision.reason
+
+
+def test_resolve_day_mode_decision_is_cached_per_input_versions(tmp_path: Path, monkeypatch):
+    import json
+
+    from us_core.self_model import mode_orchestration as mo  # type: ignore
+
+    mood_file = tmp_path / "data" / "mood" / "today_mood.json"
+    mood_file.parent.mkdir(parents=True)
+    mood_file.write_text(json.dumps({"mode": "focus"}), encoding="utf-8")
+    history_file = tmp_path / "planner_history.jsonl"
+    tasks_file = tmp_path / "tasks.jsonl"
+
+    calls = []
+    real_load = mo.load_planner_insights
+
+    def counting_load(**kwargs):
+        calls.append(kwargs)
+        return real_load(**kwargs)
+
+    monkeypatch.setattr(mo, "load_planner_insights", counting_load)
+    mo.invalidate_mode_decision_cache()
+
+    kwargs = dict(base_dir=tmp_path, history_path=history_file, tasks_path=tasks_file)
+    first = mo.resolve_day_mode_decision(**kwargs)
+    second = mo.resolve_day_mode_decision(**kwargs)
+    assert first == second
+    assert first.final_mode == "focus"
+    assert len(calls) == 1
+
+    # planner 历史变化 -> 重新计算
+    history_file.write_text(
+        json.dumps({"type": "task_execution", "task_id": "1", "is_completed": False}) + "\n",
+        encoding="utf-8",
+    )
+    mo.resolve_day_mode_decision(**kwargs)
+    assert len(calls) == 2
+
+    mo.invalidate_mode_decision_cache()
+    mo.resolve_day_mode_decision(**kwargs)
+    assert len(calls) == 3
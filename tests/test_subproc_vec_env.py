@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from us_core.environments.subproc_vec_env import INFO_KEYS, SubprocVecEnv  # noqa: E402
+from us_core.environments.vec_grid_world import VecGridWorld  # noqa: E402
+from us_core.systems.environment.interface import NUM_ACTIONS, STATE_SIZE  # noqa: E402
+
+
+def test_subproc_vec_env_matches_vec_grid_world():
+    num_envs = 6
+    rng = np.random.default_rng(5)
+    reference = VecGridWorld(num_envs=num_envs, max_episode_steps=40)
+
+    with SubprocVecEnv(num_envs, num_workers=2, max_episode_steps=40) as env:
+        np.testing.assert_array_equal(env.reset(), reference.reset())
+
+        for _ in range(120):
+            actions = rng.integers(0, NUM_ACTIONS, size=num_envs)
+            states, rewards, dones, info = env.step(actions)
+            ref_states, ref_rewards, ref_dones, ref_info = reference.step(actions)
+
+            assert states.shape == (num_envs, STATE_SIZE)
+            np.testing.assert_array_equal(states, ref_states)
+            np.testing.assert_allclose(rewards, ref_rewards, atol=1e-6)
+            np.testing.assert_array_equal(dones, ref_dones)
+            for key in INFO_KEYS:
+                np.testing.assert_array_equal(info[key], ref_info[key])
+            if dones.any():
+                np.testing.assert_array_equal(info["terminal_states"], ref_info["terminal_states"])
+
+
+def test_subproc_vec_env_validates_actions_and_close():
+    env = SubprocVecEnv(3, num_workers=5)
+    assert env.num_workers == 3
+    env.reset()
+
+    with pytest.raises(ValueError):
+        env.step(np.zeros(2, dtype=np.int64))
+
+    env.close()
+    env.close()  # 重复关闭不报错
+    with pytest.raises(RuntimeError):
+        env.reset()
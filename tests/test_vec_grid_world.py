@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from us_core.environments.grid_world import SimpleGridWorld  # noqa: E402
+from us_core.environments.vec_grid_world import VecGridWorld  # noqa: E402
+from us_core.systems.environment.interface import NUM_ACTIONS, STATE_SIZE, GridAction  # noqa: E402
+
+
+def test_reset_matches_single_environment():
+    venv = VecGridWorld(num_envs=4)
+    states = venv.reset()
+
+    single = SimpleGridWorld().reset()
+    assert states.shape == (4, STATE_SIZE)
+    assert states.dtype == np.float32
+    for row in states:
+        np.testing.assert_array_equal(row, single)
+
+
+def test_random_rollouts_match_sequential_environments():
+    num_envs = 8
+    rng = np.random.default_rng(123)
+    venv = VecGridWorld(num_envs=num_envs)
+    venv.reset()
+    envs = [SimpleGridWorld() for _ in range(num_envs)]
+    for env in envs:
+        env.reset()
+
+    for _ in range(300):
+        actions = rng.integers(0, NUM_ACTIONS, size=num_envs)
+        states, rewards, dones, info = venv.step(actions)
+
+        for i, env in enumerate(envs):
+            state, reward, done, env_info = env.step(int(actions[i]))
+            assert rewards[i] == pytest.approx(reward, abs=1e-6)
+            assert bool(dones[i]) == done
+            assert bool(info["collision"][i]) == env_info.get("collision", False)
+            assert bool(info["picked_key"][i]) == env_info.get("picked_key", False)
+            if done:
+                state = env.reset()
+            np.testing.assert_array_equal(states[i], state)
+
+
+def test_key_door_goal_sequence_and_auto_reset():
+    venv = VecGridWorld(num_envs=2)
+    venv.reset()
+
+    # 环境 0 放到钥匙左边，环境 1 放到终点左边
+    venv.agent_y[0], venv.agent_x[0] = venv._key_pos[0], venv._key_pos[1] - 1
+    venv.agent_y[1], venv.agent_x[1] = venv._goal_pos[0], venv._goal_pos[1] - 1
+
+    states, rewards, dones, info = venv.step(np.array([GridAction.RIGHT, GridAction.RIGHT]))
+
+    assert info["picked_key"].tolist() == [True, False]
+    assert venv.has_key[0]
+    assert rewards[0] == pytest.approx(-0.01 + 0.2)
+
+    assert dones.tolist() == [False, True]
+    assert rewards[1] == pytest.approx(-0.01 + 1.0)
+    assert info["terminal_states"].shape == (1, STATE_SIZE)
+    # 自动重置后回到起点
+    assert (venv.agent_y[1], venv.agent_x[1]) == venv._start_pos
+    np.testing.assert_array_equal(states[1], SimpleGridWorld().reset())
+
+
+def test_door_blocks_without_key_and_opens_with_key():
+    venv = VecGridWorld(num_envs=2)
+    venv.reset()
+    dy, dx = venv._door_pos
+    venv.agent_y[:] = dy
+    venv.agent_x[:] = dx - 1
+    venv.has_key[1] = True
+
+    _, rewards, _, info = venv.step(np.array([GridAction.RIGHT, GridAction.RIGHT]))
+
+    assert info["door_blocked"].tolist() == [True, False]
+    assert info["door_opened"].tolist() == [False, True]
+    assert venv.agent_x.tolist() == [dx - 1, dx]
+    assert venv.grids[1, dy, dx] == 0
+    assert rewards[0] == pytest.approx(-0.11)
+
+
+def test_truncation_after_max_episode_steps():
+    venv = VecGridWorld(num_envs=3, max_episode_steps=2)
+    venv.reset()
+    stay = np.full(3, GridAction.PICK_KEY)
+
+    _, _, dones, _ = venv.step(stay)
+    assert not dones.any()
+    _, _, dones, info = venv.step(stay)
+    assert dones.all()
+    assert info["truncated"].all()
+    assert (venv.episode_steps == 0).all()